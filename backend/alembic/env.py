@@ -14,7 +14,9 @@ load_dotenv()
 
 from database import Base
 from models.user import User, University, EmailVerification
-from models.community import Post, Comment, PostLike, PostScrap
+from models.community import Post, Comment, PostLike, PostScrap, PostScore, PostViewEvent
+from models.email import OutboundEmail
+from models.passkey import Passkey, PasskeyChallenge
 
 # config 객체 생성
 config = context.config
@@ -23,7 +25,8 @@ config = context.config
 # .env에 있는 DATABASE_URL을 사용
 config.set_main_option("sqlalchemy.url", os.getenv("DATABASE_URL"))
 
-fileConfig(config.config_file_name)
+# 벤치마크처럼 앱 모듈을 먼저 import한 프로세스에서도 앱 로거(core.email 등)가 꺼지지 않도록
+fileConfig(config.config_file_name, disable_existing_loggers=False)
 
 # 타겟 메타데이터 설정 (모델들의 족보)
 target_metadata = Base.metadata
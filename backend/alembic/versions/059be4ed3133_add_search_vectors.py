@@ -0,0 +1,88 @@
+"""add search vectors to posts and comments
+
+Revision ID: 059be4ed3133
+Revises: 84af13f35bde
+Create Date: 2026-10-18
+
+"""
+import re
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+
+# revision identifiers, used by Alembic.
+revision: str = '059be4ed3133'
+down_revision: Union[str, Sequence[str], None] = '84af13f35bde'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+# ---------------------------------------------------------
+# 검색 문서 생성 (이 리비전 시점의 core.search.build_document 사본)
+# ---------------------------------------------------------
+# 마이그레이션은 앱 코드가 바뀌어도 같은 결과를 내야 하므로 import 하지 않고 그대로 복사해 둔다.
+# 토큰화 방식을 바꾸면 새 리비전에서 다시 채운다.
+WORD_RE = re.compile(r"\w+")
+MAX_POSITION = 16383
+
+
+def _bigrams(word: str) -> list[str]:
+    if len(word) == 1:
+        return [word]
+    return [word[i:i + 2] for i in range(len(word) - 1)]
+
+
+def _quote(lexeme: str) -> str:
+    return "'" + lexeme.replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+def build_document(*parts: tuple[Optional[str], str]) -> str:
+    positions: dict[str, list[str]] = {}
+    pos = 0
+    for text, weight in parts:
+        for word in WORD_RE.findall((text or "").lower()):
+            for gram in _bigrams(word):
+                pos = min(pos + 1, MAX_POSITION)
+                positions.setdefault(gram, []).append(f"{pos}{weight}")
+            if len(word) > 1:
+                positions.setdefault(word[-1], []).append(f"{pos}{weight}")
+            pos += 1
+    return " ".join(f"{_quote(g)}:{','.join(p[:256])}" for g, p in positions.items())
+
+
+def _backfill(table: str, columns: str, to_document) -> None:
+    """기존 행의 검색 벡터를 BATCH_SIZE 단위로 채움"""
+    conn = op.get_bind()
+    select_rows = sa.text(
+        f"SELECT id, {columns} FROM {table} WHERE id > :last_id ORDER BY id LIMIT :n"
+    )
+    update_row = sa.text(f"UPDATE {table} SET search_vector = CAST(:doc AS tsvector) WHERE id = :id")
+    last_id = 0
+    while True:
+        rows = conn.execute(select_rows, {"last_id": last_id, "n": BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        conn.execute(update_row, [{"id": row[0], "doc": to_document(row)} for row in rows])
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    op.add_column('posts', sa.Column('search_vector', TSVECTOR(), nullable=True))
+    op.add_column('comments', sa.Column('search_vector', TSVECTOR(), nullable=True))
+
+    _backfill('posts', 'title, content', lambda row: build_document((row[1], "A"), (row[2], "B")))
+    _backfill('comments', 'content', lambda row: build_document((row[1], "A")))
+
+    op.create_index('ix_posts_search_vector', 'posts', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_comments_search_vector', 'comments', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_search_vector', table_name='comments')
+    op.drop_index('ix_posts_search_vector', table_name='posts')
+    op.drop_column('comments', 'search_vector')
+    op.drop_column('posts', 'search_vector')
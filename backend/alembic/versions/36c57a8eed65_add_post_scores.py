@@ -0,0 +1,44 @@
+"""add post_scores ranking table
+
+Revision ID: 36c57a8eed65
+Revises: 059be4ed3133
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '36c57a8eed65'
+down_revision: Union[str, Sequence[str], None] = '059be4ed3133'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('post_scores',
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('post_id')
+    )
+    op.create_index('ix_post_scores_score', 'post_scores', ['score', 'post_id'], unique=False)
+
+    # 최근 7일 게시글 점수 채우기
+    op.execute("""
+        INSERT INTO post_scores (post_id, score, created_at)
+        SELECT id,
+               coalesce(view_count, 0) + coalesce(like_count, 0) * 3 + coalesce(comment_count, 0) * 5,
+               created_at
+        FROM posts
+        WHERE created_at >= now() - interval '7 days'
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_post_scores_score', table_name='post_scores')
+    op.drop_table('post_scores')
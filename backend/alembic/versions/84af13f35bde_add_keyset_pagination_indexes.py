@@ -0,0 +1,29 @@
+"""add keyset pagination indexes
+
+Revision ID: 84af13f35bde
+Revises: b9d2e4f6a013
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '84af13f35bde'
+down_revision: Union[str, Sequence[str], None] = 'b9d2e4f6a013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 커서 페이지네이션 정렬키 (created_at DESC, id DESC) 를 역방향 스캔으로 사용
+    op.create_index('ix_posts_created_at_id', 'posts', ['created_at', 'id'], unique=False)
+    op.create_index('ix_comments_author_id_created_at_id', 'comments', ['author_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_author_id_created_at_id', table_name='comments')
+    op.drop_index('ix_posts_created_at_id', table_name='posts')
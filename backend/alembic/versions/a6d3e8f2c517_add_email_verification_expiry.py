@@ -0,0 +1,54 @@
+"""add expiry, rate limit columns and unique key to email_verifications
+
+Revision ID: a6d3e8f2c517
+Revises: f4a8c2d6e913
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d3e8f2c517'
+down_revision: Union[str, Sequence[str], None] = 'f4a8c2d6e913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('email_verifications', sa.Column('sent_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+    op.add_column('email_verifications', sa.Column('expires_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+    op.add_column('email_verifications', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('email_verifications', sa.Column('send_count', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('email_verifications', sa.Column('window_started_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+
+    # 기존 기록: 생성 시각 기준으로 만료 (5분)
+    op.execute("""
+        UPDATE email_verifications
+        SET sent_at = coalesce(created_at, now()),
+            expires_at = coalesce(created_at, now()) + interval '5 minutes',
+            window_started_at = coalesce(created_at, now())
+    """)
+    # (email, purpose)별 최신 기록만 남기고 유니크 인덱스로 교체
+    op.execute("""
+        DELETE FROM email_verifications AS old
+        USING email_verifications AS newer
+        WHERE old.email = newer.email AND old.purpose = newer.purpose AND old.id < newer.id
+    """)
+    op.drop_index('ix_email_verifications_email_purpose', table_name='email_verifications', if_exists=True)
+    op.create_index('ix_email_verifications_email_purpose', 'email_verifications', ['email', 'purpose'], unique=True)
+    op.create_index('ix_email_verifications_expires_at', 'email_verifications', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_email_verifications_expires_at', table_name='email_verifications')
+    op.drop_index('ix_email_verifications_email_purpose', table_name='email_verifications')
+    op.create_index('ix_email_verifications_email_purpose', 'email_verifications', ['email', 'purpose'], unique=False)
+    op.drop_column('email_verifications', 'window_started_at')
+    op.drop_column('email_verifications', 'send_count')
+    op.drop_column('email_verifications', 'attempts')
+    op.drop_column('email_verifications', 'expires_at')
+    op.drop_column('email_verifications', 'sent_at')
@@ -0,0 +1,27 @@
+"""add comments parent_id index
+
+Revision ID: b7e4d1a9c350
+Revises: 5d2f9a7c4e81
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e4d1a9c350'
+down_revision: Union[str, Sequence[str], None] = '5d2f9a7c4e81'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 대댓글 수 집계, 댓글 트리(재귀 CTE), 부모 삭제 시 CASCADE 가 parent_id로 찾는다
+    op.create_index('ix_comments_parent_id', 'comments', ['parent_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_parent_id', table_name='comments')
@@ -0,0 +1,55 @@
+"""sync baseline tables with models (counters, is_deleted, purpose, passkeys)
+
+Revision ID: b9d2e4f6a013
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9d2e4f6a013'
+down_revision: Union[str, Sequence[str], None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 초기 마이그레이션 이후 모델에만 추가되고 마이그레이션이 없던 것들.
+    # 운영 DB는 create_all로 이미 갖고 있을 수 있어 전부 IF NOT EXISTS (빈 DB에서 upgrade head가 돌도록)
+    op.execute("ALTER TABLE posts ADD COLUMN IF NOT EXISTS like_count INTEGER")
+    op.execute("ALTER TABLE posts ADD COLUMN IF NOT EXISTS comment_count INTEGER")
+    op.execute("ALTER TABLE posts ADD COLUMN IF NOT EXISTS scrap_count INTEGER")
+    op.execute("ALTER TABLE comments ADD COLUMN IF NOT EXISTS is_deleted BOOLEAN")
+    op.execute(
+        "ALTER TABLE email_verifications "
+        "ADD COLUMN IF NOT EXISTS purpose VARCHAR NOT NULL DEFAULT 'register'"
+    )
+    op.execute("ALTER TABLE email_verifications ALTER COLUMN purpose DROP DEFAULT")
+
+    # 소셜/패스키 가입 유저는 비밀번호·이메일이 없다
+    op.alter_column('users', 'password', existing_type=sa.String(), nullable=True)
+    op.alter_column('users', 'email', existing_type=sa.String(), nullable=True)
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS passkeys (
+            id SERIAL PRIMARY KEY,
+            user_id INTEGER REFERENCES users (id) ON DELETE CASCADE,
+            credential_id VARCHAR NOT NULL,
+            public_key VARCHAR NOT NULL,
+            sign_count BIGINT,
+            device_name VARCHAR,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+        )
+    """)
+    op.create_index('ix_passkeys_id', 'passkeys', ['id'], unique=False, if_not_exists=True)
+    op.create_index('ix_passkeys_credential_id', 'passkeys', ['credential_id'], unique=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    # 이 리비전 전에도 create_all로 있었을 수 있는 것들이라 되돌리지 않는다
+    pass
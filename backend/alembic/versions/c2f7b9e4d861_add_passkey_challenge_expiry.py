@@ -0,0 +1,45 @@
+"""replace passkey_challenges.created_at (timeout value) with expires_at
+
+Revision ID: c2f7b9e4d861
+Revises: a6d3e8f2c517
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2f7b9e4d861'
+down_revision: Union[str, Sequence[str], None] = 'a6d3e8f2c517'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 챌린지는 1~2분짜리 임시 데이터라 옮기지 않고 새로 만든다
+    # (테이블은 create_all로 만들어졌을 수 있어 IF EXISTS)
+    op.execute("DROP TABLE IF EXISTS passkey_challenges")
+    op.create_table(
+        'passkey_challenges',
+        sa.Column('username', sa.String(), nullable=False),
+        sa.Column('challenge', sa.String(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('username'),
+    )
+    op.create_index('ix_passkey_challenges_username', 'passkey_challenges', ['username'], unique=False)
+    op.create_index('ix_passkey_challenges_expires_at', 'passkey_challenges', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table('passkey_challenges')
+    op.create_table(
+        'passkey_challenges',
+        sa.Column('username', sa.String(), nullable=False),
+        sa.Column('challenge', sa.String(), nullable=False),
+        sa.Column('created_at', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('username'),
+    )
+    op.create_index('ix_passkey_challenges_username', 'passkey_challenges', ['username'], unique=False)
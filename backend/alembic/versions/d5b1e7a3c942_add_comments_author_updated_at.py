@@ -0,0 +1,27 @@
+"""add comments.author_updated_at (author snapshot change time for the comments ETag)
+
+Revision ID: d5b1e7a3c942
+Revises: c2f7b9e4d861
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5b1e7a3c942'
+down_revision: Union[str, Sequence[str], None] = 'c2f7b9e4d861'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 기존 댓글은 NULL (스냅샷이 다시 갱신될 때 채워짐)
+    op.add_column('comments', sa.Column('author_updated_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('comments', 'author_updated_at')
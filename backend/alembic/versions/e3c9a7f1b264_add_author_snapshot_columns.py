@@ -0,0 +1,39 @@
+"""add author snapshot columns to posts and comments
+
+Revision ID: e3c9a7f1b264
+Revises: b7e4d1a9c350
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3c9a7f1b264'
+down_revision: Union[str, Sequence[str], None] = 'b7e4d1a9c350'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ('posts', 'comments'):
+        op.add_column(table, sa.Column('author_nickname', sa.String(), server_default='알수없음', nullable=False))
+        op.add_column(table, sa.Column('author_university', sa.String(), nullable=True))
+        # 기존 글/댓글은 현재 작성자 정보로 채움 (updated_at은 그대로 둔다)
+        op.execute(f"""
+            UPDATE {table} AS t
+            SET author_nickname = COALESCE(NULLIF(u.nickname, ''), split_part(u.email, '@', 1), '알수없음'),
+                author_university = un.name
+            FROM users AS u
+            LEFT JOIN universities AS un ON un.id = u.university_id
+            WHERE u.id = t.author_id
+        """)
+
+
+def downgrade() -> None:
+    for table in ('comments', 'posts'):
+        op.drop_column(table, 'author_university')
+        op.drop_column(table, 'author_nickname')
@@ -0,0 +1,48 @@
+"""add ON DELETE CASCADE to community foreign keys
+
+Revision ID: e7a2c9d4b186
+Revises: d5b1e7a3c942
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a2c9d4b186'
+down_revision: Union[str, Sequence[str], None] = 'd5b1e7a3c942'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (제약 이름, 테이블, 컬럼, 참조 테이블) — 이름은 Postgres 기본값 <table>_<column>_fkey
+FOREIGN_KEYS = [
+    ('comments_post_id_fkey', 'comments', 'post_id', 'posts'),
+    ('comments_parent_id_fkey', 'comments', 'parent_id', 'comments'),
+    ('post_likes_post_id_fkey', 'post_likes', 'post_id', 'posts'),
+    ('post_scraps_post_id_fkey', 'post_scraps', 'post_id', 'posts'),
+    ('posts_author_id_fkey', 'posts', 'author_id', 'users'),
+    ('comments_author_id_fkey', 'comments', 'author_id', 'users'),
+    ('post_likes_user_id_fkey', 'post_likes', 'user_id', 'users'),
+    ('post_scraps_user_id_fkey', 'post_scraps', 'user_id', 'users'),
+]
+
+
+def _recreate(ondelete) -> None:
+    for name, table, column, referent in FOREIGN_KEYS:
+        # create_all로 만든 DB는 이미 CASCADE일 수 있어 IF EXISTS로 지우고 다시 만든다
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
+        op.create_foreign_key(name, table, referent, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    # 모델의 passive_deletes=True는 게시글/댓글 삭제 시 자식 삭제를 DB에 맡긴다.
+    # 초기 마이그레이션은 ondelete 없이 FK를 만들어서 마이그레이션으로 만든 DB에선 삭제가 FK 위반으로 실패했다
+    _recreate('CASCADE')
+
+
+def downgrade() -> None:
+    _recreate(None)
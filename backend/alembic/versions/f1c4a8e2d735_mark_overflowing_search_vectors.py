@@ -0,0 +1,47 @@
+"""mark search vectors whose positions were truncated
+
+Revision ID: f1c4a8e2d735
+Revises: e7a2c9d4b186
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c4a8e2d735'
+down_revision: Union[str, Sequence[str], None] = 'e7a2c9d4b186'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# core.search.OVERFLOW_LEXEME (마이그레이션은 앱 코드가 바뀌어도 같은 결과여야 하므로 고정값)
+OVERFLOW_LEXEME = "#overflow"
+
+# 위치가 최대값(16383)에 닿았거나 위치 256개가 꽉 찬 어휘소가 있으면 잘렸을 수 있는 문서
+OVERFLOWED = """
+    search_vector IS NOT NULL AND EXISTS (
+        SELECT 1 FROM unnest(search_vector) AS lexeme
+        WHERE cardinality(lexeme.positions) >= 256 OR 16383 = ANY(lexeme.positions)
+    )
+"""
+
+
+def upgrade() -> None:
+    # 기존 문서는 그대로 두고 표시 어휘소만 붙인다 (검색 시 ILIKE 재확인 대상)
+    for table in ('posts', 'comments'):
+        op.execute(
+            f"UPDATE {table} SET search_vector = search_vector || '''{OVERFLOW_LEXEME}'''::tsvector "
+            f"WHERE {OVERFLOWED}"
+        )
+
+
+def downgrade() -> None:
+    for table in ('posts', 'comments'):
+        op.execute(
+            f"UPDATE {table} SET search_vector = ts_delete(search_vector, '{OVERFLOW_LEXEME}') "
+            f"WHERE search_vector @@ '''{OVERFLOW_LEXEME}'''::tsquery"
+        )
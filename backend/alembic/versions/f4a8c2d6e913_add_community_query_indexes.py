@@ -0,0 +1,53 @@
+"""add composite indexes for community query patterns
+
+Revision ID: f4a8c2d6e913
+Revises: e3c9a7f1b264
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a8c2d6e913'
+down_revision: Union[str, Sequence[str], None] = 'e3c9a7f1b264'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (인덱스 이름, 테이블, 컬럼)
+INDEXES = [
+    # 카테고리 피드 / 내가 쓴 글 (created_at DESC, id DESC keyset)
+    ('ix_posts_category_created_at_id', 'posts', ['category', 'created_at', 'id']),
+    ('ix_posts_author_id_created_at_id', 'posts', ['author_id', 'created_at', 'id']),
+    # 게시글별 댓글 (created_at ASC)
+    ('ix_comments_post_id_created_at_id', 'comments', ['post_id', 'created_at', 'id']),
+    # 게시글 삭제 CASCADE, 게시글별 좋아요/스크랩 (PK는 user_id가 앞)
+    ('ix_post_likes_post_id', 'post_likes', ['post_id']),
+    ('ix_post_scraps_post_id', 'post_scraps', ['post_id']),
+    # 로그인 시 유저의 패스키 조회, 유저 삭제 CASCADE
+    ('ix_passkeys_user_id', 'passkeys', ['user_id']),
+    # 인증 코드 조회/삭제는 항상 (email, purpose)
+    ('ix_email_verifications_email_purpose', 'email_verifications', ['email', 'purpose']),
+]
+
+
+def upgrade() -> None:
+    # 운영 중 테이블 잠금 없이 만들도록 CONCURRENTLY (트랜잭션 밖에서 실행)
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False,
+                            postgresql_concurrently=True, if_not_exists=True)
+        # (email, purpose) 인덱스가 email 단독 조회도 처리
+        op.drop_index('ix_email_verifications_email', table_name='email_verifications',
+                      postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_email_verifications_email', 'email_verifications', ['email'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -1,11 +1,14 @@
 from typing import Generator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from core import security
-from database import get_db
+from database import get_db, get_async_db
 from models.user import User
+from schemas.token import TokenPrincipal
+import crud.crud_users as user_crud
+import crud.crud_users_async as user_crud_async
 
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl="/api/v1/auth/login"
@@ -13,7 +16,7 @@ oauth2_scheme = OAuth2PasswordBearer(
 
 oauth2_scheme_optional = OAuth2PasswordBearer(
     tokenUrl="/api/v1/auth/login",
-    auto_error=False 
+    auto_error=False
 )
 
 def get_db_session() -> Generator:
@@ -23,59 +26,116 @@ def get_db_session() -> Generator:
     except Exception:
         pass
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="자격 증명이 유효하지 않습니다.",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
+def decode_principal(token: str) -> Optional[TokenPrincipal]:
+    """토큰 검증 후 클레임으로 로그인 유저 정보 생성 (실패 시 None)"""
+    # python-jose(+cryptography)는 토큰이 있는 요청에서만 필요하므로 처음 쓸 때 import
+    from jose import jwt, JWTError
+
     try:
         payload = jwt.decode(token, security.SECRET_KEY, algorithms=[security.ALGORITHM])
+        # 리프레시 토큰(만료가 긴 토큰)으로는 API를 호출할 수 없다
+        if payload.get("type") != "access":
+            return None
         user_id: str = payload.get("sub")
         if user_id is None:
-            raise credentials_exception
+            return None
     except JWTError:
-        raise credentials_exception
-    
+        return None
+
     try:
         uid = int(user_id)
     except (ValueError, TypeError):
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.id == uid).first()
+        return None
+
+    return TokenPrincipal(
+        id=uid,
+        is_active=payload.get("is_active"),
+        is_student_verified=payload.get("is_student_verified"),
+        university_id=payload.get("university_id"),
+    )
+
+# ---------------------------------------------------------
+# 토큰만으로 처리 (DB 조회 없음) - current_user.id 만 쓰는 API용
+# ---------------------------------------------------------
+def get_current_principal(
+    token: str = Depends(oauth2_scheme)
+) -> TokenPrincipal:
+    principal = decode_principal(token)
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="자격 증명이 유효하지 않습니다.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return principal
+
+
+def get_current_principal_optional(
+    token: Optional[str] = Depends(oauth2_scheme_optional)
+) -> Optional[TokenPrincipal]:
+    if not token:
+        return None
+    return decode_principal(token)
+
+# ---------------------------------------------------------
+# 쓰기 API용 (토큰 + 유저 존재/활성 확인)
+# ---------------------------------------------------------
+# 토큰은 탈퇴/비활성화 후에도 만료 전까지 유효하므로, 행을 만드는 API는 유저를 확인한다.
+# (확인하지 않으면 탈퇴한 유저의 글/댓글/좋아요가 FK 오류로 500이 됨)
+# 로그인 유저 캐시를 쓰므로 대부분 DB 조회 없음.
+def get_current_writer(
+    db: Session = Depends(get_db),
+    principal: TokenPrincipal = Depends(get_current_principal)
+) -> TokenPrincipal:
+    user = user_crud.get_user_cached(db, principal.id)
+    if user is None or not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="자격 증명이 유효하지 않습니다.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return principal
+
+# ---------------------------------------------------------
+# User 객체가 필요한 API용 (인스턴스 캐시 → 없으면 SELECT)
+# ---------------------------------------------------------
+def get_current_user(
+    db: Session = Depends(get_db),
+    principal: TokenPrincipal = Depends(get_current_principal)
+) -> User:
+    user = user_crud.get_user_cached(db, principal.id)
     if user is None:
-        raise credentials_exception
-        
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="자격 증명이 유효하지 않습니다.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
     return user
 
 
 def get_current_user_optional(
     db: Session = Depends(get_db),
-    token: Optional[str] = Depends(oauth2_scheme_optional)
+    principal: Optional[TokenPrincipal] = Depends(get_current_principal_optional)
 ) -> Optional[User]:
-    if not token:
-        return None
-    
-    try:
-        # 토큰 해독 시도
-        payload = jwt.decode(token, security.SECRET_KEY, algorithms=[security.ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            return None
-    except JWTError:
+    if principal is None:
         return None
-    
-    try:
-        uid = int(user_id)
-    except (ValueError, TypeError):
-        return None
-    
-    user = db.query(User).filter(User.id == uid).first()
-    if not user:
-        return None
-        
-    return user
\ No newline at end of file
+    return user_crud.get_user_cached(db, principal.id)
+
+
+# ---------------------------------------------------------
+# async 라우터용 (AsyncSession)
+# ---------------------------------------------------------
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    principal: TokenPrincipal = Depends(get_current_principal)
+) -> User:
+    user = await user_crud_async.get_user_cached(db, principal.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="자격 증명이 유효하지 않습니다.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return user
@@ -1,11 +1,11 @@
-import random
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from sqlalchemy.orm import Session
 
 from database import get_db
-from models.user import EmailVerification, User, University
-from core.email import send_verification_email, send_school_verification_email
-from core.univ_list import get_university_name
+from models.user import User
+from core.email import render_verification_email, render_school_verification_email, dispatch_outbound_emails
+from crud import crud_email, crud_university, crud_verification
+from core.university_directory import get_directory, invalidate_directory, remember_university
 from schemas.user import (
     EmailSendRequest, 
     EmailVerifyRequest, 
@@ -17,6 +17,17 @@ from api import deps
 
 router = APIRouter()
 
+# 발송 제한에 걸렸을 때
+TOO_MANY_SENDS = HTTPException(status_code=429, detail="인증코드 요청이 너무 많습니다. 잠시 후 다시 시도해주세요.")
+
+# crud_verification.verify_code 결과별 에러 메시지
+VERIFY_ERRORS = {
+    "not_found": "인증 요청 기록이 없습니다.",
+    "expired": "인증번호가 만료되었습니다. 다시 요청해주세요.",
+    "too_many_attempts": "입력 횟수를 초과했습니다. 인증번호를 다시 요청해주세요.",
+    "mismatch": "인증번호가 틀렸습니다.",
+}
+
 # ==============================================================================
 # 1. 회원가입용 이메일 인증 (목적: 본인 확인)
 # ==============================================================================
@@ -24,6 +35,7 @@ router = APIRouter()
 @router.post("/email/send")
 def send_email_code(
     request: EmailSendRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     email = request.email
@@ -36,30 +48,17 @@ def send_email_code(
             detail="이미 가입된 이메일입니다. 로그인해주세요."
         )
 
-    # 2. 6자리 코드 생성
-    code = str(random.randint(100000, 999999))
+    # 2. 6자리 코드 생성 및 '회원가입용' 인증 기록 저장 (재요청 시 같은 기록을 갱신)
+    code = crud_verification.issue_code(db, email, "register")
+    if code is None:
+        raise TOO_MANY_SENDS
 
-    # 3. 기존 '회원가입용' 인증 기록 삭제 (재요청 시 갱신)
-    db.query(EmailVerification).filter(
-        EmailVerification.email == email,
-        EmailVerification.purpose == "register"
-    ).delete()
-    
-    # 4. 새 기록 저장
-    new_verify = EmailVerification(
-        email=email,
-        code=code,
-        is_verified=False,
-        purpose="register"
-    )
-    db.add(new_verify)
+    # 3. 회원가입용 메일을 발송 대기열에 추가 (인증 기록과 함께 커밋, 발송은 응답 후)
+    crud_email.enqueue_email(db, email, *render_verification_email(code))
     db.commit()
+    dispatch_outbound_emails(background_tasks)
 
-    # 5. 회원가입용 메일 발송
-    if send_verification_email(email, code):
-        return {"message": "인증코드가 발송되었습니다."}
-    else:
-        raise HTTPException(status_code=500, detail="이메일 전송에 실패했습니다.")
+    return {"message": "인증코드가 발송되었습니다."}
 
 
 @router.post("/email/verify")
@@ -67,23 +66,10 @@ def verify_email_code(
     request: EmailVerifyRequest,
     db: Session = Depends(get_db)
 ):
-    email = request.email
-    code = request.code
-
-    record = db.query(EmailVerification).filter(
-        EmailVerification.email == email,
-        EmailVerification.purpose == "register"
-    ).first()
-    
-    if not record:
-        raise HTTPException(status_code=400, detail="인증 요청 기록이 없습니다.")
-    
-    if record.code != code:
-        raise HTTPException(status_code=400, detail="인증번호가 틀렸습니다.")
-    
-    # 인증 성공 처리
-    record.is_verified = True
-    db.commit()
+    # 만료/시도 횟수 확인과 인증 성공 처리를 한 번에
+    result = crud_verification.verify_code(db, request.email, "register", request.code)
+    if result != "verified":
+        raise HTTPException(status_code=400, detail=VERIFY_ERRORS[result])
     
     return {"message": "이메일 인증 성공"}
 
@@ -95,14 +81,15 @@ def verify_email_code(
 @router.post("/school/send")
 def send_school_email_code(
     request: SchoolEmailSendRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user) # 👈 로그인 필수
 ):
     email = request.email
 
-    # 1. 지원하는 학교 도메인인지 확인 (Whitelist)
-    univ_name = get_university_name(email)
-    if not univ_name:
+    # 1. 지원하는 학교 도메인인지 확인 (Whitelist, 서브도메인 포함)
+    university = get_directory(db).resolve(email)
+    if university is None:
         raise HTTPException(
             status_code=400, 
             detail="지원하지 않는 학교 도메인입니다. 관리자에게 문의해주세요."
@@ -116,30 +103,17 @@ def send_school_email_code(
             detail="이미 다른 계정에 등록된 학교 이메일입니다."
         )
 
-    # 3. 인증 코드 생성
-    code = str(random.randint(100000, 999999))
+    # 3. 인증 코드 생성 및 '학교 인증용' 기록 저장
+    code = crud_verification.issue_code(db, email, "school")
+    if code is None:
+        raise TOO_MANY_SENDS
 
-    # 4. 기존 '학교 인증용' 기록 삭제
-    db.query(EmailVerification).filter(
-        EmailVerification.email == email,
-        EmailVerification.purpose == "school" # 🔥 목적: 학교 인증
-    ).delete()
-    
-    # 5. 새 기록 저장
-    new_verify = EmailVerification(
-        email=email,
-        code=code,
-        is_verified=False,
-        purpose="school"
-    )
-    db.add(new_verify)
+    # 4. 학교 인증 전용 메일을 발송 대기열에 추가
+    crud_email.enqueue_email(db, email, *render_school_verification_email(code, university.name))
     db.commit()
+    dispatch_outbound_emails(background_tasks)
 
-    # 6. 학교 인증 전용 메일 발송
-    if send_school_verification_email(email, code, univ_name):
-        return {"message": f"{univ_name} 메일로 인증코드가 발송되었습니다."}
-    else:
-        raise HTTPException(status_code=500, detail="이메일 전송에 실패했습니다.")
+    return {"message": f"{university.name} 메일로 인증코드가 발송되었습니다."}
 
 
 @router.post("/school/verify")
@@ -149,56 +123,44 @@ def verify_school_email_code(
     current_user: User = Depends(deps.get_current_user)
 ):
     email = request.email
-    code = request.code
 
-    # 1. 인증 기록 조회 (purpose="school")
-    record = db.query(EmailVerification).filter(
-        EmailVerification.email == email,
-        EmailVerification.purpose == "school"
-    ).first()
-    
-    if not record:
-        raise HTTPException(status_code=400, detail="인증 요청 기록이 없습니다.")
-    
-    if record.code != code:
-        raise HTTPException(status_code=400, detail="인증번호가 틀렸습니다.")
+    # 1. 인증 코드 확인 (purpose="school")
+    result = crud_verification.verify_code(db, email, "school", request.code)
+    if result != "verified":
+        raise HTTPException(status_code=400, detail=VERIFY_ERRORS[result])
     
-    # 2. 학교 정보 처리 (University 테이블)
-    univ_name = get_university_name(email)
-    if not univ_name:
+    # 2. 학교 정보 처리 (캐시된 학교 디렉터리, 이미 등록된 학교면 조회 없음)
+    university = get_directory(db).resolve(email)
+    if university is None:
          raise HTTPException(status_code=400, detail="유효하지 않은 학교 도메인입니다.")
 
-    # DB에 학교가 있는지 확인하고, 없으면 생성 (Auto-Registration)
-    university = db.query(University).filter(University.name == univ_name).first()
-    
-    if not university:
-        try:
-            domain = email.split("@")[1]
-            university = University(name=univ_name, domain=domain)
-            db.add(university)
-            db.commit()
-            db.refresh(university)
-        except Exception as e:
-            db.rollback()
-            raise HTTPException(status_code=500, detail="학교 정보 등록 중 오류가 발생했습니다.")
-
     # 3. 유저 정보 업데이트 (학교 연동)
     try:
+        # DB에 없는 학교면 같은 트랜잭션에서 추가 (Auto-Registration, 동시 요청은 ON CONFLICT로 합류)
+        university_id = university.university_id
+        if university_id is None:
+            university_id = crud_university.ensure_university(db, university.name, university.domain)
+
         current_user.school_email = email
-        current_user.university_id = university.id
+        current_user.university_id = university_id
         current_user.is_student_verified = True
         
         # 인증 기록 삭제 (일회용이므로 사용 후 삭제)
-        db.delete(record)
+        crud_verification.delete_code(db, email, "school")
         
         db.commit()
     except Exception as e:
         db.rollback()
+        # 캐시된 학교 id가 다른 인스턴스에서 지워졌을 수 있으므로 다음 요청에서 다시 읽는다
+        invalidate_directory()
         raise HTTPException(status_code=500, detail="유저 정보 업데이트 실패")
+
+    if university.university_id is None:
+        remember_university(university.name, university.domain, university_id)
     
     return {
         "message": "학교 인증이 완료되었습니다.",
-        "university": univ_name,
+        "university": university.name,
         "is_verified": True
     }
 
@@ -1,74 +1,213 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Body, Depends, HTTPException, BackgroundTasks, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Union
 
-from database import get_db
+from database import get_db, SessionLocal
 from api import deps
-from models.user import User
+from schemas.token import TokenPrincipal
 import schemas.community as schemas
 from crud import crud_community as crud
+from core import pagination, http_cache, serialization
+from core.config import settings
+from core.feed_cache import get_feed_cache
 
 router = APIRouter()
 
+# 커서 파라미터 해석
+# - cursor 미전송: 기존 page/skip 방식 (리스트 응답)
+# - cursor="" : 커서 모드 첫 페이지, 이후 응답의 next_cursor를 그대로 전달
+def parse_cursor(cursor: Optional[str]):
+    if not cursor:
+        return None
+    try:
+        return pagination.decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+
+# 목록 응답: crud가 돌려준 컬럼 Row를 검증 없이 dict로 바꿔 orjson으로 직렬화 (core.serialization)
+# cursor 미전송이면 리스트, 전송하면 커서 페이지
+def list_content(rows, schema, cursor: Optional[str], limit: Optional[int]):
+    """limit=None이면 다음 페이지 없음 (인기글)"""
+    items = serialization.row_dicts(rows, schema)
+    if cursor is None:
+        return items
+    return {"items": items, "next_cursor": pagination.next_cursor(rows, limit) if limit else None}
+
+# 피드 응답 캐시 (검색이 아닌 목록/인기글만, core.feed_cache 참고)
+# 캐시된 본문은 다시 직렬화하지 않고 그대로 내려보내고, CDN도 max-age 동안 재사용한다.
+FeedResponse = Union[
+    List[schemas.PostListResponse], schemas.PostCursorPage,
+    List[schemas.PostListViewerResponse], schemas.PostViewerCursorPage,  # viewer=true
+]
+FEED_CACHE_CONTROL = f"public, max-age={settings.FEED_CACHE_MAX_AGE_SECONDS}"
+
+def feed_cache_key(cache, page: int, limit: int, sort: str, category: Optional[str], cursor: Optional[str]):
+    return cache.key(page=page, limit=limit, sort=sort, category=category, cursor=cursor)
+
+def feed_body(content) -> bytes:
+    return serialization.dumps(content)
+
+# 조회자 좋아요/스크랩 여부 (피드 viewer=true, /posts/batch)
+# 글 목록과 별도로 좋아요/스크랩 테이블에 IN 쿼리 1번씩이라, 로그인 피드 한 페이지는 크기와 무관하게 쿼리 3번.
+# 사용자마다 다른 응답이라 피드 캐시를 쓰지 않고 private으로 내려보낸다.
+VIEWER_CACHE_CONTROL = "private, no-cache"
+
+def feed_schema(viewer: bool):
+    return schemas.PostListViewerResponse if viewer else schemas.PostListResponse
+
+def content_items(content) -> list[dict]:
+    """list_content 결과의 항목 목록"""
+    return content if isinstance(content, list) else content["items"]
+
+def add_viewer_flags(db: Session, items: list[dict], user_id: int):
+    crud.apply_viewer_flags(items, *crud.get_viewer_flags(db, [item["id"] for item in items], user_id))
+
+# 상세/댓글 조건부 요청 (If-None-Match → 304)
+# 상세는 좋아요/스크랩 여부가 사용자마다 달라 private, 둘 다 매번 재검증(no-cache)한다.
+POST_CACHE_CONTROL = "private, no-cache"
+COMMENTS_CACHE_CONTROL = "no-cache"
+
+def post_etag(post_id: int, version: tuple) -> str:
+    return http_cache.etag_for_version("post", post_id, *version)
+
+def comments_etag(post_id: int, *params) -> str:
+    """params: 페이지/트리 파라미터와 마지막에 댓글 목록 버전 (crud.get_comments_version / crud.comments_version)"""
+    return http_cache.etag_for_version("comments", post_id, *params)
+
+# 댓글 목록 버전은 If-None-Match가 있을 때만 먼저 조회하고 (같으면 304),
+# 그 외에는 목록 쿼리에 붙여(with_version) 한 번에 읽는다. 행이 없을 때만 따로 조회.
+def comments_response(rows, etag: str):
+    items = serialization.row_dicts(rows, schemas.CommentResponse, exclude=crud.COMMENTS_VERSION_COLUMNS)
+    return serialization.ORJSONResponse(items, headers={"ETag": etag, "Cache-Control": COMMENTS_CACHE_CONTROL})
+
 # 게시글 작성
 @router.post("/posts", response_model=schemas.PostResponse)
 def create_post(
     post: schemas.PostCreate, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user) 
+    current_user: TokenPrincipal = Depends(deps.get_current_writer) 
 ):
     return crud.create_post(db=db, post=post, user_id=current_user.id)
 
 # 내가 쓴 글 조회
-@router.get("/posts/me", response_model=List[schemas.PostListResponse])
+@router.get("/posts/me", response_model=Union[List[schemas.PostListResponse], schemas.PostCursorPage])
 def read_my_posts(
     skip: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: TokenPrincipal = Depends(deps.get_current_principal)
 ):
-    return crud.get_my_posts(db, user_id=current_user.id, skip=skip, limit=limit)
+    posts = crud.get_my_posts(db, user_id=current_user.id, skip=skip, limit=limit, after=parse_cursor(cursor))
+    return serialization.ORJSONResponse(list_content(posts, schemas.PostListResponse, cursor, limit))
 
 # 내가 스크랩한 글 조회
-@router.get("/posts/scrapped", response_model=List[schemas.PostListResponse])
+@router.get("/posts/scrapped", response_model=Union[List[schemas.PostListResponse], schemas.PostCursorPage])
 def read_my_scraps(
     skip: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: TokenPrincipal = Depends(deps.get_current_principal)
 ):
-    return crud.get_my_scraps(db, user_id=current_user.id, skip=skip, limit=limit)
+    posts = crud.get_my_scraps(db, user_id=current_user.id, skip=skip, limit=limit, after=parse_cursor(cursor))
+    return serialization.ORJSONResponse(list_content(posts, schemas.PostListResponse, cursor, limit))
 
-@router.get("/posts", response_model=List[schemas.PostListResponse])
+@router.get("/posts", response_model=FeedResponse)
 def read_posts(
+    request: Request,
     page: int = 1,
     limit: int = 10, 
     sort: str = "latest", 
     category: str = None, 
     search: str = None,
+    cursor: Optional[str] = None,
+    viewer: bool = False,  # true면 항목마다 is_liked/is_scrapped (로그인한 경우)
     db: Session = Depends(get_db),
+    current_user: TokenPrincipal | None = Depends(deps.get_current_principal_optional),
 ):
+    if viewer:
+        content = load_posts(db, page, limit, sort, category, search, cursor, feed_schema(viewer))
+        if current_user:
+            add_viewer_flags(db, content_items(content), current_user.id)
+        return serialization.ORJSONResponse(content, headers={"Cache-Control": VIEWER_CACHE_CONTROL})
+
+    cache = get_feed_cache() if not search else None
+    if cache is None:
+        return serialization.ORJSONResponse(load_posts(db, page, limit, sort, category, search, cursor))
+
+    key = feed_cache_key(cache, page, limit, sort, category, cursor)
+    body = cache.get(key)
+    if body is None:
+        body = feed_body(load_posts(db, page, limit, sort, category, search, cursor))
+        cache.set(key, body)
+    return http_cache.json_response(request, body, FEED_CACHE_CONTROL)
+
+def load_posts(db: Session, page: int, limit: int, sort: str, category: Optional[str], search: Optional[str], cursor: Optional[str],
+               schema=schemas.PostListResponse):
+    """응답 내용 (리스트 또는 커서 페이지 dict)"""
     skip = (page - 1) * limit
 
     if sort == "best":
-        return crud.get_best_posts(db, skip=skip, limit=limit)
+        # 인기글은 점수순이라 커서를 지원하지 않음 (상위 N개만 사용)
+        posts = crud.get_best_posts(db, skip=skip, limit=limit)
+        return list_content(posts, schema, cursor, None)
     
-    return crud.get_posts(db, skip=skip, limit=limit, category=category, search=search)
+    posts = crud.get_posts(db, skip=skip, limit=limit, category=category, search=search, after=parse_cursor(cursor))
+    return list_content(posts, schema, cursor, limit)
+
+# 여러 게시글 한 번에 조회 (요청한 id 순서, 없는 글은 빠짐) + 로그인한 경우 좋아요/스크랩 여부
+@router.post("/posts/batch", response_model=List[schemas.PostListViewerResponse])
+def read_posts_batch(
+    ids: List[int] = Body(..., embed=True, min_length=1, max_length=crud.POST_BATCH_LIMIT),
+    db: Session = Depends(get_db),
+    current_user: TokenPrincipal | None = Depends(deps.get_current_principal_optional),
+):
+    items = serialization.row_dicts(crud.get_posts_by_ids(db, ids), schemas.PostListViewerResponse)
+    if current_user:
+        add_viewer_flags(db, items, current_user.id)
+    return serialization.ORJSONResponse(items, headers={"Cache-Control": VIEWER_CACHE_CONTROL})
+
+# 조회수 기록 (응답 후 실행되므로 요청 세션 대신 별도 세션 사용)
+def record_view(post_id: int):
+    db = SessionLocal()
+    try:
+        crud.record_view(db, post_id)
+    except Exception as e:
+        print(f"❌ View record failed: {e}")
+    finally:
+        db.close()
 
 # 게시글 상세 조회
 @router.get("/posts/{post_id}", response_model=schemas.PostResponse)
 def read_post(
     post_id: int,
+    request: Request,
+    response: Response,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
-    current_user: User | None = Depends(deps.get_current_user_optional) 
+    # 응답 전에 세션을 닫아 조회수 기록(별도 세션)과 커넥션 2개를 동시에 잡지 않게 함
+    db: Session = Depends(get_db, scope="function"),
+    current_user: TokenPrincipal | None = Depends(deps.get_current_principal_optional) 
 ):
     user_id = current_user.id if current_user else None
-    
+
+    # 가진 버전이 최신이면 본문을 읽거나 직렬화하지 않고 304 (재방문도 조회수는 기록)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        version = crud.get_post_version(db, post_id, user_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Post not found")
+        etag = post_etag(post_id, version)
+        if http_cache.etag_matches(if_none_match, etag):
+            background_tasks.add_task(record_view, post_id)
+            return http_cache.not_modified(etag, POST_CACHE_CONTROL)
+
     post = crud.get_post(db, post_id=post_id, user_id=user_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-    background_tasks.add_task(crud.increase_view_count, db, post_id)
+    background_tasks.add_task(record_view, post_id)
+    response.headers["ETag"] = post_etag(post_id, crud.post_version(post))
+    response.headers["Cache-Control"] = POST_CACHE_CONTROL
     return post
 
 # 게시글 삭제
@@ -76,7 +215,7 @@ def read_post(
 def delete_post(
     post_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: TokenPrincipal = Depends(deps.get_current_writer)
 ):
     result = crud.delete_post(db, post_id=post_id, user_id=current_user.id)
     
@@ -93,7 +232,7 @@ def update_post(
     post_id: int,
     post: schemas.PostUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: TokenPrincipal = Depends(deps.get_current_writer)
 ):
     result = crud.update_post(db, post_id=post_id, post_data=post, user_id=current_user.id)
     
@@ -109,32 +248,62 @@ def update_post(
 def create_comment(
     comment: schemas.CommentCreate, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: TokenPrincipal = Depends(deps.get_current_writer)
 ):
     return crud.create_comment(db=db, comment=comment, user_id=current_user.id)
 
 # 댓글 목록 조회 
-@router.get("/comments", response_model=List[schemas.CommentResponse])
+@router.get("/comments", response_model=Union[List[schemas.CommentResponse], schemas.CommentCursorPage])
 def read_comments(
+    request: Request,
     post: Optional[int] = None,
     author: Optional[int] = None,
     skip: int = 0, 
     limit: int = 50, 
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     if post:
-        return crud.get_comments_by_post(db, post_id=post, skip=skip, limit=limit)
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            etag = comments_etag(post, skip, limit, crud.get_comments_version(db, post))
+            if http_cache.etag_matches(if_none_match, etag):
+                return http_cache.not_modified(etag, COMMENTS_CACHE_CONTROL)
+        comments = crud.get_comments_by_post(db, post_id=post, skip=skip, limit=limit, with_version=True)
+        version = crud.comments_version(comments) or crud.get_comments_version(db, post)
+        return comments_response(comments, comments_etag(post, skip, limit, version))
     elif author:
-        return crud.get_comments_by_author(db, user_id=author, skip=skip, limit=limit)
+        # 작성자별 댓글은 최신순이라 커서 지원
+        comments = crud.get_comments_by_author(db, user_id=author, skip=skip, limit=limit, after=parse_cursor(cursor))
+        return serialization.ORJSONResponse(list_content(comments, schemas.CommentResponse, cursor, limit))
     else:
         return []
+
+# 댓글 트리 조회 (재귀 CTE 한 번, 트리 순서 + depth)
+@router.get("/comments/thread", response_model=List[schemas.CommentResponse])
+def read_comment_thread(
+    request: Request,
+    post: int,
+    root: Optional[int] = None,
+    max_depth: int = Query(crud.THREAD_MAX_DEPTH, ge=0, le=crud.THREAD_MAX_DEPTH),
+    limit: int = Query(crud.THREAD_LIMIT, ge=1, le=crud.THREAD_LIMIT),
+    db: Session = Depends(get_db)
+):
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        etag = comments_etag(post, root, max_depth, limit, crud.get_comments_version(db, post))
+        if http_cache.etag_matches(if_none_match, etag):
+            return http_cache.not_modified(etag, COMMENTS_CACHE_CONTROL)
+    comments = crud.get_comment_thread(db, post_id=post, root_id=root, max_depth=max_depth, limit=limit, with_version=True)
+    version = crud.comments_version(comments) or crud.get_comments_version(db, post)
+    return comments_response(comments, comments_etag(post, root, max_depth, limit, version))
     
 # 댓글 삭제
 @router.delete("/comments/{comment_id}")
 def delete_comment(
     comment_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: TokenPrincipal = Depends(deps.get_current_writer)
 ):
     result = crud.delete_comment(db, comment_id=comment_id, user_id=current_user.id)
     
@@ -150,7 +319,7 @@ def delete_comment(
 def like_post(
     post_id: int, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: TokenPrincipal = Depends(deps.get_current_writer)
 ):
     result = crud.toggle_like(db, post_id=post_id, user_id=current_user.id)
     if not result:
@@ -162,7 +331,7 @@ def like_post(
 def scrap_post(
     post_id: int, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: TokenPrincipal = Depends(deps.get_current_writer)
 ):
     result = crud.toggle_scrap(db, post_id=post_id, user_id=current_user.id)
     if not result:
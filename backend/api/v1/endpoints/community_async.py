@@ -0,0 +1,186 @@
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+
+from database import get_async_db, AsyncSessionLocal
+from api import deps
+from api.v1.endpoints.community import (
+    parse_cursor, list_content, FeedResponse, FEED_CACHE_CONTROL, feed_cache_key, feed_body, comments_response,
+    VIEWER_CACHE_CONTROL, feed_schema, content_items,
+    POST_CACHE_CONTROL, COMMENTS_CACHE_CONTROL, post_etag, comments_etag,
+)
+from schemas.token import TokenPrincipal
+import schemas.community as schemas
+from crud import crud_community_async as crud
+from core import http_cache, serialization
+from core.feed_cache import get_feed_cache
+
+# ---------------------------------------------------------
+# 커뮤니티 조회 API의 async 버전
+# ---------------------------------------------------------
+# ASYNC_ROUTERS에 "community"가 있으면 main.py가 community.router보다 먼저 등록해
+# 같은 경로의 GET 요청을 이쪽에서 처리한다. 나머지(작성/수정/토글)는 sync 라우터가 처리.
+router = APIRouter()
+
+# 내가 쓴 글 조회
+@router.get("/posts/me", response_model=Union[List[schemas.PostListResponse], schemas.PostCursorPage])
+async def read_my_posts(
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenPrincipal = Depends(deps.get_current_principal)
+):
+    posts = await crud.get_my_posts(db, user_id=current_user.id, skip=skip, limit=limit, after=parse_cursor(cursor))
+    return serialization.ORJSONResponse(list_content(posts, schemas.PostListResponse, cursor, limit))
+
+# 내가 스크랩한 글 조회
+@router.get("/posts/scrapped", response_model=Union[List[schemas.PostListResponse], schemas.PostCursorPage])
+async def read_my_scraps(
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenPrincipal = Depends(deps.get_current_principal)
+):
+    posts = await crud.get_my_scraps(db, user_id=current_user.id, skip=skip, limit=limit, after=parse_cursor(cursor))
+    return serialization.ORJSONResponse(list_content(posts, schemas.PostListResponse, cursor, limit))
+
+@router.get("/posts", response_model=FeedResponse)
+async def read_posts(
+    request: Request,
+    page: int = 1,
+    limit: int = 10,
+    sort: str = "latest",
+    category: str = None,
+    search: str = None,
+    cursor: Optional[str] = None,
+    viewer: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenPrincipal | None = Depends(deps.get_current_principal_optional),
+):
+    if viewer:
+        content = await load_posts(db, page, limit, sort, category, search, cursor, feed_schema(viewer))
+        if current_user:
+            await add_viewer_flags(db, content_items(content), current_user.id)
+        return serialization.ORJSONResponse(content, headers={"Cache-Control": VIEWER_CACHE_CONTROL})
+
+    cache = get_feed_cache() if not search else None
+    if cache is None:
+        return serialization.ORJSONResponse(await load_posts(db, page, limit, sort, category, search, cursor))
+
+    key = await call_cache(cache, feed_cache_key, cache, page, limit, sort, category, cursor)
+    body = await call_cache(cache, cache.get, key)
+    if body is None:
+        body = feed_body(await load_posts(db, page, limit, sort, category, search, cursor))
+        await call_cache(cache, cache.set, key, body)
+    return http_cache.json_response(request, body, FEED_CACHE_CONTROL)
+
+async def call_cache(cache, fn, *args):
+    """캐시 호출 (redis는 sync 클라이언트라 이벤트 루프를 막지 않도록 스레드풀에서, memory는 바로)"""
+    if cache.blocking:
+        return await run_in_threadpool(fn, *args)
+    return fn(*args)
+
+async def load_posts(db: AsyncSession, page: int, limit: int, sort: str, category: Optional[str], search: Optional[str], cursor: Optional[str],
+                     schema=schemas.PostListResponse):
+    skip = (page - 1) * limit
+
+    if sort == "best":
+        posts = await crud.get_best_posts(db, skip=skip, limit=limit)
+        return list_content(posts, schema, cursor, None)
+
+    posts = await crud.get_posts(db, skip=skip, limit=limit, category=category, search=search, after=parse_cursor(cursor))
+    return list_content(posts, schema, cursor, limit)
+
+async def add_viewer_flags(db: AsyncSession, items: list[dict], user_id: int):
+    crud.apply_viewer_flags(items, *(await crud.get_viewer_flags(db, [item["id"] for item in items], user_id)))
+
+# 조회수 기록 (응답 후 실행되므로 요청 세션 대신 별도 세션 사용)
+async def record_view(post_id: int):
+    db = AsyncSessionLocal()
+    try:
+        await crud.record_view(db, post_id)
+    except Exception as e:
+        print(f"❌ View record failed: {e}")
+    finally:
+        await db.close()
+
+# 게시글 상세 조회
+@router.get("/posts/{post_id}", response_model=schemas.PostResponse)
+async def read_post(
+    post_id: int,
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    # 응답 전에 세션을 닫아 조회수 기록(별도 세션)과 커넥션 2개를 동시에 잡지 않게 함
+    db: AsyncSession = Depends(get_async_db, scope="function"),
+    current_user: TokenPrincipal | None = Depends(deps.get_current_principal_optional)
+):
+    user_id = current_user.id if current_user else None
+
+    # 가진 버전이 최신이면 본문을 읽거나 직렬화하지 않고 304 (재방문도 조회수는 기록)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        version = await crud.get_post_version(db, post_id, user_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Post not found")
+        etag = post_etag(post_id, version)
+        if http_cache.etag_matches(if_none_match, etag):
+            background_tasks.add_task(record_view, post_id)
+            return http_cache.not_modified(etag, POST_CACHE_CONTROL)
+
+    post = await crud.get_post(db, post_id=post_id, user_id=user_id)
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    background_tasks.add_task(record_view, post_id)
+    response.headers["ETag"] = post_etag(post_id, crud.post_version(post))
+    response.headers["Cache-Control"] = POST_CACHE_CONTROL
+    return post
+
+# 댓글 목록 조회
+@router.get("/comments", response_model=Union[List[schemas.CommentResponse], schemas.CommentCursorPage])
+async def read_comments(
+    request: Request,
+    post: Optional[int] = None,
+    author: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    if post:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            etag = comments_etag(post, skip, limit, await crud.get_comments_version(db, post))
+            if http_cache.etag_matches(if_none_match, etag):
+                return http_cache.not_modified(etag, COMMENTS_CACHE_CONTROL)
+        comments = await crud.get_comments_by_post(db, post_id=post, skip=skip, limit=limit, with_version=True)
+        version = crud.comments_version(comments) or await crud.get_comments_version(db, post)
+        return comments_response(comments, comments_etag(post, skip, limit, version))
+    elif author:
+        comments = await crud.get_comments_by_author(db, user_id=author, skip=skip, limit=limit, after=parse_cursor(cursor))
+        return serialization.ORJSONResponse(list_content(comments, schemas.CommentResponse, cursor, limit))
+    else:
+        return []
+
+# 댓글 트리 조회 (재귀 CTE 한 번, 트리 순서 + depth)
+@router.get("/comments/thread", response_model=List[schemas.CommentResponse])
+async def read_comment_thread(
+    request: Request,
+    post: int,
+    root: Optional[int] = None,
+    max_depth: int = Query(crud.THREAD_MAX_DEPTH, ge=0, le=crud.THREAD_MAX_DEPTH),
+    limit: int = Query(crud.THREAD_LIMIT, ge=1, le=crud.THREAD_LIMIT),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        etag = comments_etag(post, root, max_depth, limit, await crud.get_comments_version(db, post))
+        if http_cache.etag_matches(if_none_match, etag):
+            return http_cache.not_modified(etag, COMMENTS_CACHE_CONTROL)
+    comments = await crud.get_comment_thread(db, post_id=post, root_id=root, max_depth=max_depth, limit=limit,
+                                             with_version=True)
+    version = crud.comments_version(comments) or await crud.get_comments_version(db, post)
+    return comments_response(comments, comments_etag(post, root, max_depth, limit, version))
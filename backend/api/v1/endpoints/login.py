@@ -1,31 +1,40 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from jose import jwt, JWTError
 
 from database import get_db
-from core import security
+from core import security, passwords
+from crud import crud_users
 from models.user import User
 from schemas.token import Token
 
 router = APIRouter()
 
 # 그인 (토큰 2개 세트 발급)
+# - 비밀번호 검증(bcrypt/argon2)은 core.passwords 전용 풀에서 await 해서
+#   로그인이 몰려도 다른 API가 쓰는 스레드풀을 점유하지 않는다. DB 작업만 스레드풀에서 실행.
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
-    user = db.query(User).filter(User.username == form_data.username).first()
-    
+    user = await run_in_threadpool(crud_users.get_login_user, db, form_data.username)
+    ok, new_hash = await passwords.verify_password(form_data.password, user.password) if user else (False, None)
+
     # 유저가 없거나 비밀번호가 틀리면 401 에러
-    if not user or not security.verify_password(form_data.password, user.password):
+    if not ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="아이디 또는 비밀번호가 올바르지 않습니다.", # 메시지도 수정
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token = security.create_access_token(data={"sub": str(user.id)})
+
+    # 저장된 해시의 비용/알고리즘이 현재 설정과 다르면 새 해시로 교체
+    if new_hash:
+        await run_in_threadpool(crud_users.update_password_hash, db, user.id, new_hash)
+
+    access_token = security.create_access_token(data=security.token_claims(user))
     refresh_token = security.create_refresh_token(data={"sub": str(user.id)})
     
     return {
@@ -40,6 +49,8 @@ def refresh_token(
     refresh_token: str = Body(..., embed=True),
     db: Session = Depends(get_db)
 ):
+    from jose import jwt, JWTError
+
     try:
         # 1. 토큰 해독
         payload = jwt.decode(
@@ -59,7 +70,7 @@ def refresh_token(
             raise HTTPException(status_code=401, detail="존재하지 않는 사용자입니다.")
             
         # 3. 새 액세스 토큰 발급
-        new_access_token = security.create_access_token(data={"sub": str(user.id)})
+        new_access_token = security.create_access_token(data=security.token_claims(user))
         
         return {
             "access_token": new_access_token,
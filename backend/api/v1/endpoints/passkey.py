@@ -3,36 +3,25 @@ import string
 import base64
 import json
 from fastapi import APIRouter, Depends, HTTPException, Body, Request
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List
 
 # DB 및 모델
 from database import get_db
 from models.user import User
-from models.passkey import Passkey, PasskeyChallenge
+from models.passkey import Passkey
 from schemas.user import PasskeyResponse
-from core.security import create_access_token, create_refresh_token
+from schemas.token import TokenPrincipal
+from core.security import create_access_token, create_refresh_token, token_claims
 from core.config import settings
+from core.challenge_store import get_challenge_store
+from crud import crud_passkey
 from core.utils import get_device_name
-from api.deps import get_current_user
-
-# WebAuthn 라이브러리
-from webauthn import (
-    generate_registration_options,
-    verify_registration_response,
-    generate_authentication_options,
-    verify_authentication_response,
-    base64url_to_bytes,
-    options_to_json
-)
-from webauthn.helpers.structs import (
-    AuthenticatorSelectionCriteria,
-    UserVerificationRequirement,
-    RegistrationCredential,
-    AuthenticationCredential,
-    AuthenticatorAttestationResponse, 
-    AuthenticatorAssertionResponse    
-)
+from api.deps import get_current_principal
+
+# WebAuthn 라이브러리(webauthn → cryptography, cbor2)는 import 비용이 커서
+# 콜드 스타트에 포함되지 않도록 실제로 쓰는 함수 안에서 import 한다.
 
 router = APIRouter()
 
@@ -44,49 +33,44 @@ def get_webauthn_config(request: Request):
     return settings.RP_ID, settings.RP_ORIGIN
 
 
-def clean_webauthn_data(data: dict) -> dict:
-    # 1. 키 매핑 (Camel -> Snake)
-    key_map = {
-        "rawId": "raw_id", "authenticatorAttachment": "authenticator_attachment",
-        "clientExtensionResults": "client_extension_results",
-        "response": "response", "id": "id", "type": "type",
-        "clientDataJSON": "client_data_json", "attestationObject": "attestation_object",
-        "authenticatorData": "authenticator_data", "signature": "signature", "userHandle": "user_handle"
-    }
-    
-    def map_keys(d):
-        if not isinstance(d, dict): return d
-        return {key_map.get(k, k): map_keys(v) for k, v in d.items()}
-
-    cleaned = map_keys(data)
+# 프론트(@simplewebauthn) JSON 키 -> py_webauthn 필드 이름
+WEBAUTHN_KEY_MAP = {
+    "rawId": "raw_id", "authenticatorAttachment": "authenticator_attachment",
+    "clientExtensionResults": "client_extension_results",
+    "clientDataJSON": "client_data_json", "attestationObject": "attestation_object",
+    "authenticatorData": "authenticator_data", "userHandle": "user_handle"
+}
+# 검증에 쓰지 않는 필드
+WEBAUTHN_DROPPED_FIELDS = {"client_extension_results", "transports"}
+# Base64URL -> Bytes 변환할 필드
+WEBAUTHN_BINARY_FIELDS = {
+    "raw_id", "client_data_json", "attestation_object",
+    "authenticator_data", "signature", "user_handle"
+}
 
-    # 2. 불필요한 필드 제거
-    for field in ["client_extension_results", "transports"]:
-        if field in cleaned:
-            del cleaned[field]
 
-    # 3. Base64URL -> Bytes 변환
-    binary_fields = [
-        "raw_id", "client_data_json", "attestation_object", 
-        "authenticator_data", "signature", "user_handle" # user_handle 포함
-    ]
+def clean_webauthn_data(data: dict) -> dict:
+    """키 변환(Camel -> Snake), 불필요한 필드 제거, Base64URL 디코딩을 한 번의 순회로 처리"""
+    from webauthn import base64url_to_bytes
 
-    def decode_recursive(d):
+    def convert(d: dict) -> dict:
+        cleaned = {}
         for k, v in d.items():
-            if k in binary_fields and isinstance(v, str):
+            key = WEBAUTHN_KEY_MAP.get(k, k)
+            if key in WEBAUTHN_DROPPED_FIELDS:
+                continue
+            if isinstance(v, dict):
+                v = convert(v)
+            elif key in WEBAUTHN_BINARY_FIELDS and isinstance(v, str):
+                # 빈 문자열이면 None 처리 (user_handle 등)
                 try:
-                    # 빈 문자열이면 None 처리
-                    if not v:
-                        d[k] = None
-                    else:
-                        d[k] = base64url_to_bytes(v)
+                    v = base64url_to_bytes(v) if v else None
                 except Exception:
-                    pass 
-            elif isinstance(v, dict):
-                decode_recursive(v)
-    
-    decode_recursive(cleaned)
-    return cleaned
+                    pass
+            cleaned[key] = v
+        return cleaned
+
+    return convert(data)
 
 
 # --------------------------------------------------------------------------
@@ -98,6 +82,9 @@ def signup_options(
     username: str = Body(..., embed=True),
     db: Session = Depends(get_db)
 ):
+    from webauthn import generate_registration_options, options_to_json
+    from webauthn.helpers.structs import AuthenticatorSelectionCriteria, UserVerificationRequirement
+
     if db.query(User).filter(User.username == username).first():
         raise HTTPException(status_code=400, detail="이미 존재하는 아이디입니다.")
 
@@ -114,14 +101,7 @@ def signup_options(
     )
 
     challenge_str = base64.urlsafe_b64encode(options.challenge).decode().rstrip("=")
-    
-    challenge_entry = PasskeyChallenge(
-        username=username,
-        challenge=challenge_str,
-        created_at=int(options.timeout or 60000)
-    )
-    db.merge(challenge_entry)
-    db.commit()
+    get_challenge_store().put(db, username, challenge_str)
 
     return json.loads(options_to_json(options))
 
@@ -139,8 +119,12 @@ def signup_verify(
     response: dict = Body(...),
     db: Session = Depends(get_db)
 ):
-    challenge_entry = db.query(PasskeyChallenge).filter(PasskeyChallenge.username == username).first()
-    if not challenge_entry:
+    from webauthn import verify_registration_response, base64url_to_bytes
+    from webauthn.helpers.structs import RegistrationCredential, AuthenticatorAttestationResponse
+
+    # 챌린지는 1회용: 꺼내면서 삭제 (검증에 실패해도 다시 쓸 수 없음)
+    challenge = get_challenge_store().consume(db, username)
+    if not challenge:
         raise HTTPException(status_code=400, detail="요청이 만료되었습니다.")
 
     rp_id, origin = get_webauthn_config(request)
@@ -163,7 +147,7 @@ def signup_verify(
         
         verification = verify_registration_response(
             credential=credential,
-            expected_challenge=base64url_to_bytes(challenge_entry.challenge),
+            expected_challenge=base64url_to_bytes(challenge),
             expected_origin=origin,
             expected_rp_id=rp_id,
         )
@@ -198,11 +182,9 @@ def signup_verify(
             device_name=device_name
         )
         db.add(new_passkey)
-        
-        db.delete(challenge_entry)
         db.commit()
 
-        access_token = create_access_token(data={"sub": str(new_user.id)})
+        access_token = create_access_token(data=token_claims(new_user))
         refresh_token = create_refresh_token(data={"sub": str(new_user.id)})
 
         return {
@@ -232,8 +214,10 @@ def login_options(
     username: str = Body(..., embed=True),
     db: Session = Depends(get_db)
 ):
-    user = db.query(User).filter(User.username == username).first()
-    if not user:
+    from webauthn import generate_authentication_options, options_to_json
+    from webauthn.helpers.structs import UserVerificationRequirement
+
+    if db.scalar(select(User.id).where(User.username == username)) is None:
         raise HTTPException(status_code=404, detail="존재하지 않는 사용자입니다.")
     
     rp_id, _ = get_webauthn_config(request)
@@ -244,14 +228,7 @@ def login_options(
     )
 
     challenge_str = base64.urlsafe_b64encode(options.challenge).decode().rstrip("=")
-    
-    challenge_entry = PasskeyChallenge(
-        username=username,
-        challenge=challenge_str,
-        created_at=int(options.timeout or 60000)
-    )
-    db.merge(challenge_entry)
-    db.commit()
+    get_challenge_store().put(db, username, challenge_str)
 
     return json.loads(options_to_json(options))
 
@@ -266,40 +243,33 @@ def login_verify(
     response: dict = Body(...),
     db: Session = Depends(get_db)
 ):
-    user = db.query(User).filter(User.username == username).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
-    
-    challenge_entry = db.query(PasskeyChallenge).filter(PasskeyChallenge.username == username).first()
-    if not challenge_entry:
+    from webauthn import verify_authentication_response, base64url_to_bytes
+    from webauthn.helpers.structs import AuthenticationCredential, AuthenticatorAssertionResponse
+
+    # 챌린지는 1회용: 꺼내면서 삭제 (db 저장소는 여기서 커밋하므로 유저 조회보다 먼저)
+    challenge = get_challenge_store().consume(db, username)
+    if not challenge:
         raise HTTPException(status_code=400, detail="요청 만료")
 
-    user_passkeys = db.query(Passkey).filter(Passkey.user_id == user.id).all()
-    input_cred_id = response.get("id")
-    
-    current_passkey = next((pk for pk in user_passkeys if pk.credential_id == input_cred_id), None)
-    
-    if not current_passkey:
-        if user_passkeys: current_passkey = user_passkeys[0]
-        else: raise HTTPException(status_code=400, detail="등록된 기기가 없습니다.")
+    # 유저 + 요청한 credential을 한 번에 조회 (credential_id 인덱스)
+    login = crud_passkey.get_passkey_login(db, username, response.get("id"))
+    if not login:
+        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+    if login.passkey_id is None:
+        raise HTTPException(status_code=400, detail="등록된 기기가 없습니다.")
 
     rp_id, origin = get_webauthn_config(request)
 
     try:
-        stored_pub_key = base64.b64decode(current_passkey.public_key)
+        stored_pub_key = base64.b64decode(login.public_key)
 
         data = clean_webauthn_data(response)
 
-        # 🔥 user_handle 처리 강화
-        user_handle = data['response'].get('user_handle')
-        if user_handle == b"" or user_handle == "": 
-            user_handle = None
-
         auth_response = AuthenticatorAssertionResponse(
             client_data_json=data['response']['client_data_json'],
             authenticator_data=data['response']['authenticator_data'],
             signature=data['response']['signature'],
-            user_handle=user_handle
+            user_handle=data['response'].get('user_handle')
         )
 
         credential = AuthenticationCredential(
@@ -312,28 +282,32 @@ def login_verify(
 
         verification = verify_authentication_response(
             credential=credential,
-            expected_challenge=base64url_to_bytes(challenge_entry.challenge),
+            expected_challenge=base64url_to_bytes(challenge),
             expected_origin=origin,
             expected_rp_id=rp_id,
             credential_public_key=stored_pub_key,
-            credential_current_sign_count=current_passkey.sign_count
+            credential_current_sign_count=login.sign_count or 0
         )
+    except Exception as e:
+        print(f"❌ Login Verify Error: {e}")
+        raise HTTPException(status_code=400, detail="로그인 인증 실패")
 
-        current_passkey.sign_count = verification.new_sign_count
-        db.delete(challenge_entry)
+    # 카운터를 쓰지 않는 인증기(항상 0)는 쓰기 없이 통과
+    if verification.new_sign_count > (login.sign_count or 0):
+        if not crud_passkey.advance_sign_count(db, login.passkey_id, verification.new_sign_count):
+            # 같은 카운터의 다른 로그인이 먼저 반영됨
+            db.rollback()
+            raise HTTPException(status_code=400, detail="로그인 인증 실패")
         db.commit()
 
-        access_token = create_access_token(data={"sub": str(user.id)})
-        refresh_token = create_refresh_token(data={"sub": str(user.id)})
+    access_token = create_access_token(data=token_claims(login))
+    refresh_token = create_refresh_token(data={"sub": str(login.id)})
 
-        return {
-            "access_token": access_token,
-            "refresh_token": refresh_token,
-            "token_type": "bearer"
-        }
-    except Exception as e:
-        print(f"❌ Login Verify Error: {e}")
-        raise HTTPException(status_code=400, detail="로그인 인증 실패")
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer"
+    }
 
 
 # --------------------------------------------------------------------------
@@ -342,7 +316,7 @@ def login_verify(
 @router.get("/list", response_model=List[PasskeyResponse])
 def get_my_passkeys(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenPrincipal = Depends(get_current_principal)
 ):
     passkeys = db.query(Passkey).filter(Passkey.user_id == current_user.id).all()
     return passkeys
@@ -351,7 +325,7 @@ def get_my_passkeys(
 def delete_passkey(
     passkey_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenPrincipal = Depends(get_current_principal)
 ):
     passkey = db.query(Passkey).filter(
         Passkey.id == passkey_id,
@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Any, List  
 
 from database import get_db
 from api import deps        
+from core import passwords
 from models.user import User  
+from schemas.token import TokenPrincipal
 
 
 import schemas.user as user_schemas        
@@ -25,23 +28,26 @@ def check_username(username: str, db: Session = Depends(get_db)):
 
 # 회원가입 
 @router.post("/register", response_model=user_schemas.UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user: user_schemas.UserCreate, db: Session = Depends(get_db)):
+async def register(user: user_schemas.UserCreate, db: Session = Depends(get_db)):
+    # DB 작업은 스레드풀, 비밀번호 해시는 core.passwords 전용 풀에서 실행
     # 이메일 중복 체크
-    if user_crud.get_user_by_email(db, email=user.email):
+    if await run_in_threadpool(user_crud.get_user_by_email, db, email=user.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="이미 가입된 이메일입니다."
         )
     
     # 아이디 중복 체크
-    if user_crud.get_user_by_username(db, username=user.username):
+    if await run_in_threadpool(user_crud.get_user_by_username, db, username=user.username):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="이미 사용 중인 아이디입니다."
         )
 
-    # 유저 생성
-    return user_crud.create_user(db=db, user=user)
+    # 유저 생성 (해시 계산 동안 커넥션을 풀에 돌려둔다)
+    await run_in_threadpool(db.close)
+    hashed_password = await passwords.hash_password(user.password) if user.password else None
+    return await run_in_threadpool(user_crud.create_user, db=db, user=user, hashed_password=hashed_password)
 
 
 # 내 프로필 조회 (로그인 테스트용으로도 좋음)
@@ -55,9 +61,9 @@ def read_own_posts(
     skip: int = 0, 
     limit: int = 10, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: TokenPrincipal = Depends(deps.get_current_principal)
 ):
-    return crud_community.get_my_posts(db, user_id=current_user.id, skip=skip, limit=limit)
+    return crud_community.get_my_posts(db, user_id=current_user.id, skip=skip, limit=limit, full=True)
 
 # 내가 스크랩한 글 목록
 @router.get("/me/scraps", response_model=List[community_schemas.PostResponse])
@@ -65,6 +71,6 @@ def read_own_scraps(
     skip: int = 0, 
     limit: int = 10, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: TokenPrincipal = Depends(deps.get_current_principal)
 ):
-    return crud_community.get_my_scraps(db, user_id=current_user.id, skip=skip, limit=limit)
\ No newline at end of file
+    return crud_community.get_my_scraps(db, user_id=current_user.id, skip=skip, limit=limit, full=True)
\ No newline at end of file
@@ -0,0 +1,197 @@
+"""
+sync 라우터 vs async 라우터 동시 처리량 벤치마크 (uvicorn 워커 1개)
+
+같은 DB/같은 풀 크기로 uvicorn을 ASYNC_ROUTERS="" 와 ASYNC_ROUTERS=community 로 각각 띄우고,
+커뮤니티 조회 API(목록/상세)에 동시 요청 BENCH_CONCURRENCY 개(기본 80)를
+BENCH_DURATION 초 동안 보내 처리량과 지연시간을 비교한다.
+sync 라우터는 스레드풀(기본 40) 크기만큼만 동시에 처리한다.
+
+로컬 DB는 왕복 지연이 거의 없어 원격 DB(Supabase)와 다르므로, 앱과 DB 사이에
+패킷마다 BENCH_DB_LATENCY_MS(기본 20ms, 왕복) 지연을 넣는 프록시를 두고 측정한다.
+
+    cd backend
+    BENCH_DATABASE_URL=postgresql://postgres@localhost/mate_bench python -m benchmarks.bench_async
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from benchmarks.common import create_tables, ensure_bench_user
+
+import threading
+
+import httpx
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from database import engine
+
+CONCURRENCY = int(os.getenv("BENCH_CONCURRENCY", 80))
+DURATION = float(os.getenv("BENCH_DURATION", 10))
+WARMUP = float(os.getenv("BENCH_WARMUP", 5))  # 풀 커넥션을 미리 채우는 시간 (측정 제외)
+DB_LATENCY = float(os.getenv("BENCH_DB_LATENCY_MS", 20)) / 1000
+# 풀 대기가 없도록 동시 요청 수만큼 (sync 라우터는 풀이 모자라면 멈춤, database.py 참고)
+POOL_SIZE = os.getenv("BENCH_POOL_SIZE", str(CONCURRENCY))
+SEED_POSTS = int(os.getenv("BENCH_POSTS", 10_000))
+
+
+def seed():
+    create_tables()
+    with engine.begin() as conn:
+        if not conn.execute(text("SELECT count(*) FROM posts")).scalar():
+            user_id = ensure_bench_user(conn)
+            conn.execute(text("""
+                INSERT INTO posts (category, title, content, view_count, like_count, comment_count, scrap_count,
+                                   media_urls, created_at, author_id)
+                SELECT 'FREE', 'post ' || g, 'bench', 0, 0, 0, 0, '[]', now() - (g || ' seconds')::interval, :user_id
+                FROM generate_series(1, :n) AS g
+            """), {"n": SEED_POSTS, "user_id": user_id})
+        return conn.execute(text("SELECT id FROM posts ORDER BY id DESC LIMIT 100")).scalars().all()
+
+
+class LatencyProxy(threading.Thread):
+    """DB 앞에 두는 TCP 프록시: 각 방향으로 지연의 절반씩 늦게 전달 (순서는 유지)"""
+
+    def __init__(self, url):
+        super().__init__(daemon=True)
+        self.target = make_url(url)
+        self.port = free_port()
+        self.ready = threading.Event()
+
+    @property
+    def url(self):
+        target = self.target.difference_update_query(["host"])
+        return target.set(host="127.0.0.1", port=self.port).render_as_string(hide_password=False)
+
+    async def open_target(self):
+        socket_dir = self.target.query.get("host")
+        if socket_dir:
+            path = f"{socket_dir}/.s.PGSQL.{self.target.port or 5432}"
+            return await asyncio.open_unix_connection(path)
+        return await asyncio.open_connection(self.target.host or "localhost", self.target.port or 5432)
+
+    async def pipe(self, reader, writer):
+        queue = asyncio.Queue()
+
+        async def deliver():
+            while True:
+                due, data = await queue.get()
+                if data is None:
+                    break
+                await asyncio.sleep(max(0, due - time.perf_counter()))
+                writer.write(data)
+                await writer.drain()
+            writer.close()
+
+        sender = asyncio.create_task(deliver())
+        while data := await reader.read(65536):
+            queue.put_nowait((time.perf_counter() + DB_LATENCY / 2, data))
+        queue.put_nowait((0, None))
+        await sender
+
+    async def handle(self, client_reader, client_writer):
+        server_reader, server_writer = await self.open_target()
+        await asyncio.gather(
+            self.pipe(client_reader, server_writer),
+            self.pipe(server_reader, client_writer),
+            return_exceptions=True,
+        )
+
+    def run(self):
+        async def serve():
+            server = await asyncio.start_server(self.handle, "127.0.0.1", self.port)
+            self.ready.set()
+            async with server:
+                await server.serve_forever()
+
+        asyncio.run(serve())
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(async_routers, db_url):
+    port = free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": db_url,
+        "ASYNC_ROUTERS": async_routers,
+        "DB_POOL_SIZE": POOL_SIZE,
+        "DB_MAX_OVERFLOW": "0",
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    base = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            httpx.get(base + "/")
+            return proc, base
+        except httpx.TransportError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("uvicorn did not start")
+
+
+async def load(base, post_ids, duration):
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=CONCURRENCY, max_keepalive_connections=CONCURRENCY)
+
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=60) as client:
+        async def user(n):
+            nonlocal errors
+            i = n
+            while time.perf_counter() < deadline:
+                # 목록과 상세를 번갈아 요청
+                url = "/api/v1/community/posts?limit=20" if i % 2 else f"/api/v1/community/posts/{post_ids[i % len(post_ids)]}"
+                i += 1
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    ok = response.status_code == 200
+                except httpx.TransportError:
+                    ok = False
+                if not ok:
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        await asyncio.gather(*(user(n) for n in range(CONCURRENCY)))
+
+    latencies.sort()
+    return (
+        len(latencies) / duration,
+        latencies[len(latencies) // 2],
+        latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        errors,
+    )
+
+
+def main():
+    post_ids = seed()
+    proxy = LatencyProxy(os.environ["BENCH_DATABASE_URL"])
+    proxy.start()
+    proxy.ready.wait()
+    print(f"concurrency={CONCURRENCY} duration={DURATION}s pool={POOL_SIZE} db_latency={DB_LATENCY * 1000:.0f}ms")
+    print(f"{'routers':<8} | {'req/s':>8} | {'p50 (ms)':>9} | {'p99 (ms)':>9} | {'errors':>6}")
+    for label, async_routers in [("sync", ""), ("async", "community")]:
+        proc, base = start_server(async_routers, proxy.url)
+        try:
+            asyncio.run(load(base, post_ids, WARMUP))
+            rps, p50, p99, errors = asyncio.run(load(base, post_ids, DURATION))
+        finally:
+            proc.terminate()
+            proc.wait()
+        print(f"{label:<8} | {rps:>8.1f} | {p50:>9.2f} | {p99:>9.2f} | {errors:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+콜드 스타트 벤치마크 (main.handler)
+
+새 파이썬 프로세스에서 `import main` 후 첫 요청을 처리하기까지의 시간을 BENCH_RUNS 회(기본 5) 재서
+중앙값을 출력한다. 시나리오는 헬스체크(GET /)와 피드 첫 페이지(GET /api/v1/community/posts).
+지연 로딩 대상 모듈(LAZY_MODULES)이 부팅 시 로딩되면 경고하고,
+BENCH_COLD_START_BUDGET_MS 를 주면 피드 시나리오 중앙값이 예산을 넘을 때 종료 코드 1로 끝난다.
+
+    cd backend
+    BENCH_DATABASE_URL=postgresql://postgres@localhost/mate_bench python -m benchmarks.bench_cold_start
+    # 모듈별 import 시간 (python -X importtime) 상위 목록
+    BENCH_DATABASE_URL=... python -m benchmarks.bench_cold_start --profile
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import benchmarks.common  # noqa: F401 (DATABASE_URL 설정)
+
+RUNS = int(os.getenv("BENCH_RUNS", 5))
+BUDGET_MS = float(os.getenv("BENCH_COLD_START_BUDGET_MS", 0))
+TOP = 20
+
+# 해당 라우트를 처음 쓸 때만 로딩되어야 하는 모듈
+LAZY_MODULES = [
+    "webauthn", "cbor2", "cryptography", "user_agents", "ua_parser",
+    "passlib", "bcrypt", "jose", "smtplib", "email.mime", "asyncpg",
+]
+
+SCENARIOS = {
+    "health": ("/", ""),
+    "feed": ("/api/v1/community/posts", "limit=20"),
+}
+
+# API Gateway HTTP API(v2) 이벤트를 흉내 내 Mangum 경로를 그대로 탄다
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+loaded = [m for m in {lazy!r} if m in sys.modules]
+path, query = {scenario!r}
+event = {{
+    "version": "2.0", "routeKey": "$default", "rawPath": path, "rawQueryString": query,
+    "headers": {{"host": "localhost", "x-forwarded-proto": "https", "x-forwarded-port": "443"}},
+    "requestContext": {{
+        "http": {{"method": "GET", "path": path, "protocol": "HTTP/1.1", "sourceIp": "127.0.0.1", "userAgent": "bench"}},
+        "stage": "$default", "requestId": "bench", "accountId": "0", "apiId": "bench",
+        "domainName": "localhost", "timeEpoch": 0,
+    }},
+    "isBase64Encoded": False,
+}}
+response = main.handler(event, None)
+handled = time.perf_counter()
+print(json.dumps({{
+    "status": response["statusCode"],
+    "import_ms": (imported - started) * 1000,
+    "first_request_ms": (handled - imported) * 1000,
+    "lazy_loaded": loaded,
+}}))
+"""
+
+
+def run_child(scenario, extra_args=()):
+    code = CHILD.format(lazy=LAZY_MODULES, scenario=scenario)
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, *extra_args, "-c", code],
+        capture_output=True, text=True, check=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["process_ms"] = wall_ms
+    return result, proc.stderr
+
+
+def profile():
+    """python -X importtime 결과에서 누적 시간 기준 상위 모듈 (main과 main이 직접 import한 모듈)"""
+    _, stderr = run_child(SCENARIOS["health"], ["-X", "importtime"])
+    rows = []
+    for line in stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth > 1:
+            continue  # 더 깊은 모듈은 상위 모듈 누적 시간에 포함됨
+        rows.append((int(cumulative_us), int(self_us), "  " * depth + name.strip()))
+    print(f"{'cumulative (ms)':>15} | {'self (ms)':>9} | module")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:TOP]:
+        print(f"{cumulative_us / 1000:>15.1f} | {self_us / 1000:>9.1f} | {name}")
+
+
+def main():
+    if "--profile" in sys.argv:
+        profile()
+        return
+
+    failed = False
+    print(f"runs={RUNS}")
+    print(f"{'scenario':<8} | {'process (ms)':>12} | {'import (ms)':>11} | {'1st req (ms)':>12} | lazy modules loaded at boot")
+    for name, scenario in SCENARIOS.items():
+        results = [run_child(scenario)[0] for _ in range(RUNS)]
+        if any(r["status"] != 200 for r in results):
+            print(f"{name}: unexpected status {[r['status'] for r in results]}")
+            failed = True
+        process_ms = statistics.median(r["process_ms"] for r in results)
+        import_ms = statistics.median(r["import_ms"] for r in results)
+        first_ms = statistics.median(r["first_request_ms"] for r in results)
+        loaded = sorted({m for r in results for m in r["lazy_loaded"]})
+        print(f"{name:<8} | {process_ms:>12.1f} | {import_ms:>11.1f} | {first_ms:>12.1f} | {', '.join(loaded) or '-'}")
+
+        if loaded:
+            failed = True
+        if name == "feed" and BUDGET_MS and import_ms + first_ms > BUDGET_MS:
+            print(f"cold start {import_ms + first_ms:.1f}ms > budget {BUDGET_MS:.0f}ms")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+커넥션 전략별 요청당 DB 준비 비용 벤치마크
+
+요청 하나를 "세션 생성 → SELECT 1 → 세션 종료"로 보고 DB_POOL_MODE별 p50/p99를 잰다.
+BENCH_PGBOUNCER_URL 이 있으면 pgbouncer 모드는 그 주소(풀러)로 측정한다.
+
+    cd backend
+    BENCH_DATABASE_URL=postgresql://postgres@localhost/mate_bench \
+    BENCH_PGBOUNCER_URL=postgresql://postgres@localhost:6432/mate_bench \
+        python -m benchmarks.bench_connections
+"""
+import os
+import statistics
+import time
+
+import benchmarks.common  # noqa: F401 (DATABASE_URL 설정)
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from database import build_engine
+
+REQUESTS = int(os.getenv("BENCH_REQUESTS", 500))
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def measure(url, mode):
+    engine = build_engine(url, mode)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    samples = []
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        db = Session()
+        try:
+            db.execute(text("SELECT 1"))
+        finally:
+            db.close()
+        samples.append((time.perf_counter() - start) * 1000)
+    engine.dispose()
+    return statistics.median(samples), percentile(samples, 0.99)
+
+
+def main():
+    url = os.environ["BENCH_DATABASE_URL"]
+    targets = [("null", url), ("persistent", url)]
+    if os.getenv("BENCH_PGBOUNCER_URL"):
+        targets.append(("pgbouncer", os.environ["BENCH_PGBOUNCER_URL"]))
+
+    print(f"{'mode':<11} | {'p50 (ms)':>9} | {'p99 (ms)':>9}")
+    for mode, target in targets:
+        p50, p99 = measure(target, mode)
+        print(f"{mode:<11} | {p50:>9.3f} | {p99:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
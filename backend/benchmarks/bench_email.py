@@ -0,0 +1,107 @@
+"""
+인증 메일 발송 벤치마크 (요청마다 SMTP 연결 vs outbound_emails 큐 + 연결 재사용)
+
+로컬 SMTP 서버(aiosmtpd)를 띄우고, 명령마다 BENCH_SMTP_LATENCY_MS(기본 50ms) 지연을 넣어
+원격 메일 서버를 흉내 낸다. 연결 직후 EHLO에는 STARTTLS/로그인 왕복을 감안해 3배 지연.
+BENCH_EMAILS 통(기본 200)을 두 방식으로 보내 요청 지연과 처리량을 비교한다.
+
+    pip install aiosmtpd
+    cd backend
+    BENCH_DATABASE_URL=postgresql://postgres@localhost/mate_bench python -m benchmarks.bench_email
+"""
+import asyncio
+import os
+import smtplib
+import time
+from email.mime.text import MIMEText
+
+os.environ.setdefault("SMTP_SERVER", "127.0.0.1")
+os.environ.setdefault("SMTP_PORT", "8025")
+os.environ.setdefault("SMTP_STARTTLS", "false")
+os.environ.setdefault("SMTP_FROM", "noreply@mate.test")
+
+from benchmarks.common import create_tables
+
+from aiosmtpd.controller import Controller
+from sqlalchemy import text
+
+import models.email  # noqa: F401 (테이블 등록)
+from database import engine, SessionLocal
+from crud import crud_email
+from core import email as mail
+
+EMAILS = int(os.getenv("BENCH_EMAILS", 200))
+LATENCY = float(os.getenv("BENCH_SMTP_LATENCY_MS", 50)) / 1000
+
+
+class SlowHandler:
+    def __init__(self):
+        self.received = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        await asyncio.sleep(LATENCY * 3)
+        session.host_name = hostname
+        return responses
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        await asyncio.sleep(LATENCY)
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        await asyncio.sleep(LATENCY)
+        self.received += 1
+        return "250 OK"
+
+
+def legacy_send(to_email, subject, html_body):
+    """변경 전 _send_smtp_email: 메일마다 연결/로그인 (비교용)"""
+    msg = MIMEText(html_body, "html")
+    msg["From"] = mail.SMTP_FROM
+    msg["To"] = to_email
+    msg["Subject"] = subject
+    with smtplib.SMTP(mail.SMTP_SERVER, mail.SMTP_PORT) as server:
+        server.send_message(msg)
+
+
+def main():
+    create_tables()
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM outbound_emails"))
+
+    handler = SlowHandler()
+    controller = Controller(handler, hostname=mail.SMTP_SERVER, port=mail.SMTP_PORT)
+    controller.start()
+    subject, html_body = mail.render_verification_email("123456")
+    try:
+        # 1) 요청 안에서 바로 발송
+        start = time.perf_counter()
+        for i in range(EMAILS):
+            legacy_send(f"user{i}@snu.ac.kr", subject, html_body)
+        legacy_elapsed = time.perf_counter() - start
+
+        # 2) 요청은 큐에 INSERT만, 발송기는 한 연결로 배치 발송
+        db = SessionLocal()
+        try:
+            start = time.perf_counter()
+            for i in range(EMAILS):
+                crud_email.enqueue_email(db, f"user{i}@snu.ac.kr", subject, html_body)
+                db.commit()
+            enqueue_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            sent = mail.send_outbound_emails(db, max_batches=EMAILS)
+            drain_elapsed = time.perf_counter() - start
+        finally:
+            db.close()
+    finally:
+        controller.stop()
+
+    print(f"emails={EMAILS} smtp_latency={LATENCY * 1000:.0f}ms received={handler.received}")
+    print(f"{'mode':<8} | {'request (ms)':>12} | {'emails/s':>9}")
+    print(f"{'legacy':<8} | {legacy_elapsed / EMAILS * 1000:>12.2f} | {EMAILS / legacy_elapsed:>9.1f}")
+    print(f"{'outbox':<8} | {enqueue_elapsed / EMAILS * 1000:>12.2f} | {sent / drain_elapsed:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+피드 응답 캐시 벤치마크 (캐시 없음 vs memory vs redis)
+
+같은 피드 요청(최신/카테고리/인기글)을 앱 안에서(TestClient) 반복 호출해 요청당 시간을 비교한다.
+redis는 BENCH_REDIS_URL이 있으면 그 서버, 없으면 fakeredis(설치된 경우)로 측정한다.
+bench_pagination으로 시드한 DB를 그대로 쓸 수 있다.
+
+    cd backend
+    BENCH_DATABASE_URL=postgresql://postgres@localhost/mate_bench python -m benchmarks.bench_feed_cache
+"""
+import os
+
+from benchmarks.common import create_tables, timed
+
+from fastapi.testclient import TestClient
+
+import main
+from core import feed_cache
+from core.feed_cache import FeedCache, MemoryBackend, RedisBackend
+
+REQUESTS = int(os.getenv("BENCH_REQUESTS", 200))
+URLS = [
+    "/api/v1/community/posts?limit=20",
+    "/api/v1/community/posts?limit=20&category=FREE&cursor=",
+    "/api/v1/community/posts?sort=best&limit=5",
+]
+
+
+def redis_cache():
+    if os.getenv("BENCH_REDIS_URL"):
+        return FeedCache(RedisBackend.from_url(os.environ["BENCH_REDIS_URL"], 60))
+    try:
+        import fakeredis
+    except ImportError:
+        return None
+    return FeedCache(RedisBackend(fakeredis.FakeRedis(), 60))
+
+
+def run():
+    create_tables()
+    backends = [("none", None), ("memory", FeedCache(MemoryBackend(256, 60))), ("redis", redis_cache())]
+    with TestClient(main.app) as client:
+        print(f"{'backend':<8} | " + " | ".join(f"{url.split('?')[1][:28]:>28}" for url in URLS) + "   (ms/request)")
+        for name, cache in backends:
+            if name != "none" and cache is None:
+                continue
+            feed_cache.set_feed_cache(cache)
+            row = []
+            for url in URLS:
+                client.get(url)  # 캐시 채우기
+                row.append(timed(lambda: [client.get(url) for _ in range(REQUESTS)]) / REQUESTS)
+            print(f"{name:<8} | " + " | ".join(f"{ms:>28.3f}" for ms in row))
+
+
+if __name__ == "__main__":
+    run()
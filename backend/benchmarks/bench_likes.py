@@ -0,0 +1,93 @@
+"""
+좋아요 동시성 벤치마크
+
+게시글 하나에 서로 다른 유저 BENCH_LIKERS 명(기본 100)이 동시에 좋아요를 누르고
+처리량과 최종 카운트가 정확한지 확인한다. 비교용으로 변경 전 방식(읽고-수정-쓰기)도 같이 돌린다.
+
+    cd backend
+    BENCH_DATABASE_URL=postgresql://postgres@localhost/mate_bench python -m benchmarks.bench_likes
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import create_tables
+
+from sqlalchemy import text
+
+from database import engine, SessionLocal
+from models.community import Post, PostLike
+from crud import crud_community as crud
+
+LIKERS = int(os.getenv("BENCH_LIKERS", 100))
+ROUNDS = int(os.getenv("BENCH_ROUNDS", 5))
+
+
+def legacy_toggle_like(db, post_id, user_id):
+    """변경 전 toggle_like (비교용)"""
+    post = db.query(Post).filter(Post.id == post_id).first()
+    existing_like = db.query(PostLike).filter(PostLike.post_id == post_id, PostLike.user_id == user_id).first()
+    if existing_like:
+        db.delete(existing_like)
+        post.like_count -= 1
+    else:
+        db.add(PostLike(post_id=post_id, user_id=user_id))
+        post.like_count += 1
+    db.commit()
+
+
+def seed():
+    create_tables()
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO users (username, nickname, email, is_active, is_student_verified)
+            SELECT 'liker' || g, 'liker' || g, 'liker' || g || '@snu.ac.kr', true, false
+            FROM generate_series(1, :n) AS g
+            ON CONFLICT DO NOTHING
+        """), {"n": LIKERS})
+        user_ids = conn.execute(text(
+            "SELECT id FROM users WHERE username LIKE 'liker%' ORDER BY id LIMIT :n"
+        ), {"n": LIKERS}).scalars().all()
+        post_id = conn.execute(text("""
+            INSERT INTO posts (category, title, content, view_count, like_count, comment_count, scrap_count,
+                               media_urls, author_id)
+            VALUES ('FREE', 'like storm', 'bench', 0, 0, 0, 0, '[]', :author_id)
+            RETURNING id
+        """), {"author_id": user_ids[0]}).scalar()
+    return post_id, user_ids
+
+
+def storm(toggle, post_id, user_ids):
+    def like(user_id):
+        db = SessionLocal()
+        try:
+            toggle(db, post_id, user_id)
+            return True
+        except Exception:
+            db.rollback()
+            return False
+        finally:
+            db.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(user_ids)) as pool:
+        results = list(pool.map(like, user_ids))
+    elapsed = time.perf_counter() - start
+
+    with engine.connect() as conn:
+        count = conn.execute(text("SELECT like_count FROM posts WHERE id = :id"), {"id": post_id}).scalar()
+        rows = conn.execute(text("SELECT count(*) FROM post_likes WHERE post_id = :id"), {"id": post_id}).scalar()
+    return len(user_ids) / elapsed, results.count(False), count, rows
+
+
+def main():
+    print(f"{'mode':<8} | {'round':>5} | {'likes/s':>9} | {'errors':>6} | {'like_count':>10} | {'rows':>5}")
+    for mode, toggle in [("legacy", legacy_toggle_like), ("atomic", crud.toggle_like)]:
+        for round_no in range(1, ROUNDS + 1):
+            post_id, user_ids = seed()
+            throughput, errors, count, rows = storm(toggle, post_id, user_ids)
+            print(f"{mode:<8} | {round_no:>5} | {throughput:>9.1f} | {errors:>6} | {count:>10} | {rows:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+로그인 폭주 중 피드 지연시간 벤치마크 (uvicorn 워커 1개)
+
+BCRYPT_ROUNDS x PASSWORD_HASH_EXECUTOR 조합마다 uvicorn을 띄우고
+로그인 요청 BENCH_LOGIN_CONCURRENCY 개(기본 8)와 피드 요청 BENCH_FEED_CONCURRENCY 개(기본 8)를
+BENCH_DURATION 초 동안 동시에 보내 로그인 처리량과 피드 지연시간을 본다.
+첫 줄(feed only)은 로그인 없이 피드만 보낸 기준값이다.
+
+    cd backend
+    BENCH_DATABASE_URL=postgresql://postgres@localhost/mate_bench python -m benchmarks.bench_login
+    BENCH_ROUNDS=10,12,13 BENCH_EXECUTORS=thread,process python -m benchmarks.bench_login
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import create_tables, ensure_bench_user
+from benchmarks.bench_async import free_port
+
+import httpx
+from sqlalchemy import text
+
+from core.passwords import build_context
+from database import engine
+
+LOGIN_CONCURRENCY = int(os.getenv("BENCH_LOGIN_CONCURRENCY", 8))
+FEED_CONCURRENCY = int(os.getenv("BENCH_FEED_CONCURRENCY", 8))
+DURATION = float(os.getenv("BENCH_DURATION", 10))
+ROUNDS = [int(r) for r in os.getenv("BENCH_ROUNDS", "10,12").split(",")]
+EXECUTORS = os.getenv("BENCH_EXECUTORS", "thread,process").split(",")
+PASSWORD = "bench-password"
+
+
+def seed():
+    create_tables()
+    with engine.begin() as conn:
+        user_id = ensure_bench_user(conn)
+        if not conn.execute(text("SELECT count(*) FROM posts")).scalar():
+            conn.execute(text("""
+                INSERT INTO posts (category, title, content, view_count, like_count, comment_count, scrap_count,
+                                   media_urls, created_at, author_id)
+                SELECT 'FREE', 'post ' || g, 'bench', 0, 0, 0, 0, '[]', now() - (g || ' seconds')::interval, :user_id
+                FROM generate_series(1, 1000) AS g
+            """), {"user_id": user_id})
+
+
+def set_password(rounds):
+    # 서버 설정과 같은 비용으로 저장해 벤치마크 중 재해시가 일어나지 않게 한다
+    hashed = build_context("bcrypt", bcrypt_rounds=rounds).hash(PASSWORD)
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE users SET password = :hashed WHERE username = 'bench'"), {"hashed": hashed})
+
+
+def start_server(rounds, executor):
+    port = free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": os.environ["BENCH_DATABASE_URL"],
+        "PASSWORD_SCHEME": "bcrypt",
+        "BCRYPT_ROUNDS": str(rounds),
+        "PASSWORD_HASH_EXECUTOR": executor,
+        # 피드 응답 캐시를 끄고 매번 DB 조회 (스레드풀 경쟁을 보기 위해)
+        "FEED_CACHE_TTL_SECONDS": "0",
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    base = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            httpx.get(base + "/")
+            return proc, base
+        except httpx.TransportError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("uvicorn did not start")
+
+
+def percentile(samples, q):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+async def load(base, login_clients, duration):
+    logins, feeds = [], []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=login_clients + FEED_CONCURRENCY)
+
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=60) as client:
+        async def worker(samples, request):
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    ok = (await request()).status_code == 200
+                except httpx.TransportError:
+                    ok = False
+                if not ok:
+                    errors += 1
+                samples.append((time.perf_counter() - start) * 1000)
+
+        def login():
+            return client.post("/api/v1/auth/login", data={"username": "bench", "password": PASSWORD})
+
+        def feed():
+            return client.get("/api/v1/community/posts?limit=20")
+
+        await asyncio.gather(
+            *(worker(logins, login) for _ in range(login_clients)),
+            *(worker(feeds, feed) for _ in range(FEED_CONCURRENCY)),
+        )
+
+    return logins, feeds, errors
+
+
+def main():
+    seed()
+    print(f"login clients={LOGIN_CONCURRENCY} feed clients={FEED_CONCURRENCY} duration={DURATION}s cpus={os.cpu_count()}")
+    print(f"{'rounds':>6} | {'executor':<8} | {'login/s':>7} | {'login p50':>9} | {'feed/s':>7} | "
+          f"{'feed p50':>8} | {'feed p99':>8} | {'errors':>6}")
+
+    runs = [(ROUNDS[0], EXECUTORS[0], 0)] + [(r, e, LOGIN_CONCURRENCY) for r in ROUNDS for e in EXECUTORS]
+    for rounds, executor, login_clients in runs:
+        set_password(rounds)
+        proc, base = start_server(rounds, executor)
+        try:
+            # 풀 커넥션/해시 워커 준비 (측정 제외)
+            asyncio.run(load(base, min(1, login_clients), 2))
+            logins, feeds, errors = asyncio.run(load(base, login_clients, DURATION))
+        finally:
+            proc.terminate()
+            proc.wait()
+        label = executor if login_clients else "feed only"
+        print(f"{rounds:>6} | {label:<8} | {len(logins) / DURATION:>7.1f} | {percentile(logins, 0.5):>9.1f} | "
+              f"{len(feeds) / DURATION:>7.1f} | {percentile(feeds, 0.5):>8.1f} | {percentile(feeds, 0.99):>8.1f} | {errors:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+게시글 피드 페이지네이션 벤치마크 (OFFSET vs 커서)
+
+로컬 Postgres에 게시글 100만 개를 넣고 1 / 1,000 / 50,000 페이지를 두 방식으로 조회해 비교한다.
+
+    cd backend
+    BENCH_DATABASE_URL=postgresql://postgres@localhost/mate_bench python -m benchmarks.bench_pagination
+"""
+import os
+
+from benchmarks.common import create_tables, ensure_bench_user, timed
+
+from sqlalchemy import text
+
+from database import engine, SessionLocal
+from models.community import Post
+from crud import crud_community as crud
+
+TOTAL_POSTS = int(os.getenv("BENCH_POSTS", 1_000_000))
+LIMIT = 20
+PAGES = [1, 1_000, 50_000]
+
+
+def seed():
+    create_tables()
+    with engine.begin() as conn:
+        count = conn.execute(text("SELECT count(*) FROM posts")).scalar()
+        if count >= TOTAL_POSTS:
+            return
+        user_id = ensure_bench_user(conn)
+        conn.execute(text("""
+            INSERT INTO posts (category, title, content, view_count, like_count, comment_count, scrap_count,
+                               media_urls, created_at, author_id)
+            SELECT 'FREE', 'bench ' || g, 'content ' || g, 0, 0, 0, 0, '[]',
+                   now() - (g || ' seconds')::interval, :user_id
+            FROM generate_series(1, :n) AS g
+        """), {"n": TOTAL_POSTS - count, "user_id": user_id})
+        conn.execute(text("ANALYZE posts"))
+
+
+def main():
+    seed()
+    db = SessionLocal()
+    try:
+        print(f"{'page':>8} | {'offset (ms)':>12} | {'cursor (ms)':>12}")
+        for page in PAGES:
+            skip = (page - 1) * LIMIT
+            if skip >= TOTAL_POSTS:
+                continue
+            # 커서 모드에서 해당 페이지 직전 항목의 커서 (측정 대상 아님)
+            after = None
+            if skip:
+                row = db.query(Post.created_at, Post.id)\
+                    .order_by(Post.created_at.desc(), Post.id.desc())\
+                    .offset(skip - 1).limit(1).one()
+                after = (row.created_at, row.id)
+
+            offset_ms = timed(lambda: crud.get_posts(db, skip=skip, limit=LIMIT))
+            cursor_ms = timed(lambda: crud.get_posts(db, limit=LIMIT, after=after))
+            print(f"{page:>8} | {offset_ms:>12.2f} | {cursor_ms:>12.2f}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
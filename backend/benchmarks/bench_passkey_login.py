@@ -0,0 +1,197 @@
+"""
+패스키 로그인 처리량 벤치마크 (uvicorn 워커 1개)
+
+소프트웨어 인증기(P-256 키)로 실제 서명한 assertion을 만들어
+/login/options -> /login/verify 를 BENCH_CONCURRENCY 명(기본 16)이 BENCH_DURATION 초 동안 반복한다.
+PASSKEY_CHALLENGE_STORE(db, memory)와 서명 카운터(항상 0 / 매번 증가)별로 초당 로그인 수를 본다.
+bench_async와 같이 앱과 DB 사이에 BENCH_DB_LATENCY_MS(기본 20ms) 지연 프록시를 둔다.
+
+    cd backend
+    BENCH_DATABASE_URL=postgresql://postgres@localhost/mate_bench python -m benchmarks.bench_passkey_login
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import time
+
+from benchmarks.common import create_tables
+from benchmarks.bench_async import DB_LATENCY, LatencyProxy, start_server
+
+import httpx
+from sqlalchemy import event, text
+
+from core.config import settings
+from database import engine
+
+CONCURRENCY = int(os.getenv("BENCH_CONCURRENCY", 16))
+DURATION = float(os.getenv("BENCH_DURATION", 10))
+STORES = os.getenv("BENCH_STORES", "db,memory").split(",")
+
+
+def b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+class SoftAuthenticator:
+    """패스키 하나를 흉내 내는 인증기 (ES256)"""
+
+    def __init__(self, username: str, rp_id: str = settings.RP_ID, origin: str = settings.RP_ORIGIN):
+        import cbor2
+        from cryptography.hazmat.primitives.asymmetric import ec
+
+        self.username = username
+        self.rp_id = rp_id
+        self.origin = origin
+        self.key = ec.generate_private_key(ec.SECP256R1())
+        self.credential_id = b64url(os.urandom(16))
+        self.counter = 0
+        numbers = self.key.public_key().public_numbers()
+        # COSE_Key: kty=EC2, alg=ES256, crv=P-256, x, y
+        cose_key = cbor2.dumps({1: 2, 3: -7, -1: 1, -2: numbers.x.to_bytes(32, "big"), -3: numbers.y.to_bytes(32, "big")})
+        self.public_key = base64.b64encode(cose_key).decode()
+
+    def registration(self, challenge: str) -> dict:
+        """/signup/verify 용 attestation (fmt=none)"""
+        import cbor2
+
+        client_data = json.dumps({"type": "webauthn.create", "challenge": challenge, "origin": self.origin}).encode()
+        raw_id = base64.urlsafe_b64decode(self.credential_id + "==")
+        # rpIdHash + flags(UP|UV|AT) + signCount + AAGUID + credentialId + COSE_Key
+        authenticator_data = (
+            hashlib.sha256(self.rp_id.encode()).digest() + bytes([0x45]) + self.counter.to_bytes(4, "big")
+            + bytes(16) + len(raw_id).to_bytes(2, "big") + raw_id + base64.b64decode(self.public_key)
+        )
+        attestation = cbor2.dumps({"fmt": "none", "attStmt": {}, "authData": authenticator_data})
+        return {
+            "id": self.credential_id,
+            "rawId": self.credential_id,
+            "type": "public-key",
+            "response": {"clientDataJSON": b64url(client_data), "attestationObject": b64url(attestation)},
+            "clientExtensionResults": {},
+        }
+
+    def assertion(self, challenge: str, count: bool) -> dict:
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import ec
+
+        if count:
+            self.counter += 1
+        client_data = json.dumps({"type": "webauthn.get", "challenge": challenge, "origin": self.origin}).encode()
+        # rpIdHash + flags(UP|UV) + signCount
+        authenticator_data = hashlib.sha256(self.rp_id.encode()).digest() + bytes([0x05]) + self.counter.to_bytes(4, "big")
+        signature = self.key.sign(authenticator_data + hashlib.sha256(client_data).digest(), ec.ECDSA(hashes.SHA256()))
+        return {
+            "id": self.credential_id,
+            "rawId": self.credential_id,
+            "type": "public-key",
+            "response": {
+                "clientDataJSON": b64url(client_data),
+                "authenticatorData": b64url(authenticator_data),
+                "signature": b64url(signature),
+                "userHandle": "",
+            },
+            "clientExtensionResults": {},
+        }
+
+
+def seed():
+    create_tables()
+    authenticators = [SoftAuthenticator(f"passkey-bench-{n}") for n in range(CONCURRENCY)]
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM users WHERE username LIKE 'passkey-bench-%'"))
+        for auth in authenticators:
+            user_id = conn.execute(text(
+                "INSERT INTO users (username, nickname, email, is_active, is_student_verified) "
+                "VALUES (:u, :u, :u || '@bench.local', true, false) RETURNING id"
+            ), {"u": auth.username}).scalar()
+            conn.execute(text(
+                "INSERT INTO passkeys (user_id, credential_id, public_key, sign_count) VALUES (:user_id, :cid, :key, 0)"
+            ), {"user_id": user_id, "cid": auth.credential_id, "key": auth.public_key})
+    return authenticators
+
+
+async def login(client, auth, count):
+    options = await client.post("/api/v1/auth/passkey/login/options", json={"username": auth.username})
+    challenge = options.json()["challenge"]
+    return await client.post("/api/v1/auth/passkey/login/verify", json={
+        "username": auth.username, "response": auth.assertion(challenge, count),
+    })
+
+
+async def load(base, authenticators, count, duration):
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(base_url=base, timeout=60) as client:
+        async def user(auth):
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    ok = (await login(client, auth, count)).status_code == 200
+                except httpx.TransportError:
+                    ok = False
+                if not ok:
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        await asyncio.gather(*(user(auth) for auth in authenticators))
+
+    latencies.sort()
+    return (
+        len(latencies) / duration,
+        latencies[len(latencies) // 2],
+        latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        errors,
+    )
+
+
+def count_statements(auth, store, count):
+    """앱을 프로세스 안에서 띄워 로그인 1회(options + verify)의 SQL 수를 센다"""
+    from fastapi.testclient import TestClient
+    from core.challenge_store import build_challenge_store, set_challenge_store
+    import main
+
+    set_challenge_store(build_challenge_store(store))
+    statements = []
+    listener = lambda *args: statements.append(1)  # noqa: E731
+    with TestClient(main.app) as client:
+        options = client.post("/api/v1/auth/passkey/login/options", json={"username": auth.username})
+        event.listen(engine, "before_cursor_execute", listener)
+        options = client.post("/api/v1/auth/passkey/login/options", json={"username": auth.username})
+        response = client.post("/api/v1/auth/passkey/login/verify", json={
+            "username": auth.username, "response": auth.assertion(options.json()["challenge"], count),
+        })
+        event.remove(engine, "before_cursor_execute", listener)
+    assert response.status_code == 200, response.text
+    return len(statements)
+
+
+def main():
+    proxy = LatencyProxy(os.environ["BENCH_DATABASE_URL"])
+    proxy.start()
+    proxy.ready.wait()
+    print(f"concurrency={CONCURRENCY} duration={DURATION}s db_latency={DB_LATENCY * 1000:.0f}ms")
+    print(f"{'store':<7} | {'counter':<7} | {'SQL':>3} | {'logins/s':>8} | {'p50 (ms)':>9} | {'p99 (ms)':>9} | {'errors':>6}")
+    for store in STORES:
+        os.environ["PASSKEY_CHALLENGE_STORE"] = store
+        for count in (False, True):
+            # 저장된 서명 카운터를 0으로 새로 시작
+            authenticators = seed()
+            statements = count_statements(authenticators[0], store, count)
+            proc, base = start_server("", proxy.url)
+            try:
+                asyncio.run(load(base, authenticators, count, 2))
+                rps, p50, p99, errors = asyncio.run(load(base, authenticators, count, DURATION))
+            finally:
+                proc.terminate()
+                proc.wait()
+            label = "+1" if count else "0"
+            print(f"{store:<7} | {label:<7} | {statements:>3} | {rps:>8.1f} | {p50:>9.2f} | {p99:>9.2f} | {errors:>6}")
+
+
+if __name__ == "__main__":
+    main()
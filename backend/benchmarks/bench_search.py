@@ -0,0 +1,106 @@
+"""
+게시글 검색 벤치마크 (기존 ILIKE + 댓글 JOIN vs bigram tsvector + GIN)
+
+빈 DB에 게시글 BENCH_POSTS 개(기본 100만)와 게시글당 평균 3개의 댓글을 넣고
+검색 벡터를 채운 뒤, 같은 검색어로 두 경로의 첫 페이지 응답 시간을 비교한다.
+페이지네이션 벤치마크와 다른 DB를 쓰는 것을 권장한다.
+
+    cd backend
+    BENCH_DATABASE_URL=postgresql://postgres@localhost/mate_search python -m benchmarks.bench_search
+"""
+import os
+
+from benchmarks.common import create_tables, ensure_bench_user, timed
+
+from sqlalchemy import text, or_
+
+from database import engine, SessionLocal
+from models.community import Post, Comment
+from crud import crud_community as crud
+from core.search import build_document
+
+TOTAL_POSTS = int(os.getenv("BENCH_POSTS", 1_000_000))
+LIMIT = 20
+BATCH_SIZE = 5000
+TERMS = ["학식", "기숙사 신청", "중간고사", "돈까스", "없는검색어"]
+WORDS = [
+    "학식", "메뉴", "기숙사", "신청", "중간고사", "기말고사", "도서관", "열람실", "동아리", "모집",
+    "교수님", "과제", "팀플", "수강신청", "졸업", "취업", "인턴", "알바", "돈까스", "카페",
+    "스터디", "토익", "장학금", "등록금", "축제", "공연", "셔틀버스", "자취", "원룸", "중고",
+]
+
+
+def seed():
+    create_tables()
+    with engine.begin() as conn:
+        if conn.execute(text("SELECT count(*) FROM posts")).scalar():
+            return
+        user_id = ensure_bench_user(conn)
+        params = {"words": WORDS, "n": TOTAL_POSTS, "user_id": user_id}
+        # 단어 사전에서 무작위로 골라 제목 2단어, 본문 12단어, 댓글 4단어
+        # (서브쿼리가 바깥 행(g, c)을 참조해야 행마다 다시 계산됨)
+        conn.execute(text("""
+            INSERT INTO posts (category, title, content, view_count, like_count, comment_count, scrap_count,
+                               media_urls, created_at, author_id)
+            SELECT 'FREE',
+                   (SELECT string_agg((:words)[1 + floor(random() * 30)::int], ' ') FROM generate_series(1, 2) WHERE g > 0),
+                   (SELECT string_agg((:words)[1 + floor(random() * 30)::int], ' ') FROM generate_series(1, 12) WHERE g > 0),
+                   0, 0, 0, 0, '[]', now() - (g || ' seconds')::interval, :user_id
+            FROM generate_series(1, :n) AS g
+        """), params)
+        conn.execute(text("""
+            INSERT INTO comments (content, post_id, author_id, is_deleted, created_at)
+            SELECT (SELECT string_agg((:words)[1 + floor(random() * 30)::int], ' ') FROM generate_series(1, 4) WHERE c > 0),
+                   1 + floor(random() * :n)::int, :user_id, false, now()
+            FROM generate_series(1, :n * 3) AS c
+        """), params)
+
+    backfill("posts", "title, content", lambda row: build_document((row[1], "A"), (row[2], "B")))
+    backfill("comments", "content", lambda row: build_document((row[1], "A")))
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE posts"))
+        conn.execute(text("ANALYZE comments"))
+
+
+def backfill(table, columns, to_document):
+    last_id = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(text(
+                f"SELECT id, {columns} FROM {table} WHERE id > :last_id ORDER BY id LIMIT :n"
+            ), {"last_id": last_id, "n": BATCH_SIZE}).fetchall()
+            if not rows:
+                return
+            conn.execute(
+                text(f"UPDATE {table} SET search_vector = CAST(:doc AS tsvector) WHERE id = :id"),
+                [{"id": row[0], "doc": to_document(row)} for row in rows]
+            )
+            last_id = rows[-1][0]
+
+
+def legacy_search(db, term):
+    """변경 전 get_posts 검색 경로 (비교용)"""
+    pattern = f"%{term}%"
+    return db.query(Post)\
+        .outerjoin(Comment, Post.id == Comment.post_id)\
+        .filter(or_(Post.title.ilike(pattern), Post.content.ilike(pattern), Comment.content.ilike(pattern)))\
+        .distinct()\
+        .order_by(Post.created_at.desc())\
+        .limit(LIMIT).all()
+
+
+def main():
+    seed()
+    db = SessionLocal()
+    try:
+        print(f"{'term':<12} | {'ILIKE (ms)':>12} | {'tsvector (ms)':>14}")
+        for term in TERMS:
+            legacy_ms = timed(lambda: legacy_search(db, term), repeat=3)
+            indexed_ms = timed(lambda: crud.get_posts(db, limit=LIMIT, search=term))
+            print(f"{term:<12} | {legacy_ms:>12.2f} | {indexed_ms:>14.2f}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
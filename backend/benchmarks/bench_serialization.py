@@ -0,0 +1,110 @@
+"""
+목록 응답 직렬화 벤치마크 (ORM 객체 + response_model vs 컬럼 Row + orjson)
+
+게시글 100개 페이지를 두 방식으로 만들어 단계별 시간을 비교한다.
+- old: load_only ORM 객체 -> TypeAdapter(from_attributes) 검증 -> dump_python(mode="json") -> json.dumps
+       (FastAPI serialize_response + JSONResponse 경로)
+- new: LIST_COLUMNS Row -> serialization.row_dicts -> orjson (검증 없음)
+- new+validate: Row dict를 미리 만든 TypeAdapter로 검증 후 dump_json (검증이 필요한 경우의 비용)
+세 방식의 JSON 내용이 같은지도 확인한다.
+
+    cd backend
+    BENCH_DATABASE_URL=postgresql://postgres@localhost/mate_bench python -m benchmarks.bench_serialization
+"""
+import json
+import os
+from typing import List
+
+from benchmarks.common import create_tables, ensure_bench_user, timed
+
+from pydantic import TypeAdapter
+from sqlalchemy import select, text
+from sqlalchemy.orm import load_only
+from starlette.responses import JSONResponse
+
+from database import engine, SessionLocal
+from models.community import Post
+from crud import crud_community as crud
+from core import serialization
+from schemas.community import PostListResponse
+
+PAGE = int(os.getenv("BENCH_PAGE", 100))
+REPEAT = int(os.getenv("BENCH_REPEAT", 200))
+
+adapter = TypeAdapter(List[PostListResponse])
+
+
+def seed():
+    create_tables()
+    with engine.begin() as conn:
+        count = conn.execute(text("SELECT count(*) FROM posts")).scalar()
+        if count >= PAGE:
+            return
+        user_id = ensure_bench_user(conn)
+        conn.execute(text("""
+            INSERT INTO posts (category, title, content, view_count, like_count, comment_count, scrap_count,
+                               media_urls, created_at, author_id, author_nickname, author_university)
+            SELECT 'FREE', '벤치 게시글 ' || g, 'content ' || g, g, g % 7, g % 5, g % 3, '[]',
+                   now() - (g || ' seconds')::interval, :user_id, 'bench', '서울대학교'
+            FROM generate_series(1, :n) AS g
+        """), {"n": PAGE - count, "user_id": user_id})
+
+
+def old_fetch(db):
+    db.expunge_all()  # 매번 새로 ORM 객체를 만들도록 (요청마다 새 세션과 같게)
+    stmt = select(Post).options(load_only(*crud.LIST_COLUMNS))\
+        .order_by(Post.created_at.desc(), Post.id.desc()).limit(PAGE)
+    posts = db.scalars(stmt).all()
+    for post in posts:
+        post.is_liked = False
+        post.is_scrapped = False
+    return posts
+
+
+def old_serialize(posts) -> bytes:
+    value = adapter.validate_python(posts, from_attributes=True)
+    return JSONResponse(adapter.dump_python(value, mode="json")).body
+
+
+def new_fetch(db):
+    return crud.get_posts(db, limit=PAGE)
+
+
+def new_serialize(rows) -> bytes:
+    return serialization.dumps(serialization.row_dicts(rows, PostListResponse))
+
+
+def validated_serialize(rows) -> bytes:
+    return adapter.dump_json(adapter.validate_python(serialization.row_dicts(rows, PostListResponse)))
+
+
+def main():
+    seed()
+    db = SessionLocal()
+    try:
+        posts = old_fetch(db)
+        rows = new_fetch(db)
+        old_body, new_body, validated_body = old_serialize(posts), new_serialize(rows), validated_serialize(rows)
+        same = json.loads(old_body) == json.loads(new_body) == json.loads(validated_body)
+        print(f"{PAGE} items, {len(new_body):,} bytes, same content: {same}")
+
+        print(f"{'stage':<15} | {'old (ms)':>9} | {'new (ms)':>9} | {'new+validate (ms)':>17}")
+        fetch_old = timed(lambda: old_fetch(db), REPEAT)
+        fetch_new = timed(lambda: new_fetch(db), REPEAT)
+        print(f"{'fetch':<15} | {fetch_old:>9.3f} | {fetch_new:>9.3f} | {fetch_new:>17.3f}")
+        ser_old = timed(lambda: old_serialize(posts), REPEAT)
+        ser_new = timed(lambda: new_serialize(rows), REPEAT)
+        ser_validated = timed(lambda: validated_serialize(rows), REPEAT)
+        print(f"{'serialize':<15} | {ser_old:>9.3f} | {ser_new:>9.3f} | {ser_validated:>17.3f}")
+        total_old = timed(lambda: old_serialize(old_fetch(db)), REPEAT)
+        total_new = timed(lambda: new_serialize(new_fetch(db)), REPEAT)
+        total_validated = timed(lambda: validated_serialize(new_fetch(db)), REPEAT)
+        print(f"{'fetch+serialize':<15} | {total_old:>9.3f} | {total_new:>9.3f} | {total_validated:>17.3f}")
+        if not same:
+            raise SystemExit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,426 @@
+"""
+엔드포인트별 쿼리 수 회귀 검사 (N+1 탐지)
+
+모든 라우트(sync 라우터 + community async 라우터)를 관련 행이 1, 10, 100개인 시드 데이터로 한 번씩 호출해
+요청 하나가 실행하는 SQL 문 수를 센다. 다음 중 하나라도 해당하면 실패(exit 1)한다.
+- 관련 행 수에 따라 쿼리 수가 달라짐 (루프 안 lazy load 등 N+1)
+- BUDGETS에 적힌 쿼리 수를 넘음
+- 새 라우트에 검사 케이스(CASES)가 없음
+목록 API는 limit=100으로 호출해 관련 행이 모두 한 응답에 들어오게 한다.
+캐시(피드, 로그인 유저)는 끄고, 학교 디렉터리/챌린지 저장소는 기본 설정 그대로 잰다.
+
+크기마다 모든 테이블을 TRUNCATE 하므로 빈 검사용 DB를 지정한다 (다른 데이터가 있으면 중단).
+pytest(tests/test_query_budgets.py)에서도 같은 검사를 실행한다 (TEST_DATABASE_URL).
+
+    cd backend
+    BENCH_DATABASE_URL=postgresql://postgres@localhost/mate_queries python -m benchmarks.check_query_counts
+"""
+import os
+import sys
+
+# 캐시가 쿼리를 가리지 않도록 (database/core 모듈보다 먼저)
+os.environ["FEED_CACHE_TTL_SECONDS"] = "0"
+os.environ["USER_CACHE_TTL_SECONDS"] = "0"
+os.environ["EMAIL_DISPATCH"] = "scheduler"
+os.environ["PASSWORD_HASH_EXECUTOR"] = "thread"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["PERF_LOG"] = "off"
+os.environ["VIEW_FLUSH_THRESHOLD"] = "0"  # 조회수 즉시 반영이 상세 조회 쿼리 수에 섞이지 않도록 (스케줄러만)
+os.environ["VIEW_FLUSH_INTERVAL_SECONDS"] = "0"
+os.environ["DB_ASYNC_POOL_MODE"] = "null"  # TestClient 요청마다 이벤트 루프가 바뀔 수 있음
+os.environ.pop("ASYNC_ROUTERS", None)
+
+from benchmarks.common import create_tables
+from benchmarks.bench_passkey_login import SoftAuthenticator
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select, text
+from sqlalchemy.engine import Engine
+
+from main import app as sync_app
+import models.email  # noqa: F401 (테이블 등록)
+from database import Base, SessionLocal, engine
+from api.v1.endpoints import community_async
+from core.security import create_access_token, create_refresh_token, get_password_hash, token_claims
+from core.university_directory import get_directory, invalidate_directory
+from models.community import Post, Comment, PostLike, PostScrap, PostScore
+from models.passkey import Passkey
+from models.user import EmailVerification, University, User
+
+SIZES = (1, 10, 100)
+LIMIT = 100
+PASSWORD = "query-budget"
+FIXTURE_PREFIX = "qb-"
+
+# 요청 하나당 최대 SQL 문 수 (인증 조회 포함, 로그인 유저 캐시 없음 기준)
+# 커뮤니티 쓰기 API는 deps.get_current_writer의 유저 확인 1회 포함 (캐시가 켜져 있으면 대부분 0회)
+# 줄어들면 값을 낮추고, 늘려야 한다면 이유를 남긴다.
+# "경로?변형"은 같은 라우트의 다른 분기 (예: 댓글 목록의 글별/작성자별)
+BUDGETS = {
+    "GET /": 0,
+    "POST /api/v1/community/posts": 4,
+    "GET /api/v1/community/posts/me": 1,
+    "GET /api/v1/community/posts/scrapped": 1,
+    "GET /api/v1/community/posts": 1,
+    "GET /api/v1/community/posts?viewer": 3,
+    "POST /api/v1/community/posts/batch": 3,
+    "GET /api/v1/community/posts/{post_id}": 3,
+    "DELETE /api/v1/community/posts/{post_id}": 3,
+    "PUT /api/v1/community/posts/{post_id}": 4,
+    "POST /api/v1/community/comments": 5,
+    "GET /api/v1/community/comments": 1,
+    "GET /api/v1/community/comments?post": 1,
+    "GET /api/v1/community/comments/thread": 1,
+    "DELETE /api/v1/community/comments/{comment_id}": 6,
+    "POST /api/v1/community/posts/{post_id}/like": 3,
+    "POST /api/v1/community/posts/{post_id}/scrap": 2,
+    "GET /api/v1/users/check-username": 1,
+    "POST /api/v1/users/register": 4,
+    "GET /api/v1/users/me": 1,
+    "GET /api/v1/users/me/posts": 1,
+    "GET /api/v1/users/me/scraps": 1,
+    "POST /api/v1/auth/login": 1,
+    "POST /api/v1/auth/refresh": 1,
+    "POST /api/v1/auth/passkey/signup/options": 2,
+    "POST /api/v1/auth/passkey/signup/verify": 7,
+    "POST /api/v1/auth/passkey/login/options": 2,
+    "POST /api/v1/auth/passkey/login/verify": 3,
+    "GET /api/v1/auth/passkey/list": 1,
+    "DELETE /api/v1/auth/passkey/{passkey_id}": 3,
+    "POST /api/v1/auth/email/send": 3,
+    "POST /api/v1/auth/email/verify": 1,
+    "POST /api/v1/auth/school/send": 4,
+    "POST /api/v1/auth/school/verify": 7,
+    "GET /api/v1/auth/me": 1,
+}
+# community async 라우터 (ASYNC_ROUTERS=community)
+ASYNC_BUDGETS = {
+    "GET /api/v1/community/posts/me": 1,
+    "GET /api/v1/community/posts/scrapped": 1,
+    "GET /api/v1/community/posts": 1,
+    "GET /api/v1/community/posts?viewer": 3,
+    "GET /api/v1/community/posts/{post_id}": 3,
+    "GET /api/v1/community/comments": 1,
+    "GET /api/v1/community/comments?post": 1,
+    "GET /api/v1/community/comments/thread": 1,
+}
+
+
+class StatementCounter:
+    """with 블록 동안 모든 엔진(sync, async)이 실행한 SQL 문"""
+
+    def __init__(self):
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(Engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(Engine, "before_cursor_execute", self._record)
+
+
+def most_repeated(statements: list[str]) -> tuple[str, int]:
+    statement = max(set(statements), key=statements.count)
+    return statement, statements.count(statement)
+
+
+# ---------------------------------------------------------
+# 시드 (관련 행 n개)
+# ---------------------------------------------------------
+# - owner: 글 n개, 각 글에 좋아요/스크랩, 패스키 n개, 대상 글 댓글 n개에 대댓글, 다른 글마다 댓글
+# - 유저 n명: 각자 다른 학교, 대상 글(posts[0])에 댓글과 좋아요
+def reset_tables():
+    with engine.begin() as conn:
+        foreign = conn.execute(
+            text("SELECT count(*) FROM users WHERE username NOT LIKE :prefix"), {"prefix": FIXTURE_PREFIX + "%"}
+        ).scalar()
+        if foreign:
+            sys.exit(f"{engine.url.database}: 검사용이 아닌 유저 {foreign}명이 있습니다. 빈 DB를 지정하세요.")
+        tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+        conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+
+
+def seed(n: int) -> dict:
+    create_tables()
+    reset_tables()
+    authenticator = SoftAuthenticator(f"{FIXTURE_PREFIX}owner")
+    db = SessionLocal()
+    try:
+        snu = University(name="서울대학교", domain="snu.ac.kr")
+        schools = [University(name=f"QB 대학교 {i}", domain=f"qb{i}.ac.kr") for i in range(n)]
+        db.add_all([snu, *schools])
+        db.flush()
+
+        owner = User(username=authenticator.username, nickname="owner", email="qb-owner@example.com",
+                     password=get_password_hash(PASSWORD), is_active=True, university_id=snu.id)
+        users = [User(username=f"{FIXTURE_PREFIX}user{i}", nickname=f"user{i}", email=f"qb-user{i}@example.com",
+                      is_active=True, university_id=school.id) for i, school in enumerate(schools)]
+        db.add_all([owner, *users])
+        db.flush()
+
+        posts = [Post(title=f"post {i}", content="content", category="FREE", author_id=owner.id,
+                      author_nickname=owner.nickname, author_university=snu.name, like_count=1, scrap_count=1)
+                 for i in range(n)]
+        db.add_all(posts)
+        db.flush()
+        target = posts[0]
+
+        # 다른 학교 유저들의 댓글 + owner의 대댓글, owner가 다른 글마다 남긴 댓글
+        comments = [Comment(content=f"comment {i}", post_id=target.id, author_id=user.id, author_nickname=user.nickname,
+                            author_university=school.name) for i, (user, school) in enumerate(zip(users, schools))]
+        db.add_all(comments)
+        db.flush()
+        replies = [Comment(content="reply", post_id=target.id, parent_id=comment.id, author_id=owner.id,
+                           author_nickname=owner.nickname, author_university=snu.name) for comment in comments]
+        elsewhere = [Comment(content="elsewhere", post_id=post.id, author_id=owner.id,
+                             author_nickname=owner.nickname, author_university=snu.name) for post in posts[1:]]
+        db.add_all(replies + elsewhere)
+        target.comment_count = 2 * n
+        for post in posts[1:]:
+            post.comment_count = 1
+
+        db.add_all([PostLike(user_id=owner.id, post_id=post.id) for post in posts])
+        db.add_all([PostScrap(user_id=owner.id, post_id=post.id) for post in posts])
+        db.add_all([PostLike(user_id=user.id, post_id=target.id) for user in users])
+        target.like_count = 1 + n
+        db.add_all([PostScore(post_id=post.id, score=1, created_at=post.created_at) for post in posts])
+
+        passkey = Passkey(user_id=owner.id, credential_id=authenticator.credential_id,
+                          public_key=authenticator.public_key, sign_count=0)
+        spare = [Passkey(user_id=owner.id, credential_id=f"{FIXTURE_PREFIX}cred{i}", public_key="key", sign_count=0)
+                 for i in range(n)]
+        db.add_all([passkey, *spare])
+        db.commit()
+
+        # 학교 디렉터리는 인스턴스 수명 동안 한 번 읽으므로 미리 채운다
+        invalidate_directory()
+        get_directory(db)
+
+        return {
+            "n": n,
+            "owner": owner.id,
+            "headers": {"Authorization": "Bearer " + create_access_token(token_claims(owner))},
+            "refresh_token": create_refresh_token(data={"sub": str(owner.id)}),
+            "authenticator": authenticator,
+            "posts": [post.id for post in posts],
+            "target": target.id,
+            "comments": [comment.id for comment in comments],
+            "replies": [reply.id for reply in replies],
+            "spare_passkey": spare[-1].id,
+        }
+    finally:
+        db.close()
+
+
+def latest_code(email: str) -> str:
+    with engine.connect() as conn:
+        return conn.execute(select(EmailVerification.code).where(EmailVerification.email == email)).scalar()
+
+
+# ---------------------------------------------------------
+# 케이스: (client, fx, call) -> 응답
+# ---------------------------------------------------------
+# call(method, url, **kwargs)로 보낸 요청 하나만 센다 (준비 요청은 client로 직접).
+# 데이터를 지우는 케이스는 뒤쪽에 둔다.
+def posts_path(fx, index=0):
+    return f"/api/v1/community/posts/{fx['posts'][index]}"
+
+
+def school_verify(client, fx, call):
+    email = "owner@mail.snu.ac.kr"
+    client.post("/api/v1/auth/school/send", json={"email": email}, headers=fx["headers"])
+    return call("POST", "/api/v1/auth/school/verify", json={"email": email, "code": latest_code(email)},
+                headers=fx["headers"])
+
+
+def email_verify(client, fx, call):
+    email = "qb-verify@example.com"
+    client.post("/api/v1/auth/email/send", json={"email": email})
+    return call("POST", "/api/v1/auth/email/verify", json={"email": email, "code": latest_code(email)})
+
+
+def passkey_signup_verify(client, fx, call):
+    authenticator = SoftAuthenticator(f"{FIXTURE_PREFIX}signup")
+    options = client.post("/api/v1/auth/passkey/signup/options", json={"username": authenticator.username})
+    return call("POST", "/api/v1/auth/passkey/signup/verify", json={
+        "username": authenticator.username, "nickname": "signup", "email": "qb-signup@example.com",
+        "response": authenticator.registration(options.json()["challenge"]),
+    })
+
+
+def passkey_login_verify(client, fx, call):
+    authenticator = fx["authenticator"]
+    options = client.post("/api/v1/auth/passkey/login/options", json={"username": authenticator.username})
+    return call("POST", "/api/v1/auth/passkey/login/verify", json={
+        "username": authenticator.username, "response": authenticator.assertion(options.json()["challenge"], True),
+    })
+
+
+CASES = {
+    "GET /": lambda client, fx, call: call("GET", "/"),
+    "GET /api/v1/community/posts": lambda client, fx, call: call(
+        "GET", "/api/v1/community/posts", params={"limit": LIMIT}),
+    "GET /api/v1/community/posts?viewer": lambda client, fx, call: call(
+        "GET", "/api/v1/community/posts", params={"limit": LIMIT, "viewer": "true"}, headers=fx["headers"]),
+    "POST /api/v1/community/posts/batch": lambda client, fx, call: call(
+        "POST", "/api/v1/community/posts/batch", json={"ids": fx["posts"]}, headers=fx["headers"]),
+    "GET /api/v1/community/posts/me": lambda client, fx, call: call(
+        "GET", "/api/v1/community/posts/me", params={"limit": LIMIT}, headers=fx["headers"]),
+    "GET /api/v1/community/posts/scrapped": lambda client, fx, call: call(
+        "GET", "/api/v1/community/posts/scrapped", params={"limit": LIMIT}, headers=fx["headers"]),
+    "GET /api/v1/community/posts/{post_id}": lambda client, fx, call: call(
+        "GET", posts_path(fx), headers=fx["headers"]),
+    "GET /api/v1/community/comments": lambda client, fx, call: call(
+        "GET", "/api/v1/community/comments", params={"author": fx["owner"], "limit": LIMIT}),
+    "GET /api/v1/community/comments?post": lambda client, fx, call: call(
+        "GET", "/api/v1/community/comments", params={"post": fx["target"], "limit": LIMIT}),
+    "GET /api/v1/community/comments/thread": lambda client, fx, call: call(
+        "GET", "/api/v1/community/comments/thread", params={"post": fx["target"]}),
+    "GET /api/v1/users/me": lambda client, fx, call: call("GET", "/api/v1/users/me", headers=fx["headers"]),
+    "GET /api/v1/users/me/posts": lambda client, fx, call: call(
+        "GET", "/api/v1/users/me/posts", params={"limit": LIMIT}, headers=fx["headers"]),
+    "GET /api/v1/users/me/scraps": lambda client, fx, call: call(
+        "GET", "/api/v1/users/me/scraps", params={"limit": LIMIT}, headers=fx["headers"]),
+    "GET /api/v1/users/check-username": lambda client, fx, call: call(
+        "GET", "/api/v1/users/check-username", params={"username": "qb-free"}),
+    "GET /api/v1/auth/me": lambda client, fx, call: call("GET", "/api/v1/auth/me", headers=fx["headers"]),
+    "GET /api/v1/auth/passkey/list": lambda client, fx, call: call(
+        "GET", "/api/v1/auth/passkey/list", headers=fx["headers"]),
+    "POST /api/v1/community/posts": lambda client, fx, call: call(
+        "POST", "/api/v1/community/posts", json={"title": "new", "content": "new", "category": "FREE"},
+        headers=fx["headers"]),
+    "PUT /api/v1/community/posts/{post_id}": lambda client, fx, call: call(
+        "PUT", posts_path(fx, -1), json={"title": "edited"}, headers=fx["headers"]),
+    "POST /api/v1/community/comments": lambda client, fx, call: call(
+        "POST", "/api/v1/community/comments",
+        json={"content": "new", "post_id": fx["target"], "parent_id": fx["comments"][0]}, headers=fx["headers"]),
+    "POST /api/v1/community/posts/{post_id}/like": lambda client, fx, call: call(
+        "POST", posts_path(fx) + "/like", headers=fx["headers"]),
+    "POST /api/v1/community/posts/{post_id}/scrap": lambda client, fx, call: call(
+        "POST", posts_path(fx) + "/scrap", headers=fx["headers"]),
+    "POST /api/v1/users/register": lambda client, fx, call: call(
+        "POST", "/api/v1/users/register",
+        json={"email": "qb-new@example.com", "username": "qb-new", "nickname": "new", "password": PASSWORD}),
+    "POST /api/v1/auth/login": lambda client, fx, call: call(
+        "POST", "/api/v1/auth/login", data={"username": fx["authenticator"].username, "password": PASSWORD}),
+    "POST /api/v1/auth/refresh": lambda client, fx, call: call(
+        "POST", "/api/v1/auth/refresh", json={"refresh_token": fx["refresh_token"]}),
+    "POST /api/v1/auth/passkey/signup/options": lambda client, fx, call: call(
+        "POST", "/api/v1/auth/passkey/signup/options", json={"username": "qb-options"}),
+    "POST /api/v1/auth/passkey/signup/verify": passkey_signup_verify,
+    "POST /api/v1/auth/passkey/login/options": lambda client, fx, call: call(
+        "POST", "/api/v1/auth/passkey/login/options", json={"username": fx["authenticator"].username}),
+    "POST /api/v1/auth/passkey/login/verify": passkey_login_verify,
+    "POST /api/v1/auth/email/send": lambda client, fx, call: call(
+        "POST", "/api/v1/auth/email/send", json={"email": "qb-send@example.com"}),
+    "POST /api/v1/auth/email/verify": email_verify,
+    "POST /api/v1/auth/school/send": lambda client, fx, call: call(
+        "POST", "/api/v1/auth/school/send", json={"email": "send@snu.ac.kr"}, headers=fx["headers"]),
+    "POST /api/v1/auth/school/verify": school_verify,
+    "DELETE /api/v1/auth/passkey/{passkey_id}": lambda client, fx, call: call(
+        "DELETE", f"/api/v1/auth/passkey/{fx['spare_passkey']}", headers=fx["headers"]),
+    # 대댓글(leaf) 삭제 -> 글 댓글 수 갱신
+    "DELETE /api/v1/community/comments/{comment_id}": lambda client, fx, call: call(
+        "DELETE", f"/api/v1/community/comments/{fx['replies'][-1]}", headers=fx["headers"]),
+    # 댓글/좋아요/스크랩이 가장 많은 글 삭제
+    "DELETE /api/v1/community/posts/{post_id}": lambda client, fx, call: call(
+        "DELETE", posts_path(fx), headers=fx["headers"]),
+}
+
+
+def async_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(community_async.router, prefix="/api/v1/community")
+    return app
+
+
+def route_keys(app) -> list[str]:
+    keys = []
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            keys += [f"{method} {route.path}" for method in sorted(route.methods)]
+    return keys
+
+
+def measure(app, keys, fx) -> dict:
+    """key -> 실행된 SQL 문 목록 / 실패 응답이면 예외"""
+    results = {}
+    with TestClient(app) as client:
+        client.get("/api/v1/community/posts")  # 커넥션/방언 초기화 쿼리 제외
+
+        for key in keys:
+            counted = {}
+
+            def call(method, url, **kwargs):
+                with StatementCounter() as counter:
+                    response = client.request(method, url, **kwargs)
+                counted["counter"] = counter
+                return response
+
+            response = CASES[key](client, fx, call)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{key} -> {response.status_code} {response.text[:200]}")
+            results[key] = counted["counter"].statements
+    return results
+
+
+def check() -> list[str]:
+    """표를 출력하고 문제 목록을 돌려준다 (없으면 빈 목록)"""
+    apps = [("sync", sync_app, BUDGETS), ("async", async_app(), ASYNC_BUDGETS)]
+    budgets_by_label = {label: budgets for label, _, budgets in apps}
+    failures = []
+
+    for label, app, budgets in apps:
+        missing = [key for key in route_keys(app) if key not in budgets or key not in CASES]
+        for key in missing:
+            failures.append(f"{label} {key}: 검사 케이스/예산 없음")
+
+    keys = {label: [key for key in CASES if key in budgets] for label, _, budgets in apps}
+    counts = {}
+    for n in SIZES:
+        for label, app, _ in apps:
+            fx = seed(n)
+            for key, result in measure(app, keys[label], fx).items():
+                counts.setdefault((label, key), {})[n] = result
+
+    print(f"{'':<5} {'endpoint':<52} | " + " | ".join(f"n={n:<4}" for n in SIZES) + " | budget")
+    details = []
+    for (label, key), by_size in counts.items():
+        budget = budgets_by_label[label][key]
+        totals = [len(by_size[n]) for n in SIZES]
+        problems = []
+        if len(set(totals)) > 1:
+            statement, repeated = most_repeated(by_size[SIZES[-1]])
+            problems.append(f"쿼리 수가 행 수에 따라 증가 (n={SIZES[-1]}에서 {repeated}번 반복: {statement[:120]!r})")
+        if max(totals) > budget:
+            problems.append(f"예산 {budget} 초과")
+        status = "FAIL" if problems else "ok"
+        print(f"{status:<5} {label + ' ' + key:<52} | " + " | ".join(f"{t:<6}" for t in totals) + f" | {budget}")
+        failures += [f"{label} {key}: {problem}" for problem in problems]
+        if problems:
+            details.append((f"{label} {key} (n={SIZES[0]})", by_size[SIZES[0]]))
+
+    if failures:
+        print(f"\n{len(failures)} problem(s):")
+        for failure in failures:
+            print(f"  - {failure}")
+        for name, statements in details:
+            print(f"\n{name}:")
+            for statement in statements:
+                print("  " + " ".join(statement.split())[:160])
+    return failures
+
+
+def main():
+    if check():
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
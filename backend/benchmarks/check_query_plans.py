@@ -0,0 +1,166 @@
+"""
+쿼리 플랜 회귀 검사 (큰 테이블 Seq Scan 탐지)
+
+시드된 로컬 Postgres에서 crud가 실행하는 조회 쿼리마다 EXPLAIN (FORMAT JSON)을 돌려
+LARGE_TABLES 중 하나라도 Seq Scan으로 읽으면 실패(exit 1)한다.
+테스트 DB의 통계는 운영과 다르므로 enable_seqscan=off 로 "쓸 수 있는 인덱스가 있는지"를 본다.
+(인덱스가 없으면 off여도 Seq Scan이 남는다)
+
+    cd backend
+    BENCH_DATABASE_URL=postgresql://postgres@localhost/mate_plans python -m benchmarks.check_query_plans
+"""
+import os
+import sys
+from datetime import datetime, timezone
+
+from benchmarks.common import create_tables, ensure_bench_user
+
+from sqlalchemy import select, text, update
+
+import models.email  # noqa: F401 (테이블 등록)
+from database import engine
+from models.community import Post, PostScore
+from models.email import OutboundEmail
+from models.passkey import Passkey
+from models.user import User
+from crud import crud_community as crud
+from crud import crud_users, crud_verification, crud_passkey
+
+TOTAL_POSTS = int(os.getenv("BENCH_POSTS", 50_000))
+TOTAL_USERS = 1_000
+
+LARGE_TABLES = {
+    "posts", "comments", "post_likes", "post_scraps", "users",
+    "email_verifications", "passkeys", "outbound_emails",
+}
+
+
+def seed():
+    create_tables()
+    with engine.begin() as conn:
+        if conn.execute(text("SELECT count(*) FROM posts")).scalar():
+            return
+        user_id = ensure_bench_user(conn)
+        params = {"n": TOTAL_POSTS, "users": TOTAL_USERS}
+        conn.execute(text("""
+            INSERT INTO users (username, nickname, email, is_active, is_student_verified)
+            SELECT 'plan' || g, 'plan' || g, 'plan' || g || '@snu.ac.kr', true, false
+            FROM generate_series(1, :users) AS g
+        """), params)
+        conn.execute(text("""
+            INSERT INTO posts (category, title, content, view_count, like_count, comment_count, scrap_count,
+                               media_urls, created_at, author_id)
+            SELECT (ARRAY['FREE','INFO','QUESTION','HUMOR','STUDY'])[1 + g % 5], 'plan ' || g, 'content ' || g,
+                   0, 0, 0, 0, '[]', now() - (g || ' seconds')::interval,
+                   (SELECT min(id) FROM users) + g % :users
+            FROM generate_series(1, :n) AS g
+        """), params)
+        conn.execute(text("""
+            INSERT INTO comments (content, post_id, author_id, is_deleted, created_at)
+            SELECT 'comment ' || c, (SELECT min(id) FROM posts) + c % :n,
+                   (SELECT min(id) FROM users) + c % :users, false, now() - (c || ' seconds')::interval
+            FROM generate_series(1, :n * 3) AS c
+        """), params)
+        conn.execute(text("""
+            UPDATE comments SET parent_id = id - 1 WHERE id % 4 = 0
+        """))
+        for table in ("post_likes", "post_scraps"):
+            conn.execute(text(f"""
+                INSERT INTO {table} (user_id, post_id)
+                SELECT DISTINCT (SELECT min(id) FROM users) + g % :users, (SELECT min(id) FROM posts) + g % :n
+                FROM generate_series(1, :n * 2) AS g
+            """), params)
+        conn.execute(text("""
+            INSERT INTO email_verifications (email, code, is_verified, purpose)
+            SELECT 'plan' || g || '@snu.ac.kr', '123456', false, (ARRAY['register','school'])[1 + g % 2]
+            FROM generate_series(1, :n) AS g
+        """), params)
+        conn.execute(text("""
+            INSERT INTO passkeys (user_id, credential_id, public_key, sign_count)
+            SELECT (SELECT min(id) FROM users) + g % :users, 'cred' || g, 'key', 0
+            FROM generate_series(1, :users * 2) AS g
+        """), params)
+        conn.execute(text("""
+            INSERT INTO post_scores (post_id, score, created_at)
+            SELECT id, id % 100, created_at FROM posts WHERE created_at >= now() - interval '7 days'
+        """))
+        conn.execute(text("ANALYZE"))
+        print(f"seeded {TOTAL_POSTS} posts (bench user {user_id})")
+
+
+def cases(conn):
+    """(이름, SELECT 문) 목록 - crud가 실제로 만드는 쿼리"""
+    user_id = conn.execute(text("SELECT id FROM users WHERE username = 'plan7'")).scalar()
+    post_id = conn.execute(select(Post.id).where(Post.author_id == user_id).limit(1)).scalar()
+    after = (datetime.now(timezone.utc), 2 ** 31 - 1)
+    return [
+        ("feed", crud.posts_stmt(limit=20)),
+        ("feed cursor", crud.posts_stmt(limit=20, after=after)),
+        ("feed category", crud.posts_stmt(limit=20, category="INFO", after=after)),
+        ("feed search", crud.posts_stmt(limit=20, search="plan 학식")),
+        ("best posts", crud.best_posts_stmt()),
+        ("post detail", crud.post_stmt(post_id)),
+        ("viewer flags", crud.viewer_flags_stmt(post_id, user_id)),
+        ("comments by post", crud.comments_by_post_stmt(post_id)),
+        ("comments by author", crud.comments_by_author_stmt(user_id, after=after)),
+        ("comment thread", crud.comment_thread_stmt(post_id)),
+        ("my posts", crud.my_posts_stmt(user_id, after=after)),
+        ("my scraps", crud.my_scraps_stmt(user_id, after=after)),
+        ("user by username", select(User).where(User.username == "plan7")),
+        ("user by email", select(User).where(User.email == "plan7@snu.ac.kr")),
+        ("user with university", crud_users.user_with_university_stmt(user_id)),
+        ("email code issue", crud_verification.issue_code_stmt("plan7@snu.ac.kr", "register", "123456")),
+        ("email code verify", crud_verification.verify_code_stmt("plan7@snu.ac.kr", "register", "123456")),
+        ("email code purge", crud_verification.purge_expired_stmt()),
+        ("user passkeys", select(Passkey).where(Passkey.user_id == user_id)),
+        ("passkey by credential", select(Passkey).where(Passkey.credential_id == "cred7")),
+        ("passkey login", crud_passkey.passkey_login_stmt("plan7", "cred7")),
+        ("passkey sign count", update(Passkey).where(Passkey.id == 1, Passkey.sign_count < 5).values(sign_count=5)),
+        ("outbox claim", select(OutboundEmail.id).where(
+            OutboundEmail.status.in_(["pending", "sending"]), OutboundEmail.next_attempt_at <= datetime.now(timezone.utc))
+            .order_by(OutboundEmail.id).limit(50)),
+        ("score refresh", select(Post.id, crud.best_score_expr()).where(Post.id.in_([post_id]))),
+        ("counter update", update(Post).where(Post.id == post_id).values(like_count=Post.like_count + 1)),
+        ("purge scores", select(PostScore.post_id).where(PostScore.created_at < datetime.now(timezone.utc))),
+    ]
+
+
+def seq_scans(plan, found=None):
+    """플랜 트리에서 Seq Scan 노드의 테이블 이름 목록"""
+    found = [] if found is None else found
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        seq_scans(child, found)
+    return found
+
+
+def explain(conn, stmt):
+    compiled = stmt.compile(dialect=engine.dialect, compile_kwargs={"render_postcompile": True})
+    # UPDATE 등도 실제로 실행하지 않도록 ANALYZE 없이 EXPLAIN만
+    row = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    return row[0]["Plan"]
+
+
+def main():
+    seed()
+    failures = []
+    with engine.connect() as conn:
+        conn.exec_driver_sql("SET enable_seqscan = off")
+        for name, stmt in cases(conn):
+            if stmt is None:
+                continue
+            tables = sorted(set(seq_scans(explain(conn, stmt))) & LARGE_TABLES)
+            status = "FAIL" if tables else "ok"
+            print(f"{status:<4} | {name:<22} | {', '.join(tables)}")
+            if tables:
+                failures.append(name)
+        conn.rollback()
+
+    if failures:
+        print(f"\n{len(failures)} query plan(s) scan large tables sequentially: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
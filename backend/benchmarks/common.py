@@ -0,0 +1,46 @@
+"""
+벤치마크 공통 설정
+
+운영 DB를 건드리지 않도록 BENCH_DATABASE_URL 로만 접속한다.
+database 모듈보다 먼저 import 해야 한다.
+스키마는 운영과 같도록 create_all 대신 alembic upgrade head 로 만든다.
+"""
+import os
+import statistics
+import time
+
+os.environ["DATABASE_URL"] = os.environ["BENCH_DATABASE_URL"]
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
+
+from database import engine
+import models.user  # noqa: F401 (테이블 등록)
+import models.community  # noqa: F401
+import models.passkey  # noqa: F401
+
+REPEAT = int(os.getenv("BENCH_REPEAT", 5))
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+
+def create_tables():
+    command.upgrade(Config(ALEMBIC_INI), "head")
+
+
+def ensure_bench_user(conn) -> int:
+    conn.execute(text(
+        "INSERT INTO users (username, nickname, email, is_active, is_student_verified) "
+        "VALUES ('bench', 'bench', 'bench@snu.ac.kr', true, false) ON CONFLICT DO NOTHING"
+    ))
+    return conn.execute(text("SELECT id FROM users WHERE username = 'bench'")).scalar()
+
+
+def timed(fn, repeat: int = REPEAT) -> float:
+    """repeat번 실행한 중앙값 (ms)"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
@@ -0,0 +1,28 @@
+"""
+부하 테스트 / 벤치마크 묶음
+
+로컬 Postgres에 실제와 비슷한 분포의 데이터를 시드하고
+(UNIVERSITY_MAP 학교별 유저, CategoryType별 글, 일부 글에 몰리는 댓글/좋아요)
+시나리오별로 가상 유저 BENCH_CONCURRENCY명이 BENCH_DURATION초 동안 요청을 보낸다.
+앱은 프로세스 안(httpx ASGITransport)과 uvicorn 워커 1개 두 가지로 띄운다.
+결과(초당 처리 수, p50/p95/p99, 요청당 쿼리 수)는 커밋 해시와 함께 JSON으로 남겨 커밋끼리 비교한다.
+
+    cd backend
+    export BENCH_DATABASE_URL=postgresql://postgres@localhost/mate_load
+    python -m benchmarks.load seed
+    python -m benchmarks.load run                       # benchmarks/results/<시각>-<커밋>.json
+    BENCH_SCENARIOS=feed,post_detail BENCH_TRANSPORTS=uvicorn python -m benchmarks.load run
+    python -m benchmarks.load compare old.json new.json
+
+- 시나리오: benchmarks.load.scenarios.SCENARIOS
+- 요청당 쿼리 수/DB 시간은 응답의 Server-Timing 헤더(core.instrumentation)에서 읽는다.
+- 규모: BENCH_USERS(기본 5,000), BENCH_POSTS(기본 100,000). 처음 한 번만 시드한다.
+"""
+import os
+
+# database 모듈을 import 하기 전에 (동시 요청 수만큼 풀, 계측 로그 끄기)
+# uvicorn 모드의 풀 크기(bench_async.POOL_SIZE)도 BENCH_CONCURRENCY를 따른다.
+os.environ.setdefault("BENCH_CONCURRENCY", "16")
+os.environ.setdefault("DB_POOL_SIZE", os.environ["BENCH_CONCURRENCY"])
+os.environ.setdefault("DB_MAX_OVERFLOW", "0")
+os.environ.setdefault("PERF_LOG", "off")
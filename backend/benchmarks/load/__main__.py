@@ -0,0 +1,35 @@
+import sys
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("seed", help="부하 테스트 데이터 시드 (이미 있으면 건너뜀)")
+    run_cmd = commands.add_parser("run", help="시나리오 실행 후 결과 JSON 저장")
+    run_cmd.add_argument("--output", help="결과 파일 경로 (기본 benchmarks/results/<시각>-<커밋>.json)")
+    compare_cmd = commands.add_parser("compare", help="두 결과 파일 비교")
+    compare_cmd.add_argument("old")
+    compare_cmd.add_argument("new")
+    args = parser.parse_args(argv)
+
+    # 비교는 DB 없이도 동작하도록 명령별로 import
+    if args.command == "compare":
+        from benchmarks.load.report import compare
+
+        compare(args.old, args.new)
+    elif args.command == "seed":
+        from benchmarks.common import create_tables  # noqa: F401 (BENCH_DATABASE_URL 적용)
+        from benchmarks.load.seed import seed
+
+        seed()
+    else:
+        from benchmarks.common import create_tables  # noqa: F401
+        from benchmarks.load.runner import run
+
+        run(args.output)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
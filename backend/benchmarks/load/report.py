@@ -0,0 +1,28 @@
+"""결과 파일 비교 (DB 없이 동작)"""
+import json
+
+
+def compare(old_path: str, new_path: str) -> None:
+    """두 결과 파일의 시나리오별 처리량/p95/쿼리 수 변화"""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"old {(old['meta']['commit'] or '?')[:10]}  ->  new {(new['meta']['commit'] or '?')[:10]}")
+    print(f"{'transport':<9} {'scenario':<15} | {'ops/s':>17} | {'p95 (ms)':>19} | {'queries':>11}")
+
+    def change(before, after, digits=1):
+        if before is None or after is None:
+            return f"{'-':>8}"
+        percent = f" ({(after - before) / before * 100:+.0f}%)" if before else ""
+        return f"{before:.{digits}f} -> {after:.{digits}f}{percent}"
+
+    for transport, scenarios in new["results"].items():
+        for name, after in scenarios.items():
+            before = old["results"].get(transport, {}).get(name)
+            if before is None:
+                print(f"{transport:<9} {name:<15} | (new)")
+                continue
+            print(f"{transport:<9} {name:<15} | {change(before['ops_per_sec'], after['ops_per_sec']):>17} | "
+                  f"{change(before['p95_ms'], after['p95_ms']):>19} | "
+                  f"{change(before['queries_per_request'], after['queries_per_request'], 2):>11}")
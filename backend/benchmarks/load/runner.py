@@ -0,0 +1,235 @@
+"""
+시나리오 실행과 결과 기록
+
+- 전송 방식(BENCH_TRANSPORTS, 기본 asgi,uvicorn)
+  - asgi: 같은 프로세스에서 httpx.ASGITransport로 main.app 호출 (네트워크/서버 비용 제외, 부하 생성과 CPU 공유)
+  - uvicorn: bench_async.start_server로 워커 1개를 띄워 HTTP로 호출
+- 시나리오마다 BENCH_WARMUP초 예열(집계 제외) 후 BENCH_DURATION초 측정
+- 요청당 쿼리 수/DB 시간: Server-Timing 헤더 (PERF_INSTRUMENTATION=0이면 None)
+"""
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from benchmarks.bench_passkey_login import SoftAuthenticator
+from benchmarks.load.scenarios import SCENARIOS
+from benchmarks.load.seed import SKEW, USER_PREFIX
+
+import httpx
+from sqlalchemy import text
+
+from core.config import settings
+from core.security import create_access_token, token_claims
+from database import DB_POOL_MODE, engine
+
+CONCURRENCY = int(os.getenv("BENCH_CONCURRENCY", 16))
+DURATION = float(os.getenv("BENCH_DURATION", 10))
+WARMUP = float(os.getenv("BENCH_WARMUP", 2))
+TRANSPORTS = os.getenv("BENCH_TRANSPORTS", "asgi,uvicorn").split(",")
+SELECTED = [name for name in os.getenv("BENCH_SCENARIOS", ",".join(SCENARIOS)).split(",") if name]
+HOT_POSTS = 1000   # 상세/댓글 시나리오가 고르는 최신 글 수 (앞쪽일수록 자주)
+STORM_POSTS = 3    # 좋아요가 몰리는 글 수
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "results")
+
+SERVER_TIMING_RE = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+
+@dataclass
+class Fixture:
+    hot_posts: list
+    storm_posts: list
+
+
+@dataclass
+class VirtualUser:
+    username: str
+    headers: dict
+    authenticator: SoftAuthenticator
+    rng: random.Random
+    feed_cursor: Optional[dict] = None
+
+    def pick(self, items: list):
+        """앞쪽 항목일수록 자주 (시드의 random()^SKEW와 같은 분포)"""
+        return items[int(len(items) * self.rng.random() ** SKEW)]
+
+
+def load_fixture(concurrency: int):
+    """시드된 글 목록과 가상 유저 (가상 유저마다 새 패스키를 등록해 서명 카운터를 0부터 시작)"""
+    with engine.begin() as conn:
+        hot_posts = conn.execute(text("SELECT id FROM posts ORDER BY created_at DESC, id LIMIT :n"),
+                                 {"n": HOT_POSTS}).scalars().all()
+        users = conn.execute(text(
+            "SELECT id, username, is_active, is_student_verified, university_id FROM users "
+            "WHERE username LIKE :prefix ORDER BY id LIMIT :n"
+        ), {"prefix": USER_PREFIX + "%", "n": concurrency}).all()
+        if len(users) < concurrency or not hot_posts:
+            raise SystemExit("시드가 없습니다: python -m benchmarks.load seed")
+
+        vus = []
+        for index, user in enumerate(users):
+            authenticator = SoftAuthenticator(user.username)
+            conn.execute(text("DELETE FROM passkeys WHERE user_id = :user_id"), {"user_id": user.id})
+            conn.execute(text(
+                "INSERT INTO passkeys (user_id, credential_id, public_key, sign_count) VALUES (:user_id, :cid, :key, 0)"
+            ), {"user_id": user.id, "cid": authenticator.credential_id, "key": authenticator.public_key})
+            vus.append(VirtualUser(
+                username=user.username,
+                headers={"Authorization": "Bearer " + create_access_token(token_claims(user))},
+                authenticator=authenticator,
+                rng=random.Random(index),
+            ))
+    return Fixture(hot_posts=hot_posts, storm_posts=hot_posts[:STORM_POSTS]), vus
+
+
+def percentile(sorted_values: list, q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    return round(sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))], 2)
+
+
+async def run_scenario(client, scenario, fixture, vus, duration: float) -> dict:
+    latencies = []  # 동작(시나리오 1회) 단위 ms
+    queries = []    # 요청 단위
+    db_ms = []
+    requests = errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def user(vu):
+        nonlocal requests, errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                responses = await scenario(client, vu, fixture)
+            except httpx.TransportError:
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+            requests += len(responses)
+            errors += any(response.status_code >= 400 for response in responses)
+            for response in responses:
+                timing = SERVER_TIMING_RE.search(response.headers.get("server-timing", ""))
+                if timing:
+                    db_ms.append(float(timing.group(1)))
+                    queries.append(int(timing.group(2)))
+
+    await asyncio.gather(*(user(vu) for vu in vus))
+
+    latencies.sort()
+    return {
+        "operations": len(latencies),
+        "requests": requests,
+        "errors": errors,
+        "ops_per_sec": round(len(latencies) / duration, 2),
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+        "db_ms_per_request": round(sum(db_ms) / len(db_ms), 2) if db_ms else None,
+    }
+
+
+async def run_all(base_url: str, transport=None) -> dict:
+    fixture, vus = load_fixture(CONCURRENCY)
+    limits = httpx.Limits(max_connections=CONCURRENCY, max_keepalive_connections=CONCURRENCY)
+    results = {}
+    async with httpx.AsyncClient(base_url=base_url, transport=transport, limits=limits, timeout=60) as client:
+        for name in SELECTED:
+            scenario = SCENARIOS[name]
+            if WARMUP:
+                await run_scenario(client, scenario, fixture, vus, WARMUP)
+            results[name] = await run_scenario(client, scenario, fixture, vus, DURATION)
+            print(f"  {name:<15} {format_result(results[name])}")
+    return results
+
+
+def run_asgi() -> dict:
+    from main import app
+
+    return asyncio.run(run_all("http://bench", httpx.ASGITransport(app=app)))
+
+
+def run_uvicorn() -> dict:
+    from benchmarks.bench_async import start_server
+
+    proc, base = start_server(os.getenv("ASYNC_ROUTERS", ""), os.environ["BENCH_DATABASE_URL"])
+    try:
+        return asyncio.run(run_all(base))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+RUNNERS = {"asgi": run_asgi, "uvicorn": run_uvicorn}
+
+
+def format_result(result: dict) -> str:
+    queries = result["queries_per_request"]
+    return (f"{result['ops_per_sec']:>8.1f} ops/s  p50 {result['p50_ms'] or 0:>8.2f}  "
+            f"p95 {result['p95_ms'] or 0:>8.2f}  p99 {result['p99_ms'] or 0:>8.2f} ms  "
+            f"queries {'-' if queries is None else queries:>5}  errors {result['errors']}")
+
+
+# ---------------------------------------------------------
+# 결과 파일
+# ---------------------------------------------------------
+def git_revision() -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def dataset() -> dict:
+    with engine.connect() as conn:
+        return {
+            table: conn.execute(text(f"SELECT count(*) FROM {table}")).scalar()
+            for table in ("universities", "users", "posts", "comments", "post_likes", "post_scraps")
+        }
+
+
+def run(output: Optional[str] = None) -> str:
+    meta = {
+        **git_revision(),
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "concurrency": CONCURRENCY,
+        "duration_s": DURATION,
+        "dataset": dataset(),
+        "settings": {
+            "DB_POOL_MODE": DB_POOL_MODE,
+            "ASYNC_ROUTERS": os.getenv("ASYNC_ROUTERS", ""),
+            "FEED_CACHE_TTL_SECONDS": settings.FEED_CACHE_TTL_SECONDS,
+            "USER_CACHE_TTL_SECONDS": settings.USER_CACHE_TTL_SECONDS,
+            "PASSWORD_SCHEME": settings.PASSWORD_SCHEME,
+            "BCRYPT_ROUNDS": settings.BCRYPT_ROUNDS,
+            "PASSKEY_CHALLENGE_STORE": settings.PASSKEY_CHALLENGE_STORE,
+        },
+    }
+    print(f"commit={(meta['commit'] or '?')[:10]}{' (dirty)' if meta['dirty'] else ''} "
+          f"concurrency={CONCURRENCY} duration={DURATION}s dataset={meta['dataset']}")
+
+    results = {}
+    for transport in TRANSPORTS:
+        print(f"[{transport}]")
+        results[transport] = RUNNERS[transport]()
+
+    if output is None:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = os.path.join(RESULTS_DIR, f"{stamp}-{(meta['commit'] or 'nogit')[:10]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2, ensure_ascii=False)
+    print(f"wrote {output}")
+    return output
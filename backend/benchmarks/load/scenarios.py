@@ -0,0 +1,82 @@
+"""
+시나리오: 가상 유저 한 명이 반복하는 동작 하나
+
+각 함수는 (client, vu, fixture)를 받아 보낸 요청의 응답 목록을 돌려준다.
+(vu: runner.VirtualUser, fixture: runner.Fixture)
+읽기 시나리오를 먼저, 데이터를 바꾸는 시나리오를 뒤에 둔다.
+"""
+from benchmarks.bench_search import TERMS
+from benchmarks.load.seed import CATEGORY_WEIGHTS, PASSWORD
+
+FEED_LIMIT = 20
+CATEGORY_SHARE = 0.4      # 카테고리를 고른 목록 비율
+NEXT_PAGE_SHARE = 0.5     # 직전 응답의 next_cursor로 다음 페이지를 보는 비율
+COMMENT_WRITE_SHARE = 0.2
+
+
+async def feed(client, vu, fixture):
+    params = {"limit": FEED_LIMIT, "cursor": ""}
+    if vu.feed_cursor and vu.rng.random() < NEXT_PAGE_SHARE:
+        params.update(vu.feed_cursor)
+    elif vu.rng.random() < CATEGORY_SHARE:
+        params["category"] = vu.rng.choice(list(CATEGORY_WEIGHTS))
+    response = await client.get("/api/v1/community/posts", params=params)
+    if response.status_code == 200:
+        next_cursor = response.json().get("next_cursor")
+        vu.feed_cursor = {**params, "cursor": next_cursor} if next_cursor else None
+    return [response]
+
+
+async def best(client, vu, fixture):
+    return [await client.get("/api/v1/community/posts", params={"sort": "best", "limit": 10})]
+
+
+async def search(client, vu, fixture):
+    term = vu.rng.choice(TERMS)
+    return [await client.get("/api/v1/community/posts", params={"search": term, "limit": FEED_LIMIT})]
+
+
+async def post_detail(client, vu, fixture):
+    # 조회수 기록(응답 후 백그라운드)까지 포함
+    post_id = vu.pick(fixture.hot_posts)
+    return [await client.get(f"/api/v1/community/posts/{post_id}", headers=vu.headers)]
+
+
+async def comment_thread(client, vu, fixture):
+    post_id = vu.pick(fixture.hot_posts)
+    if vu.rng.random() < COMMENT_WRITE_SHARE:
+        return [await client.post("/api/v1/community/comments", headers=vu.headers,
+                                  json={"content": "부하 테스트 댓글", "post_id": post_id})]
+    return [await client.get("/api/v1/community/comments/thread", params={"post": post_id})]
+
+
+async def like_storm(client, vu, fixture):
+    # 모든 가상 유저가 같은 몇 개 글에 좋아요를 눌렀다 취소했다 반복 (같은 행 갱신 경합)
+    post_id = vu.rng.choice(fixture.storm_posts)
+    return [await client.post(f"/api/v1/community/posts/{post_id}/like", headers=vu.headers)]
+
+
+async def login(client, vu, fixture):
+    return [await client.post("/api/v1/auth/login", data={"username": vu.username, "password": PASSWORD})]
+
+
+async def passkey(client, vu, fixture):
+    options = await client.post("/api/v1/auth/passkey/login/options", json={"username": vu.username})
+    if options.status_code != 200:
+        return [options]
+    verify = await client.post("/api/v1/auth/passkey/login/verify", json={
+        "username": vu.username, "response": vu.authenticator.assertion(options.json()["challenge"], True),
+    })
+    return [options, verify]
+
+
+SCENARIOS = {
+    "feed": feed,
+    "best": best,
+    "search": search,
+    "post_detail": post_detail,
+    "comment_thread": comment_thread,
+    "like_storm": like_storm,
+    "login": login,
+    "passkey": passkey,
+}
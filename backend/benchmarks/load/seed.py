@@ -0,0 +1,162 @@
+"""
+부하 테스트용 시드
+
+- 학교: UNIVERSITY_MAP 전체 (crud_university.import_universities)
+- 유저 BENCH_USERS명: 학교를 돌아가며 배정, 절반은 재학생 인증, 비밀번호는 모두 PASSWORD (현재 해시 설정)
+- 글 BENCH_POSTS개: CATEGORY_WEIGHTS 비율, 최근 30일에 고르게, 작성자는 일부 유저에 몰림
+- 댓글(글당 평균 COMMENTS_PER_POST)/좋아요(LIKES_PER_POST)/스크랩: 최신 글 일부에 몰림 (random()^SKEW)
+  댓글 4개 중 1개는 같은 글 첫 댓글의 대댓글
+- 카운터, 작성자 스냅샷, post_scores, 검색 벡터를 실제 쓰기 경로와 같은 결과가 되도록 채운다.
+"""
+import os
+
+from benchmarks.bench_search import WORDS, backfill
+
+from sqlalchemy import text
+
+from core.search import build_document
+from core.univ_list import UNIVERSITY_MAP
+from database import SessionLocal, engine
+
+USERS = int(os.getenv("BENCH_USERS", 5_000))
+POSTS = int(os.getenv("BENCH_POSTS", 100_000))
+COMMENTS_PER_POST = 3
+LIKES_PER_POST = 5
+SCRAPS_PER_POST = 1
+SKEW = 3  # 클수록 앞쪽(최신 글, 앞 번호 유저)에 더 몰린다
+PASSWORD = "bench-password"
+USER_PREFIX = "load"
+CATEGORY_WEIGHTS = {"FREE": 35, "QUESTION": 20, "INFO": 15, "HUMOR": 10, "STUDY": 10, "PROMO": 5, "MARKET": 5}
+
+
+def category_table() -> list[str]:
+    """가중치만큼 반복한 목록 (SQL에서 무작위 인덱스로 고름)"""
+    return [category for category, weight in CATEGORY_WEIGHTS.items() for _ in range(weight)]
+
+
+def seeded() -> bool:
+    with engine.connect() as conn:
+        return bool(conn.execute(
+            text("SELECT count(*) FROM users WHERE username LIKE :prefix"), {"prefix": USER_PREFIX + "%"}
+        ).scalar())
+
+
+def seed():
+    from benchmarks.common import create_tables
+    from core import passwords
+    from crud.crud_university import import_universities
+
+    create_tables()
+    if seeded():
+        print("already seeded")
+        return
+
+    db = SessionLocal()
+    try:
+        import_universities(db, UNIVERSITY_MAP.items())
+    finally:
+        db.close()
+
+    params = {
+        "users": USERS,
+        "posts": POSTS,
+        "skew": SKEW,
+        "prefix": USER_PREFIX,
+        "password": passwords.context().hash(PASSWORD),
+        "words": WORDS,
+        "categories": category_table(),
+    }
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO users (username, nickname, email, password, is_active, is_student_verified,
+                               university_id, school_email)
+            SELECT :prefix || g, :prefix || g, :prefix || g || '@bench.local', :password, true, g % 2 = 0,
+                   u.id, CASE WHEN g % 2 = 0 THEN :prefix || g || '@' || u.domain END
+            FROM generate_series(1, :users) AS g
+            JOIN (SELECT id, domain, row_number() OVER (ORDER BY id) - 1 AS n FROM universities) AS u
+              ON u.n = g % (SELECT count(*) FROM universities)
+        """), params)
+        conn.execute(text("CREATE TEMP TABLE load_users ON COMMIT DROP AS "
+                          "SELECT row_number() OVER (ORDER BY id) AS n, id FROM users WHERE username LIKE :prefix || '%'"),
+                     params)
+        conn.execute(text("CREATE INDEX ON load_users (n)"))
+
+        # g=1이 가장 최신 글 (load_posts.n도 최신순이라 random()^SKEW 분포는 최신 글에 몰린다)
+        conn.execute(text("""
+            INSERT INTO posts (category, title, content, view_count, like_count, comment_count, scrap_count,
+                               media_urls, created_at, author_id)
+            SELECT (:categories)[1 + floor(random() * cardinality(:categories))::int],
+                   (SELECT string_agg((:words)[1 + floor(random() * cardinality(:words))::int], ' ')
+                      FROM generate_series(1, 3) WHERE g > 0),
+                   (SELECT string_agg((:words)[1 + floor(random() * cardinality(:words))::int], ' ')
+                      FROM generate_series(1, 15) WHERE g > 0),
+                   floor(random() * 200)::int, 0, 0, 0, '[]',
+                   now() - make_interval(secs => g * 30 * 86400.0 / :posts),
+                   load_users.id
+            FROM (SELECT g, 1 + floor(:users * power(random(), :skew))::int AS author_n
+                  FROM generate_series(1, :posts) AS g) AS picks
+            JOIN load_users ON load_users.n = picks.author_n
+        """), params)
+        conn.execute(text("CREATE TEMP TABLE load_posts ON COMMIT DROP AS "
+                          "SELECT row_number() OVER (ORDER BY created_at DESC, id) AS n, id FROM posts"))
+        conn.execute(text("CREATE INDEX ON load_posts (n)"))
+
+        conn.execute(text(f"""
+            INSERT INTO comments (content, post_id, author_id, is_deleted, created_at)
+            SELECT (SELECT string_agg((:words)[1 + floor(random() * cardinality(:words))::int], ' ')
+                      FROM generate_series(1, 5) WHERE c > 0),
+                   load_posts.id, load_users.id, false, now()
+            FROM (SELECT c,
+                         1 + floor(:posts * power(random(), :skew))::int AS post_n,
+                         1 + floor(:users * random())::int AS user_n
+                  FROM generate_series(1, :posts * {COMMENTS_PER_POST}) AS c) AS picks
+            JOIN load_posts ON load_posts.n = picks.post_n
+            JOIN load_users ON load_users.n = picks.user_n
+        """), params)
+        conn.execute(text("""
+            UPDATE comments SET parent_id = first.id
+            FROM (SELECT post_id, min(id) AS id FROM comments GROUP BY post_id) AS first
+            WHERE comments.post_id = first.post_id AND comments.id <> first.id AND comments.id % 4 = 0
+        """))
+        conn.execute(text("""
+            UPDATE comments SET created_at = least(now(), posts.created_at + make_interval(secs => comments.id % 86400))
+            FROM posts WHERE posts.id = comments.post_id
+        """))
+
+        for table, per_post in (("post_likes", LIKES_PER_POST), ("post_scraps", SCRAPS_PER_POST)):
+            conn.execute(text(f"""
+                INSERT INTO {table} (user_id, post_id)
+                SELECT load_users.id, load_posts.id
+                FROM (SELECT 1 + floor(:posts * power(random(), :skew))::int AS post_n,
+                             1 + floor(:users * random())::int AS user_n
+                      FROM generate_series(1, :posts * {per_post})) AS picks
+                JOIN load_posts ON load_posts.n = picks.post_n
+                JOIN load_users ON load_users.n = picks.user_n
+                ON CONFLICT DO NOTHING
+            """), params)
+
+        # 카운터와 작성자 스냅샷 (crud 쓰기 경로가 유지하는 값)
+        conn.execute(text("""
+            UPDATE posts SET
+                comment_count = coalesce((SELECT count(*) FROM comments WHERE comments.post_id = posts.id), 0),
+                like_count = coalesce((SELECT count(*) FROM post_likes WHERE post_likes.post_id = posts.id), 0),
+                scrap_count = coalesce((SELECT count(*) FROM post_scraps WHERE post_scraps.post_id = posts.id), 0)
+        """))
+        for table in ("posts", "comments"):
+            conn.execute(text(f"""
+                UPDATE {table} SET author_nickname = users.nickname, author_university = universities.name
+                FROM users LEFT JOIN universities ON universities.id = users.university_id
+                WHERE users.id = {table}.author_id
+            """))
+        conn.execute(text("""
+            INSERT INTO post_scores (post_id, score, created_at)
+            SELECT id, view_count + like_count * 3 + comment_count * 5, created_at
+            FROM posts WHERE created_at >= now() - interval '7 days'
+            ON CONFLICT (post_id) DO UPDATE SET score = excluded.score
+        """))
+
+    backfill("posts", "title, content", lambda row: build_document((row[1], "A"), (row[2], "B")))
+    backfill("comments", "content", lambda row: build_document((row[1], "A")))
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    print(f"seeded {USERS} users, {POSTS} posts")
@@ -0,0 +1,136 @@
+from typing import Optional
+
+from core.cache import TTLCache
+from core.config import settings
+
+# ---------------------------------------------------------
+# 패스키(WebAuthn) 챌린지 저장소
+# ---------------------------------------------------------
+# - /options 에서 발급한 챌린지를 username별로 저장하고, /verify 에서 꺼내면서 지운다(1회용).
+# - PASSKEY_CHALLENGE_TTL_SECONDS가 지난 챌린지는 없는 것으로 본다.
+# - PASSKEY_CHALLENGE_STORE
+#   - db: passkey_challenges 테이블 (기본값, Lambda처럼 options/verify가 다른 인스턴스로 갈 수 있을 때)
+#         만료된 행은 스케줄러가 정리한다.
+#   - memory: 프로세스 내 저장 (인스턴스 1개로 띄울 때, DB 왕복 없음)
+#   - redis://... : 인스턴스 간 공유, 만료는 Redis TTL
+# 모든 메서드는 요청의 DB 세션을 받는다 (db 백엔드만 사용).
+
+
+class MemoryBackend:
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def put(self, db, username: str, challenge: str) -> None:
+        self._entries.set(username, challenge)
+
+    def consume(self, db, username: str) -> Optional[str]:
+        return self._entries.pop(username)
+
+    def purge(self, db) -> int:
+        return 0
+
+
+class DatabaseBackend:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+
+    def put(self, db, username: str, challenge: str) -> None:
+        from datetime import timedelta
+        from sqlalchemy import func
+        from sqlalchemy.dialects.postgresql import insert
+        from models.passkey import PasskeyChallenge
+
+        expires_at = func.now() + timedelta(seconds=self.ttl)
+        stmt = insert(PasskeyChallenge).values(username=username, challenge=challenge, expires_at=expires_at)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[PasskeyChallenge.username],
+            set_={"challenge": stmt.excluded.challenge, "expires_at": stmt.excluded.expires_at},
+        ))
+        db.commit()
+
+    def consume(self, db, username: str) -> Optional[str]:
+        from sqlalchemy import delete, func
+        from models.passkey import PasskeyChallenge
+
+        # 만료 여부와 관계없이 지우고, 살아 있던 경우에만 반환
+        row = db.execute(
+            delete(PasskeyChallenge)
+            .where(PasskeyChallenge.username == username)
+            .returning(PasskeyChallenge.challenge, (PasskeyChallenge.expires_at > func.now()).label("live"))
+        ).first()
+        db.commit()
+        return row.challenge if row and row.live else None
+
+    def purge(self, db, batch_size: int = 1000) -> int:
+        """만료된 챌린지를 batch_size개씩 삭제"""
+        from sqlalchemy import delete, func, select
+        from models.passkey import PasskeyChallenge
+
+        total = 0
+        while True:
+            expired = select(PasskeyChallenge.username)\
+                .where(PasskeyChallenge.expires_at < func.now())\
+                .limit(batch_size)\
+                .with_for_update(skip_locked=True)
+            deleted = db.execute(
+                delete(PasskeyChallenge)
+                .where(PasskeyChallenge.username.in_(expired.scalar_subquery()))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+            total += deleted
+            if deleted < batch_size:
+                return total
+
+
+class RedisBackend:
+    """redis-py 호환 클라이언트 (redis.Redis, fakeredis.FakeRedis 등)"""
+
+    def __init__(self, client, ttl: float, prefix: str = "passkey-challenge"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, ttl: float):
+        import redis
+
+        return cls(redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5), ttl)
+
+    def put(self, db, username: str, challenge: str) -> None:
+        self.client.set(f"{self.prefix}:{username}", challenge, ex=max(1, int(self.ttl)))
+
+    def consume(self, db, username: str) -> Optional[str]:
+        value = self.client.getdel(f"{self.prefix}:{username}")
+        return value.decode() if isinstance(value, bytes) else value
+
+    def purge(self, db) -> int:
+        return 0
+
+
+def build_challenge_store(url: str = settings.PASSKEY_CHALLENGE_STORE):
+    ttl = settings.PASSKEY_CHALLENGE_TTL_SECONDS
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend.from_url(url, ttl)
+    if url == "memory":
+        return MemoryBackend(settings.PASSKEY_CHALLENGE_STORE_SIZE, ttl)
+    if url == "db":
+        return DatabaseBackend(ttl)
+    raise ValueError(f"Unknown PASSKEY_CHALLENGE_STORE: {url}")
+
+
+_challenge_store = None
+
+
+def get_challenge_store():
+    # 첫 사용 시 생성 (redis는 설정된 경우에만 import)
+    global _challenge_store
+    if _challenge_store is None:
+        _challenge_store = build_challenge_store()
+    return _challenge_store
+
+
+def set_challenge_store(store) -> None:
+    """백엔드 교체 (벤치마크/로컬 검증용)"""
+    global _challenge_store
+    _challenge_store = store
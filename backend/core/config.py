@@ -14,10 +14,77 @@ class Settings:
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
     REFRESH_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_MINUTES", 60 * 24 * 7)) # 7일
+
+    # 로그인 유저 캐시 (인스턴스별, 0이면 사용 안 함)
+    USER_CACHE_TTL_SECONDS: int = int(os.getenv("USER_CACHE_TTL_SECONDS", 60))
+    USER_CACHE_SIZE: int = int(os.getenv("USER_CACHE_SIZE", 1024))
     
+    # async(AsyncSession) 버전으로 처리할 라우터 목록 (쉼표 구분, 예: "community")
+    # - uvicorn처럼 이벤트 루프가 유지되는 배포용. 비어 있으면 전부 sync 라우터.
+    ASYNC_ROUTERS: list = [name.strip() for name in os.getenv("ASYNC_ROUTERS", "").split(",") if name.strip()]
+
+    # 피드 응답 캐시 (core.feed_cache)
+    # - FEED_CACHE_URL: memory(인스턴스별) | redis://host:6379/0 (인스턴스 간 공유)
+    # - TTL이 0이면 사용 안 함, MAX_AGE는 CDN/브라우저용 Cache-Control
+    FEED_CACHE_URL: str = os.getenv("FEED_CACHE_URL", "memory")
+    FEED_CACHE_TTL_SECONDS: int = int(os.getenv("FEED_CACHE_TTL_SECONDS", 30))
+    FEED_CACHE_SIZE: int = int(os.getenv("FEED_CACHE_SIZE", 256))
+    FEED_CACHE_MAX_AGE_SECONDS: int = int(os.getenv("FEED_CACHE_MAX_AGE_SECONDS", 10))
+
+    # 조회수 반영 (crud_community.flush_view_events)
+    # - 스케줄러(5분) 외에도, 인스턴스가 기록한 조회가 VIEW_FLUSH_THRESHOLD건 쌓이거나 마지막 반영 후
+    #   VIEW_FLUSH_INTERVAL_SECONDS가 지나면 조회를 기록한 백그라운드 작업에서 바로 반영 (0이면 해당 조건 끔)
+    VIEW_FLUSH_THRESHOLD: int = int(os.getenv("VIEW_FLUSH_THRESHOLD", 100))
+    VIEW_FLUSH_INTERVAL_SECONDS: int = int(os.getenv("VIEW_FLUSH_INTERVAL_SECONDS", 60))
+
+    # 학교 디렉터리 (core.university_directory) - universities 테이블을 다시 읽는 간격
+    UNIVERSITY_DIRECTORY_TTL_SECONDS: int = int(os.getenv("UNIVERSITY_DIRECTORY_TTL_SECONDS", 600))
+
+    # 이메일 인증 코드 (crud.crud_verification)
+    # - 유효 시간, 코드당 입력 시도 횟수, 재발송 간격, 한 시간당 최대 발송 횟수 (email+purpose별)
+    EMAIL_CODE_TTL_SECONDS: int = int(os.getenv("EMAIL_CODE_TTL_SECONDS", 300))
+    EMAIL_CODE_MAX_ATTEMPTS: int = int(os.getenv("EMAIL_CODE_MAX_ATTEMPTS", 5))
+    EMAIL_CODE_RESEND_SECONDS: int = int(os.getenv("EMAIL_CODE_RESEND_SECONDS", 60))
+    EMAIL_CODE_MAX_SENDS_PER_HOUR: int = int(os.getenv("EMAIL_CODE_MAX_SENDS_PER_HOUR", 5))
+
+    # 요청 계측 (core.instrumentation)
+    # - PERF_LOG: all | slow(PERF_SLOW_REQUEST_MS 이상, 5xx, N+1 의심만) | off - JSON 한 줄 로그
+    # - N+1: 한 요청에서 같은 SQL이 PERF_N_PLUS_ONE_THRESHOLD번을 넘게 실행된 경우
+    # - PERF_METRICS_PATH: 예) /metrics (Prometheus 텍스트 형식, 비어 있으면 없음)
+    # - PERF_DEBUG=1: 로그에 느린 쿼리 포함, /debug/perf 에 라우트별 가장 느린 쿼리 (SQL이 노출되므로 개발용)
+    PERF_INSTRUMENTATION: bool = os.getenv("PERF_INSTRUMENTATION", "1") != "0"
+    PERF_LOG: str = os.getenv("PERF_LOG", "slow")
+    PERF_SLOW_REQUEST_MS: int = int(os.getenv("PERF_SLOW_REQUEST_MS", 1000))
+    PERF_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("PERF_N_PLUS_ONE_THRESHOLD", 10))
+    PERF_METRICS_PATH: str = os.getenv("PERF_METRICS_PATH", "")
+    PERF_DEBUG: bool = bool(os.getenv("PERF_DEBUG"))
+    PERF_DEBUG_TOP_QUERIES: int = int(os.getenv("PERF_DEBUG_TOP_QUERIES", 5))
+
+    # 비밀번호 해시 (core.passwords)
+    # - PASSWORD_SCHEME: bcrypt | argon2 (argon2-cffi 필요). 바꾸면 기존 해시는 로그인 시 새 방식으로 재해시
+    # - 비용은 `python -m core.passwords calibrate --target-ms 250` 결과로 조정
+    PASSWORD_SCHEME: str = os.getenv("PASSWORD_SCHEME", "bcrypt")
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", 12))
+    ARGON2_TIME_COST: int = int(os.getenv("ARGON2_TIME_COST", 2))
+    ARGON2_MEMORY_COST: int = int(os.getenv("ARGON2_MEMORY_COST", 19456))  # KiB
+    ARGON2_PARALLELISM: int = int(os.getenv("ARGON2_PARALLELISM", 1))
+    # - EXECUTOR: process(전용 프로세스 풀) | thread(전용 스레드 풀, /dev/shm이 없는 Lambda 기본값)
+    # - WORKERS: 동시에 실행되는 해시 수 상한
+    PASSWORD_HASH_EXECUTOR: str = os.getenv(
+        "PASSWORD_HASH_EXECUTOR", "thread" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "process"
+    )
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+    PASSWORD_HASH_SLOW_MS: int = int(os.getenv("PASSWORD_HASH_SLOW_MS", 1000))
+
     # WebAuthn(패스키) 설정 (배포시 실제 도메인으로 변경 필수)
     RP_ID: str = os.getenv("RP_ID", "localhost")
     RP_NAME: str = "Mate Community"
     RP_ORIGIN: str = os.getenv("RP_ORIGIN", "http://localhost:3000")
 
+    # 패스키 챌린지 저장소 (core.challenge_store)
+    # - db(기본값, 인스턴스 간 공유) | memory(인스턴스 1개일 때) | redis://host:6379/0
+    PASSKEY_CHALLENGE_STORE: str = os.getenv("PASSKEY_CHALLENGE_STORE", "db")
+    PASSKEY_CHALLENGE_TTL_SECONDS: int = int(os.getenv("PASSKEY_CHALLENGE_TTL_SECONDS", 120))
+    PASSKEY_CHALLENGE_STORE_SIZE: int = int(os.getenv("PASSKEY_CHALLENGE_STORE_SIZE", 10000))
+
 settings = Settings()
\ No newline at end of file
@@ -1,50 +1,210 @@
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import json
+import logging
+from datetime import timedelta
 import os
 from dotenv import load_dotenv
 
 # .env 파일 로드
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # 환경변수에서 설정 가져오기 (없으면 기본값 사용)
 SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
 SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
 SMTP_USER = os.getenv("SMTP_USER")
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+SMTP_FROM = os.getenv("SMTP_FROM", SMTP_USER)
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", 10))
+
+# 발송 큐 설정
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", 50))
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", 5))
+EMAIL_RETRY_BASE_SECONDS = int(os.getenv("EMAIL_RETRY_BASE_SECONDS", 30))  # 30초, 1분, 2분, 4분 ...
+EMAIL_SEND_LEASE_SECONDS = int(os.getenv("EMAIL_SEND_LEASE_SECONDS", 300))  # 발송 중 점유 시간
+EMAIL_SENT_RETENTION_SECONDS = int(os.getenv("EMAIL_SENT_RETENTION_SECONDS", 60 * 60 * 24))  # 보낸 메일 보관 기간
+# 큐에 넣은 직후 발송을 시작하는 방법
+# - background : 같은 프로세스에서 BackgroundTasks로 발송 (기본값)
+#                uvicorn은 응답 후 발송, Lambda(Mangum)는 BackgroundTasks까지 끝낸 뒤 응답하므로
+#                요청 안에서 발송된다 (응답이 SMTP 시간만큼 느려지지만 추가 권한/패키지가 필요 없음)
+# - lambda     : 같은 Lambda 함수를 비동기(Event)로 호출해 발송 (응답이 빠름)
+#                함수 역할에 자기 자신에 대한 lambda:InvokeFunction 권한과 boto3가 있어야 한다.
+#                호출이 실패하면 정기 작업(5분)까지 발송이 밀리므로 인증코드 유효 시간(5분)을 넘길 수 있다.
+# - scheduler  : 즉시 발송하지 않고 정기 작업에서만 발송
+EMAIL_DISPATCH = os.getenv("EMAIL_DISPATCH", "background")
+OUTBOX_EVENT_SOURCE = "mate.outbox"
 
-def _send_smtp_email(to_email: str, subject: str, html_body: str) -> bool:
+# ---------------------------------------------------------
+# SMTP 연결 (발송 1회 동안 재사용)
+# ---------------------------------------------------------
+# smtplib / email.mime은 발송기에서만 쓰므로 요청 처리 경로(큐 적재)에서는 import하지 않는다.
+class SMTPConnection:
     """
-    (내부 함수) SMTP를 통해 실제 메일을 발송하는 공통 로직
+    연결 + STARTTLS + 로그인을 한 번만 하고 여러 메일을 보냄
+    - 중간에 서버가 연결을 끊으면 한 번 다시 연결해서 재시도
     """
-    if not SMTP_USER or not SMTP_PASSWORD:
-        print("❌ [Email Error] .env 파일에 SMTP_USER 또는 SMTP_PASSWORD가 없습니다.")
-        return False
 
-    try:
+    def __init__(self):
+        self.server = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def open(self):
+        import smtplib
+
+        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=SMTP_TIMEOUT)
+        if SMTP_STARTTLS:
+            server.starttls()
+        if SMTP_USER and SMTP_PASSWORD:
+            server.login(SMTP_USER, SMTP_PASSWORD)
+        self.server = server
+
+    def close(self):
+        import smtplib
+
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except smtplib.SMTPException:
+                pass
+            self.server = None
+
+    def send(self, to_email: str, subject: str, html_body: str):
+        import smtplib
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
+
         msg = MIMEMultipart()
-        msg['From'] = SMTP_USER
+        msg['From'] = SMTP_FROM
         msg['To'] = to_email
         msg['Subject'] = subject
         msg.attach(MIMEText(html_body, 'html'))
 
-        print(f"📧 메일 전송 시도: {to_email} (제목: {subject})")
-        
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SMTP_USER, SMTP_PASSWORD)
-            server.send_message(msg)
-        
-        print(f"✅ 전송 성공: {to_email}")
+        if self.server is None:
+            self.open()
+        try:
+            self.server.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            self.server = None
+            self.open()
+            self.server.send_message(msg)
+
+
+def _is_permanent(error: Exception) -> bool:
+    """5xx 응답(수신자 거부 등)은 재시도해도 같으므로 바로 실패 처리"""
+    import smtplib
+
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code >= 500
+
+
+def _is_unreachable(error: Exception) -> bool:
+    """연결 실패/끊김 (SMTPException도 OSError의 하위 클래스라 수신자 거부 등 응답 오류는 제외)"""
+    import smtplib
+
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
         return True
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
+def retry_delay(attempts: int) -> timedelta | None:
+    """attempts번 시도한 메일의 다음 재시도까지 대기 시간 (한도 초과면 None)"""
+    if attempts >= EMAIL_MAX_ATTEMPTS:
+        return None
+    return timedelta(seconds=EMAIL_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+
+# ---------------------------------------------------------
+# 큐 발송 (outbound_emails)
+# ---------------------------------------------------------
+def send_outbound_emails(db, batch_size: int = EMAIL_BATCH_SIZE, max_batches: int = 20) -> int:
+    """
+    대기 중인 메일을 배치 단위로 꺼내 하나의 SMTP 연결로 발송, 보낸 개수를 반환
+    - 메일별로 sent / pending(재시도 예약) / failed 상태를 기록
+    """
+    from crud import crud_email
+
+    if not SMTP_FROM:
+        logger.error(".env 파일에 SMTP_USER(또는 SMTP_FROM)가 없습니다.")
+        return 0
+
+    lease = timedelta(seconds=EMAIL_SEND_LEASE_SECONDS)
+    sent = 0
+    with SMTPConnection() as smtp:
+        for _ in range(max_batches):
+            emails = crud_email.claim_emails(db, batch_size, lease)
+            if not emails:
+                break
+
+            sent_ids = []
+            skipped_ids = []
+            unreachable = None
+            for email in emails:
+                if unreachable is not None:
+                    # 서버에 연결할 수 없으면 남은 메일은 시도하지 않고 재시도 예약 (시도 횟수에 넣지 않음)
+                    skipped_ids.append(email.id)
+                    continue
+                try:
+                    smtp.send(email.to_email, email.subject, email.html_body)
+                    sent_ids.append(email.id)
+                except Exception as e:
+                    retry_after = None if _is_permanent(e) else retry_delay(email.attempts)
+                    logger.warning("전송 실패: %s (시도 %d회) %s", email.to_email, email.attempts, e)
+                    crud_email.mark_failed(db, email.id, str(e), retry_after)
+                    if _is_unreachable(e):
+                        smtp.close()
+                        unreachable = str(e)
+            crud_email.mark_sent(db, sent_ids)
+            crud_email.release_emails(db, skipped_ids, unreachable, timedelta(seconds=EMAIL_RETRY_BASE_SECONDS))
+            db.commit()
+            sent += len(sent_ids)
+            if unreachable is not None:
+                break
+    return sent
+
+
+def _send_in_background():
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        send_outbound_emails(db)
+    except Exception:
+        logger.exception("Outbox send failed")
+    finally:
+        db.close()
+
+
+def dispatch_outbound_emails(background_tasks=None):
+    """
+    큐에 넣은 메일의 발송을 시작 (요청은 기다리지 않음)
+    - 실패하거나 놓친 메일은 정기 작업(send_outbound_emails)이 다시 보냄
+    """
+    if EMAIL_DISPATCH == "background" and background_tasks is not None:
+        background_tasks.add_task(_send_in_background)
+    elif EMAIL_DISPATCH == "lambda":
+        try:
+            import boto3
+
+            boto3.client("lambda").invoke(
+                FunctionName=os.environ["AWS_LAMBDA_FUNCTION_NAME"],
+                InvocationType="Event",
+                Payload=json.dumps({"source": OUTBOX_EVENT_SOURCE}),
+            )
+        except Exception:
+            logger.exception("Outbox dispatch failed")
 
-    except Exception as e:
-        print(f"❌ 전송 실패: {str(e)}")
-        return False
-    
-def send_verification_email(to_email: str, code: str) -> bool:
+# ---------------------------------------------------------
+# 메일 본문
+# ---------------------------------------------------------
+def render_verification_email(code: str) -> tuple[str, str]:
     """
-    회원가입 시 사용하는 이메일 인증 함수
+    회원가입 시 사용하는 이메일 인증 메일 (제목, 본문)
     """
     subject = "[Mate] 회원가입 인증번호 안내"
     html_body = f"""
@@ -60,11 +220,11 @@ def send_verification_email(to_email: str, code: str) -> bool:
         </body>
     </html>
     """
-    return _send_smtp_email(to_email, subject, html_body)
+    return subject, html_body
 
-def send_school_verification_email(to_email: str, code: str, univ_name: str) -> bool:
+def render_school_verification_email(code: str, univ_name: str) -> tuple[str, str]:
     """
-    학교 웹메일 인증 시 사용하는 함수
+    학교 웹메일 인증 메일 (제목, 본문)
     """
     subject = f"[Mate] {univ_name} 학생 인증 코드를 확인해주세요."
     html_body = f"""
@@ -85,4 +245,4 @@ def send_school_verification_email(to_email: str, code: str, univ_name: str) ->
         </body>
     </html>
     """
-    return _send_smtp_email(to_email, subject, html_body)
\ No newline at end of file
+    return subject, html_body
\ No newline at end of file
@@ -0,0 +1,137 @@
+import threading
+from typing import Optional
+
+from core.cache import TTLCache
+from core.config import settings
+
+# ---------------------------------------------------------
+# 피드 응답 캐시 (GET /community/posts 의 직렬화된 JSON)
+# ---------------------------------------------------------
+# - 키: 버전 + category/sort/page/cursor/limit
+# - 무효화: 글 작성/수정/삭제, 좋아요/스크랩/댓글 카운터 변경 시 버전을 올린다.
+#   (이전 버전 키는 조회되지 않고 LRU/TTL로 사라짐)
+# - FEED_CACHE_URL=memory 는 인스턴스별 캐시라 다른 인스턴스의 무효화는 TTL 뒤에 반영되고,
+#   redis://... 를 쓰면 버전과 응답을 인스턴스끼리 공유한다.
+
+
+class MemoryBackend:
+    blocking = False  # 프로세스 안의 dict라 이벤트 루프에서 바로 호출
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._entries.get(key)
+
+    def set(self, key: str, value: bytes) -> None:
+        self._entries.set(key, value)
+
+    def version(self) -> int:
+        return self._version
+
+    def bump(self) -> None:
+        with self._lock:
+            self._version += 1
+
+
+class RedisBackend:
+    """redis-py 호환 클라이언트 (redis.Redis, fakeredis.FakeRedis 등)"""
+
+    blocking = True  # 네트워크 I/O (async 라우트는 스레드풀에서 호출)
+
+    def __init__(self, client, ttl: float, prefix: str = "feed"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, ttl: float):
+        import redis
+
+        return cls(redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5), ttl)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(f"{self.prefix}:{key}")
+
+    def set(self, key: str, value: bytes) -> None:
+        self.client.set(f"{self.prefix}:{key}", value, ex=max(1, int(self.ttl)))
+
+    def version(self) -> int:
+        return int(self.client.get(f"{self.prefix}:version") or 0)
+
+    def bump(self) -> None:
+        self.client.incr(f"{self.prefix}:version")
+
+
+class FeedCache:
+    def __init__(self, backend):
+        self.backend = backend
+
+    @property
+    def blocking(self) -> bool:
+        return getattr(self.backend, "blocking", True)
+
+    def key(self, **params) -> str:
+        query = "&".join(f"{name}={params[name]}" for name in sorted(params) if params[name] is not None)
+        return f"v{self.backend.version()}:{query}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.backend.get(key)
+        except Exception as e:
+            # 캐시 장애는 DB 조회로 대신한다
+            print(f"⚠️ Feed cache get failed: {e}")
+            return None
+
+    def set(self, key: str, body: bytes) -> None:
+        try:
+            self.backend.set(key, body)
+        except Exception as e:
+            print(f"⚠️ Feed cache set failed: {e}")
+
+    def invalidate(self) -> None:
+        try:
+            self.backend.bump()
+        except Exception as e:
+            print(f"⚠️ Feed cache invalidate failed: {e}")
+
+
+def build_feed_cache(url: str = settings.FEED_CACHE_URL) -> Optional[FeedCache]:
+    """FEED_CACHE_URL: memory | redis://... | rediss://... (TTL이 0이면 None = 사용 안 함)"""
+    ttl = settings.FEED_CACHE_TTL_SECONDS
+    if ttl <= 0:
+        return None
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return FeedCache(RedisBackend.from_url(url, ttl))
+    if url == "memory":
+        return FeedCache(MemoryBackend(settings.FEED_CACHE_SIZE, ttl))
+    raise ValueError(f"Unknown FEED_CACHE_URL: {url}")
+
+
+_feed_cache = None
+_initialized = False
+
+
+def get_feed_cache() -> Optional[FeedCache]:
+    # 첫 사용 시 생성 (redis는 설정된 경우에만 import)
+    global _feed_cache, _initialized
+    if not _initialized:
+        _feed_cache = build_feed_cache()
+        _initialized = True
+    return _feed_cache
+
+
+def set_feed_cache(cache: Optional[FeedCache]) -> None:
+    """백엔드 교체 (벤치마크/로컬 검증용)"""
+    global _feed_cache, _initialized
+    _feed_cache, _initialized = cache, True
+
+
+def invalidate_feed() -> None:
+    """글/카운터가 바뀐 뒤(커밋 후) 호출"""
+    cache = get_feed_cache()
+    if cache is not None:
+        cache.invalidate()
+
@@ -0,0 +1,42 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+# ---------------------------------------------------------
+# HTTP 캐시 헤더 (ETag / Cache-Control / 304)
+# ---------------------------------------------------------
+# 직렬화된 JSON 본문(또는 본문을 결정하는 버전 값)으로 ETag를 만들고,
+# If-None-Match가 같으면 본문 없이 304를 돌려준다.
+# CDN(Amplify/CloudFront)과 브라우저가 Cache-Control에 따라 응답을 재사용할 수 있다.
+
+
+def etag_for(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_for_version(*parts) -> str:
+    """본문 대신 버전 값(updated_at, 카운터 등)으로 만든 ETag (직렬화 전에 비교 가능)"""
+    return etag_for(repr(parts).encode())
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # 약한 비교 (W/ 접두사 무시), 여러 개면 쉼표 구분
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def json_response(request: Request, body: bytes, cache_control: str) -> Response:
+    etag = etag_for(body)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag, cache_control)
+    return Response(content=body, media_type="application/json",
+                    headers={"ETag": etag, "Cache-Control": cache_control})
@@ -0,0 +1,390 @@
+import contextvars
+import json
+import logging
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Optional
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------
+# 요청 계측 (지연 시간 / 쿼리 수 / DB 시간 / 직렬화 시간)
+# ---------------------------------------------------------
+# - InstrumentationMiddleware: 요청마다 RequestMetrics를 contextvar에 두고, 끝나면 라우트별 통계에 합친다.
+#   (sync 라우트가 도는 스레드풀, AsyncSession의 greenlet도 같은 객체를 본다)
+# - SQLAlchemy before/after_cursor_execute: 모든 엔진(sync, async)의 쿼리 수와 시간을 현재 요청에 기록.
+#   같은 SQL이 PERF_N_PLUS_ONE_THRESHOLD번을 넘게 반복되면 N+1로 표시한다.
+# - 직렬화: FastAPI의 response_model 검증/변환과 serializing()으로 감싼 구간 (core.serialization 목록 응답 등).
+# - 출력
+#   - Server-Timing 헤더 (브라우저 개발자 도구 Network > Timing 탭)
+#   - JSON 한 줄 로그 (CloudWatch Logs Insights로 조회), PERF_LOG=all | slow | off
+#     이 모듈의 로거(core.instrumentation)로 남긴다. 핸들러가 없으면 install()이 메시지만 stdout에 쓰는 핸들러를 붙임
+#   - PERF_METRICS_PATH를 지정하면 Prometheus 텍스트 형식 엔드포인트 (인스턴스별 누적값)
+#   - PERF_DEBUG=1 이면 로그에 느린 쿼리를 싣고, /debug/perf 에서 라우트별 가장 느린 쿼리를 보여준다.
+
+# 지연 시간 히스토그램 구간 (초, Prometheus 기본값과 비슷하게)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_LOG_LENGTH = 200
+
+
+class RequestMetrics:
+    __slots__ = ("queries", "db_seconds", "serialize_seconds", "statements")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        # SQL -> [실행 횟수, 누적 시간, 가장 느린 1회]
+        self.statements: dict[str, list] = {}
+
+    def record_query(self, statement: str, seconds: float) -> None:
+        self.queries += 1
+        self.db_seconds += seconds
+        entry = self.statements.get(statement)
+        if entry is None:
+            self.statements[statement] = [1, seconds, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+            if seconds > entry[2]:
+                entry[2] = seconds
+
+    def repeated_statements(self, threshold: int = settings.PERF_N_PLUS_ONE_THRESHOLD) -> list[tuple[str, int]]:
+        """threshold번을 넘게 실행된 SQL (N+1 의심)"""
+        return [(statement, entry[0]) for statement, entry in self.statements.items() if entry[0] > threshold]
+
+    def slowest_statements(self, limit: int = settings.PERF_DEBUG_TOP_QUERIES) -> list[tuple[str, float]]:
+        ranked = sorted(self.statements.items(), key=lambda item: item[1][2], reverse=True)
+        return [(statement, entry[2]) for statement, entry in ranked[:limit]]
+
+
+_current: contextvars.ContextVar[Optional[RequestMetrics]] = contextvars.ContextVar("request_metrics", default=None)
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    return _current.get()
+
+
+@contextmanager
+def serializing():
+    """요청 안에서 직접 직렬화하는 구간 (response_model을 거치지 않는 응답)"""
+    metrics = _current.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics is not None:
+            metrics.serialize_seconds += time.perf_counter() - started
+
+
+# ---------------------------------------------------------
+# 라우트별 누적 통계
+# ---------------------------------------------------------
+class RouteStats:
+    __slots__ = ("buckets", "count", "seconds", "queries", "db_seconds", "serialize_seconds",
+                 "n_plus_one", "errors", "slow_queries")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # 마지막은 +Inf
+        self.count = 0
+        self.seconds = 0.0
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.n_plus_one = 0
+        self.errors = 0
+        self.slow_queries: dict[str, float] = {}  # PERF_DEBUG일 때만, SQL -> 가장 느린 1회
+
+    def add(self, seconds: float, status: int, metrics: RequestMetrics, repeated: list) -> None:
+        self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.seconds += seconds
+        self.queries += metrics.queries
+        self.db_seconds += metrics.db_seconds
+        self.serialize_seconds += metrics.serialize_seconds
+        self.n_plus_one += bool(repeated)
+        self.errors += status >= 500
+        if settings.PERF_DEBUG:
+            for statement, slowest in metrics.slowest_statements():
+                if slowest > self.slow_queries.get(statement, 0.0):
+                    self.slow_queries[statement] = slowest
+            if len(self.slow_queries) > settings.PERF_DEBUG_TOP_QUERIES:
+                ranked = sorted(self.slow_queries.items(), key=lambda item: item[1], reverse=True)
+                self.slow_queries = dict(ranked[:settings.PERF_DEBUG_TOP_QUERIES])
+
+
+_routes: dict[tuple[str, str], RouteStats] = {}
+_routes_lock = threading.Lock()
+
+
+def route_stats() -> dict[tuple[str, str], RouteStats]:
+    with _routes_lock:
+        return dict(_routes)
+
+
+def reset() -> None:
+    with _routes_lock:
+        _routes.clear()
+
+
+def _record(method: str, route: str, seconds: float, status: int, metrics: RequestMetrics, repeated: list) -> None:
+    with _routes_lock:
+        stats = _routes.get((method, route))
+        if stats is None:
+            stats = _routes[(method, route)] = RouteStats()
+        stats.add(seconds, status, metrics, repeated)
+
+
+# ---------------------------------------------------------
+# SQLAlchemy 훅
+# ---------------------------------------------------------
+_hooks_installed = False
+
+
+def install_query_hooks() -> None:
+    """모든 Engine(이후 생성되는 async 엔진의 sync_engine 포함)에 쿼리 계측 훅 등록"""
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(Engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        metrics = _current.get()
+        started = conn.info.get("query_started")
+        if metrics is not None and started:
+            metrics.record_query(statement, time.perf_counter() - started.pop())
+
+    @event.listens_for(Engine, "handle_error")
+    def _handle_error(exception_context):
+        # 실패한 쿼리는 after_cursor_execute가 불리지 않으므로 시작 시각만 버린다
+        connection = exception_context.connection
+        started = connection.info.get("query_started") if connection is not None else None
+        if started:
+            started.pop()
+
+    _hooks_installed = True
+
+
+def install_serialize_hook() -> None:
+    """FastAPI response_model 검증/직렬화(fastapi.routing.serialize_response)를 serialize 구간으로 기록"""
+    import fastapi.routing
+
+    serialize_response = fastapi.routing.serialize_response
+    if getattr(serialize_response, "instrumented", False):
+        return
+
+    async def timed_serialize_response(*args, **kwargs):
+        with serializing():
+            return await serialize_response(*args, **kwargs)
+
+    timed_serialize_response.instrumented = True
+    fastapi.routing.serialize_response = timed_serialize_response
+
+
+# ---------------------------------------------------------
+# ASGI 미들웨어
+# ---------------------------------------------------------
+def server_timing(metrics: RequestMetrics, seconds: float) -> str:
+    return (
+        f'db;dur={metrics.db_seconds * 1000:.1f};desc="{metrics.queries} queries", '
+        f"serialize;dur={metrics.serialize_seconds * 1000:.1f}, "
+        f"app;dur={seconds * 1000:.1f}"
+    )
+
+
+def route_name(scope) -> str:
+    """경로 템플릿 (/api/v1/community/posts/{post_id}), 매칭되지 않은 요청은 하나로 묶는다"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class InstrumentationMiddleware:
+    def __init__(self, app, log: str = settings.PERF_LOG, slow_ms: float = settings.PERF_SLOW_REQUEST_MS,
+                 exclude: tuple = ()):
+        self.app = app
+        self.log = log
+        self.slow_seconds = slow_ms / 1000
+        self.exclude = set(exclude)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(metrics, time.perf_counter() - started).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        error = None
+        try:
+            await self.app(scope, receive, send_with_timing)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            _current.reset(token)
+            seconds = time.perf_counter() - started
+            route = route_name(scope)
+            if route not in self.exclude:
+                repeated = metrics.repeated_statements()
+                _record(scope["method"], route, seconds, status, metrics, repeated)
+                if self.should_log(seconds, status, repeated):
+                    self.write_log(scope, route, seconds, status, metrics, repeated, error)
+
+    def should_log(self, seconds: float, status: int, repeated: list) -> bool:
+        if self.log == "all":
+            return True
+        if self.log == "slow":
+            return seconds >= self.slow_seconds or status >= 500 or bool(repeated)
+        return False
+
+    def write_log(self, scope, route, seconds, status, metrics, repeated, error) -> None:
+        record = {
+            "event": "request",
+            "method": scope["method"],
+            "route": route,
+            "path": scope["path"],
+            "status": status,
+            "duration_ms": round(seconds * 1000, 2),
+            "db_queries": metrics.queries,
+            "db_ms": round(metrics.db_seconds * 1000, 2),
+            "serialize_ms": round(metrics.serialize_seconds * 1000, 2),
+        }
+        # Mangum이 넘겨주는 Lambda context (CloudWatch에서 요청 단위로 찾기 위함)
+        aws_context = scope.get("aws.context")
+        if aws_context is not None:
+            record["aws_request_id"] = getattr(aws_context, "aws_request_id", None)
+        if repeated:
+            record["n_plus_one"] = [
+                {"statement": statement[:STATEMENT_LOG_LENGTH], "count": count} for statement, count in repeated
+            ]
+        if settings.PERF_DEBUG:
+            record["slow_queries"] = [
+                {"statement": statement[:STATEMENT_LOG_LENGTH], "ms": round(slowest * 1000, 2)}
+                for statement, slowest in metrics.slowest_statements()
+            ]
+        if error is not None:
+            record["error"] = repr(error)
+        logger.info(json.dumps(record, ensure_ascii=False))
+
+
+def install_log_handler() -> None:
+    """
+    요청 로그를 JSON 한 줄 그대로 stdout에 쓰는 기본 핸들러
+    - Lambda 기본 핸들러의 [INFO] 시각 요청ID 접두어가 붙지 않아 Logs Insights가 JSON 필드로 인식
+    - 이미 핸들러를 붙여 두었으면(다른 형식/출력으로 바꾼 경우) 건드리지 않는다
+    """
+    if logger.handlers:
+        return
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def install(app, metrics_path: str = settings.PERF_METRICS_PATH) -> None:
+    """미들웨어와 훅 등록, 설정된 경우 계측 엔드포인트 추가 (main.py에서 한 번)"""
+    install_log_handler()
+    install_query_hooks()
+    install_serialize_hook()
+
+    exclude = set()
+    if metrics_path:
+        from fastapi.responses import PlainTextResponse
+
+        @app.get(metrics_path, include_in_schema=False)
+        def metrics():
+            return PlainTextResponse(prometheus_text(), media_type="text/plain; version=0.0.4")
+
+        exclude.add(metrics_path)
+
+    if settings.PERF_DEBUG:
+        @app.get("/debug/perf", include_in_schema=False)
+        def debug_perf():
+            return debug_report()
+
+        exclude.add("/debug/perf")
+
+    # 가장 바깥(마지막에 추가)에 둬야 다른 미들웨어 시간까지 포함된다
+    app.add_middleware(InstrumentationMiddleware, exclude=tuple(exclude))
+
+
+# ---------------------------------------------------------
+# 내보내기
+# ---------------------------------------------------------
+def _labels(method: str, route: str, **extra) -> str:
+    pairs = {"method": method, "route": route, **extra}
+    return ",".join(f'{key}="{value}"' for key, value in pairs.items())
+
+
+def prometheus_text() -> str:
+    """Prometheus 텍스트 형식 (이 프로세스가 처리한 요청의 누적값)"""
+    stats = sorted(route_stats().items())
+    lines = [
+        "# HELP http_request_duration_seconds Request latency by route.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, route), s in stats:
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), s.buckets):
+            cumulative += count
+            lines.append(f"http_request_duration_seconds_bucket{{{_labels(method, route, le=bound)}}} {cumulative}")
+        lines.append(f"http_request_duration_seconds_sum{{{_labels(method, route)}}} {s.seconds:.6f}")
+        lines.append(f"http_request_duration_seconds_count{{{_labels(method, route)}}} {s.count}")
+
+    counters = (
+        ("http_request_db_queries_total", "SQL statements executed.", lambda s: s.queries),
+        ("http_request_db_seconds_total", "Time spent in SQL statements.", lambda s: f"{s.db_seconds:.6f}"),
+        ("http_request_serialize_seconds_total", "Time spent serializing responses.", lambda s: f"{s.serialize_seconds:.6f}"),
+        ("http_request_n_plus_one_total", "Requests that repeated one statement too often.", lambda s: s.n_plus_one),
+        ("http_request_errors_total", "Requests that ended with a 5xx status.", lambda s: s.errors),
+    )
+    for name, help_text, value in counters:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for (method, route), s in stats:
+            lines.append(f"{name}{{{_labels(method, route)}}} {value(s)}")
+    return "\n".join(lines) + "\n"
+
+
+def debug_report() -> list[dict]:
+    """라우트별 요약과 가장 느린 쿼리 (PERF_DEBUG)"""
+    report = []
+    for (method, route), s in sorted(route_stats().items(), key=lambda item: item[1].seconds, reverse=True):
+        report.append({
+            "method": method,
+            "route": route,
+            "requests": s.count,
+            "avg_ms": round(s.seconds / s.count * 1000, 2),
+            "avg_queries": round(s.queries / s.count, 2),
+            "avg_db_ms": round(s.db_seconds / s.count * 1000, 2),
+            "avg_serialize_ms": round(s.serialize_seconds / s.count * 1000, 2),
+            "n_plus_one": s.n_plus_one,
+            "slow_queries": [
+                {"statement": statement, "ms": round(slowest * 1000, 2)}
+                for statement, slowest in sorted(s.slow_queries.items(), key=lambda item: item[1], reverse=True)
+            ],
+        })
+    return report
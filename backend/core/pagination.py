@@ -0,0 +1,51 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import tuple_
+
+# ---------------------------------------------------------
+# 커서(Keyset) 페이지네이션
+# ---------------------------------------------------------
+# 커서는 마지막으로 받은 항목의 (created_at, id)를 base64로 감싼 불투명 문자열이다.
+# OFFSET 대신 "WHERE (created_at, id) < (커서)" 로 이어서 읽기 때문에
+# 몇 번째 페이지든 인덱스에서 바로 시작 위치를 찾는다.
+
+Cursor = Tuple[datetime, int]
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """잘못된 커서면 ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(item_id)
+    except Exception as e:
+        raise ValueError("invalid cursor") from e
+
+
+def next_cursor(items: list, limit: int) -> Optional[str]:
+    """요청한 개수만큼 채워졌을 때만 다음 커서를 만든다 (마지막 페이지면 None)"""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(last.created_at, last.id)
+
+
+def apply_keyset(query, created_col, id_col, after: Optional[Cursor], limit: int, skip: int = 0):
+    """
+    최신순(created_at DESC, id DESC) 정렬 + 커서/오프셋 적용
+    - after가 있으면 keyset, 없으면 기존 offset 방식
+    """
+    query = query.order_by(created_col.desc(), id_col.desc())
+    if after is not None:
+        query = query.filter(tuple_(created_col, id_col) < tuple_(*after))
+    else:
+        query = query.offset(skip)
+    return query.limit(limit)
@@ -0,0 +1,225 @@
+"""
+비밀번호 해시 서비스
+
+- bcrypt/argon2 해시·검증을 요청 스레드가 아닌 전용 풀(프로세스 또는 스레드)에서 실행한다.
+  로그인이 몰려도 API 스레드풀(피드 등)을 점유하지 않고, 동시에 도는 해시 수는 워커 수로 제한된다.
+- 비용(BCRYPT_ROUNDS, ARGON2_*)이나 PASSWORD_SCHEME이 바뀌면 로그인 성공 시 새 해시를 돌려줘 저장하게 한다.
+- 최근 해시/검증 시간과 풀 대기 시간을 모아 latency_summary()로 보고한다.
+
+비용 보정 (목표 시간에 맞는 설정값 출력):
+
+    cd backend
+    python -m core.passwords calibrate --target-ms 250
+"""
+import asyncio
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from core.config import settings
+
+SCHEMES = ("bcrypt", "argon2")
+
+_context = None
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def build_context(
+    scheme: str = settings.PASSWORD_SCHEME,
+    bcrypt_rounds: int = settings.BCRYPT_ROUNDS,
+    argon2_time_cost: int = settings.ARGON2_TIME_COST,
+    argon2_memory_cost: int = settings.ARGON2_MEMORY_COST,
+    argon2_parallelism: int = settings.ARGON2_PARALLELISM,
+):
+    """
+    scheme으로 새 해시를 만들고, 다른 방식/다른 비용의 기존 해시도 검증한다.
+    (deprecated="auto": 기본 scheme이 아니거나 비용이 다르면 needs_update)
+    argon2는 argon2-cffi가 설치된 경우에만 쓸 수 있다.
+    """
+    from passlib.context import CryptContext
+
+    if scheme not in SCHEMES:
+        raise ValueError(f"Unknown PASSWORD_SCHEME: {scheme}")
+    return CryptContext(
+        schemes=[scheme] + [other for other in SCHEMES if other != scheme],
+        default=scheme,
+        deprecated="auto",
+        bcrypt__rounds=bcrypt_rounds,
+        argon2__time_cost=argon2_time_cost,
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+
+def context():
+    """passlib은 처음 쓸 때 import (콜드 스타트 단축), 프로세스 워커에서는 워커마다 생성"""
+    global _context
+    if _context is None:
+        _context = build_context()
+    return _context
+
+
+# ---------------------------------------------------------
+# 워커에서 실행되는 함수 (프로세스 풀로 보내므로 모듈 최상위 함수)
+# ---------------------------------------------------------
+# 결과와 함께 워커 안에서 잰 소요 시간(ms)을 돌려준다.
+def _hash(password: str):
+    start = time.perf_counter()
+    hashed = context().hash(password)
+    return hashed, (time.perf_counter() - start) * 1000
+
+
+def _verify_and_update(password: str, hashed: str):
+    start = time.perf_counter()
+    result = context().verify_and_update(password, hashed)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def executor() -> Executor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = max(1, settings.PASSWORD_HASH_WORKERS)
+            if settings.PASSWORD_HASH_EXECUTOR == "process":
+                import multiprocessing
+
+                # 스레드가 있는 서버 프로세스를 fork하지 않도록 spawn
+                _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            elif settings.PASSWORD_HASH_EXECUTOR == "thread":
+                # bcrypt/argon2 C 구현은 GIL을 놓으므로 스레드로도 병렬 실행된다
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+            else:
+                raise ValueError(f"Unknown PASSWORD_HASH_EXECUTOR: {settings.PASSWORD_HASH_EXECUTOR}")
+    return _executor
+
+
+# ---------------------------------------------------------
+# 지연시간 통계
+# ---------------------------------------------------------
+class LatencyStats:
+    """연산별 최근 N개 샘플 (ms)"""
+
+    def __init__(self, size: int = 512):
+        self.size = size
+        self._samples: dict = {}
+        self._counts: dict = {}
+        self._lock = threading.Lock()
+
+    def record(self, op: str, ms: float) -> None:
+        with self._lock:
+            self._samples.setdefault(op, deque(maxlen=self.size)).append(ms)
+            self._counts[op] = self._counts.get(op, 0) + 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            result = {}
+            for op, samples in self._samples.items():
+                ordered = sorted(samples)
+                result[op] = {
+                    "count": self._counts[op],
+                    "p50_ms": round(statistics.median(ordered), 1),
+                    "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+                    "max_ms": round(ordered[-1], 1),
+                }
+            return result
+
+
+latency = LatencyStats()
+
+
+def latency_summary() -> dict:
+    """{"hash"|"verify"|"queue": {count, p50_ms, p95_ms, max_ms}} - queue는 풀 대기 시간"""
+    return latency.summary()
+
+
+async def _run(op: str, fn, *args):
+    start = time.perf_counter()
+    result, elapsed = await asyncio.get_running_loop().run_in_executor(executor(), fn, *args)
+    latency.record(op, elapsed)
+    latency.record("queue", max(0.0, (time.perf_counter() - start) * 1000 - elapsed))
+    if elapsed >= settings.PASSWORD_HASH_SLOW_MS:
+        print(f"⚠️ Slow password {op}: {elapsed:.0f}ms")
+    return result
+
+
+async def hash_password(password: str) -> str:
+    return await _run("hash", _hash, password)
+
+
+async def verify_password(password: str, hashed: Optional[str]) -> tuple[bool, Optional[str]]:
+    """
+    (일치 여부, 새 해시)
+    - 새 해시는 저장된 해시의 방식/비용이 현재 설정과 다를 때만 반환 (호출한 쪽에서 저장)
+    - 비밀번호가 없는 유저(패스키 전용)는 항상 불일치
+    """
+    if not hashed:
+        return False, None
+    return await _run("verify", _verify_and_update, password, hashed)
+
+
+# ---------------------------------------------------------
+# 비용 보정
+# ---------------------------------------------------------
+def _median_ms(ctx, repeat: int = 3) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ctx.hash("calibration-password")
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def calibrate(target_ms: float):
+    """목표 시간 안에서 가장 높은 비용을 찾아 환경변수 형태로 출력"""
+    print(f"target: {target_ms:.0f}ms per hash (this machine)\n")
+
+    best_rounds = None
+    print(f"{'bcrypt rounds':>13} | {'ms':>8}")
+    for rounds in range(10, 16):
+        ms = _median_ms(build_context("bcrypt", bcrypt_rounds=rounds))
+        print(f"{rounds:>13} | {ms:>8.1f}")
+        if ms <= target_ms:
+            best_rounds = rounds
+        else:
+            break
+
+    best_argon2 = None
+    try:
+        import argon2  # noqa: F401
+    except ImportError:
+        print("\nargon2-cffi not installed, skipping argon2")
+    else:
+        print(f"\n{'argon2 m (KiB)':>14} | {'t':>2} | {'ms':>8}")
+        for memory_cost in (19456, 47104, 65536):
+            for time_cost in range(1, 6):
+                ms = _median_ms(build_context(
+                    "argon2", argon2_time_cost=time_cost, argon2_memory_cost=memory_cost,
+                    argon2_parallelism=settings.ARGON2_PARALLELISM,
+                ))
+                print(f"{memory_cost:>14} | {time_cost:>2} | {ms:>8.1f}")
+                if ms > target_ms:
+                    break
+                best_argon2 = (time_cost, memory_cost)
+
+    print("\n# suggested settings")
+    if best_rounds:
+        print(f"BCRYPT_ROUNDS={best_rounds}")
+    if best_argon2:
+        print(f"ARGON2_TIME_COST={best_argon2[0]}")
+        print(f"ARGON2_MEMORY_COST={best_argon2[1]}")
+        print(f"ARGON2_PARALLELISM={settings.ARGON2_PARALLELISM}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="password hashing tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    calibrate_parser = commands.add_parser("calibrate", help="suggest cost settings for a target hash time")
+    calibrate_parser.add_argument("--target-ms", type=float, default=250)
+    args = parser.parse_args()
+    calibrate(args.target_ms)
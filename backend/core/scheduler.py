@@ -0,0 +1,67 @@
+from database import SessionLocal
+
+# ---------------------------------------------------------
+# 정기 작업 (EventBridge 5분 스케줄)
+# ---------------------------------------------------------
+# main.handler가 워머 이벤트를 받으면 run_scheduled_jobs()를 호출한다.
+# 작업은 (이름, 함수(db)) 형태로 등록하며, 하나가 실패해도 나머지는 계속 실행한다.
+
+def _flush_view_events(db):
+    from crud import crud_community
+    return crud_community.flush_view_events(db)
+
+
+def _purge_expired_scores(db):
+    from crud import crud_community
+    return crud_community.purge_expired_scores(db)
+
+
+def _purge_expired_verifications(db):
+    from crud import crud_verification
+    return crud_verification.purge_expired_verifications(db)
+
+
+def _purge_expired_challenges(db):
+    # 패스키 챌린지 (PASSKEY_CHALLENGE_STORE=db 일 때만 지울 것이 있음)
+    from core.challenge_store import get_challenge_store
+    return get_challenge_store().purge(db)
+
+
+def _send_outbound_emails(db):
+    # 즉시 발송이 실패했거나 재시도 시각이 된 메일
+    from core.email import send_outbound_emails
+    return send_outbound_emails(db)
+
+
+def _purge_sent_emails(db):
+    from datetime import timedelta
+    from core.email import EMAIL_SENT_RETENTION_SECONDS
+    from crud import crud_email
+    return crud_email.purge_sent_emails(db, timedelta(seconds=EMAIL_SENT_RETENTION_SECONDS))
+
+
+JOBS = [
+    ("flush_view_events", _flush_view_events),
+    ("purge_expired_scores", _purge_expired_scores),
+    ("purge_expired_verifications", _purge_expired_verifications),
+    ("purge_expired_challenges", _purge_expired_challenges),
+    ("send_outbound_emails", _send_outbound_emails),
+    ("purge_sent_emails", _purge_sent_emails),
+]
+
+
+def run_scheduled_jobs():
+    results = {}
+    db = SessionLocal()
+    try:
+        for name, job in JOBS:
+            try:
+                results[name] = job(db)
+            except Exception as e:
+                db.rollback()
+                print(f"❌ Scheduled job '{name}' failed: {e}")
+                results[name] = "failed"
+    finally:
+        db.close()
+    print(f"⏰ Scheduled jobs done: {results}")
+    return results
@@ -0,0 +1,127 @@
+import re
+from typing import Optional
+
+from sqlalchemy import and_, cast, func, or_
+from sqlalchemy.dialects.postgresql import TSVECTOR, TSQUERY
+
+# ---------------------------------------------------------
+# 게시글/댓글 검색 (bigram tsvector)
+# ---------------------------------------------------------
+# 한국어는 띄어쓰기 단위 토큰화로는 "학식" 으로 "학식메뉴" 를 찾을 수 없어서
+# 단어를 2글자씩(bigram) 잘라 위치와 함께 tsvector에 넣는다.
+# 검색어도 같은 방식으로 자르고 "<->"(인접) 연산자로 묶으므로
+# 기존 ILIKE '%검색어%' 와 같은 부분일치를 GIN 인덱스로 처리할 수 있다.
+# 한 글자 검색어는 그 글자로 시작하는 bigram의 접두 검색('x':*)으로 찾는데,
+# 단어의 마지막 글자는 어떤 bigram의 첫 글자도 아니므로 마지막 글자를 1글자 어휘소로도 넣는다.
+# (예: "안녕하세요" -> 안녕 녕하 하세 세요 + 요)
+#
+# 한계: tsvector 위치는 16383까지, 어휘소당 위치는 256개까지만 저장된다.
+# 아주 긴 글(위치 초과)이나 같은 bigram이 256번 넘게 나오는 글은 뒤쪽 위치가 잘려 "<->" 일치가 빠질 수 있어
+# 이런 문서에는 OVERFLOW_LEXEME를 넣어 두고, 검색 시 위치 없는 bigram AND(loose_query_expr) +
+# 원문 ILIKE 재확인(contains_words)으로 한 번 더 찾는다. (표시 문서만 대상이라 GIN 인덱스로 좁혀짐)
+
+WORD_RE = re.compile(r"\w+")
+MAX_POSITION = 16383  # tsvector 위치 최대값
+MAX_POSITIONS_PER_LEXEME = 256
+OVERFLOW_LEXEME = "#overflow"  # \w+ 로는 나올 수 없는 어휘소
+
+
+def _bigrams(word: str) -> list[str]:
+    if len(word) == 1:
+        return [word]
+    return [word[i:i + 2] for i in range(len(word) - 1)]
+
+
+def _quote(lexeme: str) -> str:
+    return "'" + lexeme.replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+def build_document(*parts: tuple[Optional[str], str]) -> str:
+    """
+    (텍스트, 가중치) 목록을 tsvector 리터럴로 변환
+    예) build_document((title, "A"), (content, "B"))
+    """
+    positions: dict[str, list[str]] = {}
+    pos = 0
+    overflow = False
+    for text, weight in parts:
+        for word in WORD_RE.findall((text or "").lower()):
+            for gram in _bigrams(word):
+                if pos + 1 > MAX_POSITION:
+                    overflow = True
+                pos = min(pos + 1, MAX_POSITION)
+                positions.setdefault(gram, []).append(f"{pos}{weight}")
+            if len(word) > 1:
+                # 마지막 글자 (한 글자 검색용, 마지막 bigram과 같은 위치)
+                positions.setdefault(word[-1], []).append(f"{pos}{weight}")
+            pos += 1  # 단어 사이는 인접하지 않도록 한 칸 띄움
+    if any(len(p) > MAX_POSITIONS_PER_LEXEME for p in positions.values()):
+        overflow = True
+    lexemes = [
+        f"{_quote(g)}:{','.join(p[:MAX_POSITIONS_PER_LEXEME])}" for g, p in positions.items()
+    ]
+    if overflow:
+        lexemes.append(_quote(OVERFLOW_LEXEME))
+    return " ".join(lexemes)
+
+
+def _clauses(term: str, joiner: str) -> list[str]:
+    clauses = []
+    for word in WORD_RE.findall((term or "").lower()):
+        if len(word) == 1:
+            # 이 글자로 시작하는 bigram 또는 마지막 글자/한 글자 단어
+            clauses.append(f"{_quote(word)}:*")
+        else:
+            clauses.append(joiner.join(_quote(g) for g in _bigrams(word)))
+    return clauses
+
+
+def build_query(term: str) -> Optional[str]:
+    """검색어를 tsquery 리터럴로 변환 (검색 가능한 글자가 없으면 None)"""
+    clauses = _clauses(term, " <-> ")
+    if not clauses:
+        return None
+    return " & ".join(f"({c})" for c in clauses)
+
+
+def build_loose_query(term: str) -> Optional[str]:
+    """위치가 잘린 문서용: OVERFLOW_LEXEME가 있고 bigram이 모두 들어 있는 문서 (순서/인접 무시)"""
+    clauses = _clauses(term, " & ")
+    if not clauses:
+        return None
+    return " & ".join([_quote(OVERFLOW_LEXEME)] + [f"({c})" for c in clauses])
+
+
+def post_vector(title: str, content: str):
+    return cast(build_document((title, "A"), (content, "B")), TSVECTOR)
+
+
+def comment_vector(content: str):
+    return cast(build_document((content, "A")), TSVECTOR)
+
+
+def query_expr(term: str):
+    query = build_query(term)
+    return cast(query, TSQUERY) if query else None
+
+
+def loose_query_expr(term: str):
+    query = build_loose_query(term)
+    return cast(query, TSQUERY) if query else None
+
+
+def contains_words(term: str, *columns):
+    """검색어의 단어가 모두 columns 중 하나에 들어 있음 (ILIKE, loose_query_expr 결과 재확인용)"""
+    conditions = []
+    for word in WORD_RE.findall((term or "").lower()):
+        pattern = "%" + word.replace("_", "\\_") + "%"  # \w+ 에서 LIKE 특수문자는 _ 뿐
+        conditions.append(or_(*(col.ilike(pattern, escape="\\") for col in columns)))
+    return and_(*conditions)
+
+
+def matches(vector_col, query):
+    return vector_col.bool_op("@@")(query)
+
+
+def rank(vector_col, query):
+    return func.ts_rank(vector_col, query)
@@ -1,7 +1,5 @@
 from datetime import datetime, timedelta, timezone
 from typing import Any, Union, Optional
-from jose import jwt
-from passlib.context import CryptContext
 from core.config import settings
 
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
@@ -9,15 +7,35 @@ REFRESH_TOKEN_EXPIRE_DAYS = int(settings.REFRESH_TOKEN_EXPIRE_MINUTES / (60 * 24
 ALGORITHM = settings.ALGORITHM
 SECRET_KEY = settings.SECRET_KEY
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+def _jwt():
+    # python-jose(+cryptography)는 토큰 발급/검증 시에만 import (콜드 스타트 단축)
+    from jose import jwt
+    return jwt
 
+# 비밀번호 해시는 core.passwords (설정된 bcrypt/argon2 비용 사용)
+# - API 엔드포인트는 전용 풀에서 실행하는 passwords.hash_password / verify_password 를 await 한다.
+# - 아래 함수는 스크립트 등 동기 호출용으로, 현재 스레드에서 바로 계산한다.
 def verify_password(plain_password, hashed_password):
     """입력받은 비밀번호와 DB의 암호화된 비밀번호 비교"""
-    return pwd_context.verify(plain_password, hashed_password)
+    from core.passwords import context
+    return context().verify(plain_password, hashed_password)
 
 def get_password_hash(password):
-    """비밀번호 암호화 (회원가입 시 사용)"""
-    return pwd_context.hash(password)
+    """비밀번호 암호화"""
+    from core.passwords import context
+    return context().hash(password)
+
+def token_claims(user) -> dict:
+    """
+    액세스 토큰에 담는 유저 정보
+    - id만 필요한 API는 DB 조회 없이 이 값으로 처리 (api.deps.get_current_principal)
+    """
+    return {
+        "sub": str(user.id),
+        "is_active": bool(user.is_active),
+        "is_student_verified": bool(user.is_student_verified),
+        "university_id": user.university_id,
+    }
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -29,7 +47,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     
     to_encode.update({"exp": expire, "type": "access"})
     
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = _jwt().encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -42,5 +60,5 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None)
     
     to_encode.update({"exp": expire, "type": "refresh"})
     
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = _jwt().encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
\ No newline at end of file
@@ -0,0 +1,48 @@
+from functools import lru_cache
+
+import orjson
+from fastapi.responses import JSONResponse
+
+from core import instrumentation
+
+# ---------------------------------------------------------
+# 목록 응답 직렬화 (orjson)
+# ---------------------------------------------------------
+# 목록 조회는 응답 스키마 필드와 같은 컬럼만 SELECT 한 Row를 돌려준다 (crud_community.LIST_COLUMNS 등).
+# DB에서 바로 읽은 값이라 Pydantic 검증(from_attributes)과 jsonable_encoder를 건너뛰고
+# dict로 바꿔 orjson으로 바로 JSON을 만든다. (ORM 객체 생성, 속성 접근, 검증 비용 없음)
+# response_model은 문서(OpenAPI)용으로 그대로 둔다.
+
+# datetime은 Pydantic과 같은 표기 (UTC는 "...Z")
+OPTIONS = orjson.OPT_UTC_Z
+
+
+def dumps(content) -> bytes:
+    with instrumentation.serializing():
+        return orjson.dumps(content, option=OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def schema_defaults(schema) -> dict:
+    """Row에 없는 응답 필드의 기본값 (예: CommentResponse.is_author=False)"""
+    return {
+        name: field.get_default(call_default_factory=True)
+        for name, field in schema.model_fields.items()
+        if not field.is_required()
+    }
+
+
+def row_dicts(rows, schema, exclude: tuple = ()) -> list[dict]:
+    """컬럼 Row 목록 -> schema 모양의 dict 목록 (검증 없음, exclude는 응답에 넣지 않는 컬럼)"""
+    defaults = schema_defaults(schema)
+    items = [{**defaults, **row._mapping} for row in rows]
+    if exclude:
+        for item in items:
+            for name in exclude:
+                del item[name]
+    return items
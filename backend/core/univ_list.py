@@ -86,18 +86,3 @@ UNIVERSITY_MAP = {
     "mokpo.ac.kr": "목포대학교",
     "scnu.ac.kr": "순천대학교",
 }
-
-def get_university_name(email: str) -> str | None:
-    try:
-        domain = email.split("@")[1]
-        
-        # 등록된 학교인지 확인 (Whitelist)
-        if domain in UNIVERSITY_MAP:
-            return UNIVERSITY_MAP[domain]
-            
-        # 등록 안 된 학교라도 .ac.kr 또는 .edu 도메인이면 허용 (Fallback)
-        if domain.endswith(".ac.kr") or domain.endswith(".edu"):
-            return domain.split(".")[0].upper() + " 대학교(미등록)"
-        return None
-    except IndexError:
-        return None
\ No newline at end of file
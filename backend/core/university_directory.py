@@ -0,0 +1,158 @@
+import threading
+import time
+from dataclasses import dataclass, replace
+from types import MappingProxyType
+from typing import Iterable, Mapping, Optional
+
+from core.config import settings
+from core.univ_list import UNIVERSITY_MAP
+
+# ---------------------------------------------------------
+# 학교 디렉터리 (이메일 도메인 -> 학교)
+# ---------------------------------------------------------
+# - UNIVERSITY_MAP과 universities 테이블을 한 번 읽어 도메인 -> (학교명, id) 인덱스를 만든다.
+# - 인덱스는 불변이고, 학교가 추가되면 새 인덱스로 통째로 바꾼다 (읽을 때 락 없음).
+# - 서브도메인은 뒤쪽부터 잘라 가며 찾는다 (mail.snu.ac.kr -> snu.ac.kr).
+# - 목록에 없는 .ac.kr / .edu 도메인은 "<이름> 대학교(미등록)"으로 받아 준다.
+# - 다른 인스턴스에서 추가/수정된 학교는 UNIVERSITY_DIRECTORY_TTL_SECONDS마다 다시 읽어 반영한다.
+FALLBACK_SUFFIXES = (".ac.kr", ".edu")
+
+
+@dataclass(frozen=True)
+class UniversityEntry:
+    name: str
+    domain: str
+    university_id: Optional[int] = None  # None이면 아직 universities에 없음
+
+
+class UniversityDirectory:
+    def __init__(self, entries: Mapping[str, UniversityEntry]):
+        self._entries = MappingProxyType(dict(entries))
+
+    @classmethod
+    def build(cls, rows: Iterable[tuple[int, str, str]] = ()) -> "UniversityDirectory":
+        """rows: universities의 (id, name, domain)"""
+        rows = list(rows)
+        ids = {name: university_id for university_id, name, _ in rows}
+        entries = {
+            domain: UniversityEntry(name, domain, ids.get(name))
+            for domain, name in UNIVERSITY_MAP.items()
+        }
+        # 자동 등록된 학교(미등록 도메인)와 import로만 들어온 학교
+        for university_id, name, domain in rows:
+            domain = domain.lower()
+            entries.setdefault(domain, UniversityEntry(name, domain, university_id))
+        return cls(entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def resolve(self, email: str) -> Optional[UniversityEntry]:
+        """지원하지 않는 도메인이면 None"""
+        domain = email.rpartition("@")[2].strip().lower()
+        labels = domain.split(".")
+        # 가장 긴 도메인부터 (최상위 라벨 하나만 남으면 중단)
+        for start in range(len(labels) - 1):
+            entry = self._entries.get(".".join(labels[start:]))
+            if entry is not None:
+                return entry
+
+        for suffix in FALLBACK_SUFFIXES:
+            if domain.endswith(suffix):
+                label = domain[:-len(suffix)].rpartition(".")[2]
+                if label:
+                    return UniversityEntry(f"{label.upper()} 대학교(미등록)", f"{label}{suffix}")
+        return None
+
+    def with_university(self, name: str, domain: str, university_id: int) -> "UniversityDirectory":
+        """학교 하나가 추가된 새 인덱스 (같은 이름의 다른 도메인에도 id 연결)"""
+        entries = {
+            key: replace(entry, university_id=university_id) if entry.name == name else entry
+            for key, entry in self._entries.items()
+        }
+        entries.setdefault(domain, UniversityEntry(name, domain, university_id))
+        return UniversityDirectory(entries)
+
+
+_directory: Optional[UniversityDirectory] = None
+_loaded_at = 0.0
+_lock = threading.Lock()
+
+
+def get_directory(db) -> UniversityDirectory:
+    """첫 사용 시(또는 TTL이 지나면) universities를 읽어 인덱스 생성, 그 외에는 쿼리 없음"""
+    global _directory, _loaded_at
+    directory = _directory
+    if directory is not None and time.monotonic() - _loaded_at < settings.UNIVERSITY_DIRECTORY_TTL_SECONDS:
+        return directory
+
+    from crud.crud_university import directory_rows_stmt
+
+    rows = db.execute(directory_rows_stmt()).all()
+    with _lock:
+        _directory = UniversityDirectory.build(rows)
+        _loaded_at = time.monotonic()
+        return _directory
+
+
+def remember_university(name: str, domain: str, university_id: int) -> None:
+    """커밋된 학교를 인덱스에 반영 (다음 인증부터 조회 없음)"""
+    global _directory
+    with _lock:
+        if _directory is not None:
+            _directory = _directory.with_university(name, domain, university_id)
+
+
+def invalidate_directory() -> None:
+    global _directory
+    with _lock:
+        _directory = None
+
+
+# ---------------------------------------------------------
+# 학교 목록 가져오기
+# ---------------------------------------------------------
+#   python -m core.university_directory import universities.csv   # "domain,name" 한 줄에 하나 (헤더 허용)
+#   python -m core.university_directory import --builtin          # UNIVERSITY_MAP
+def read_domain_list(path: str) -> list[tuple[str, str]]:
+    import csv
+
+    rows = []
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for record in csv.reader(f):
+            if len(record) < 2 or not record[0].strip() or record[0].strip().lower() == "domain":
+                continue
+            rows.append((record[0].strip().lower(), record[1].strip()))
+    return rows
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m core.university_directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_cmd = commands.add_parser("import", help="학교 도메인 목록을 universities에 추가")
+    import_cmd.add_argument("path", nargs="?", help="domain,name CSV 파일")
+    import_cmd.add_argument("--builtin", action="store_true", help="UNIVERSITY_MAP도 함께 추가")
+    args = parser.parse_args(argv)
+
+    if not args.path and not args.builtin:
+        parser.error("CSV 파일 경로 또는 --builtin 이 필요합니다")
+
+    from database import SessionLocal
+    from crud.crud_university import import_universities
+
+    rows = list(UNIVERSITY_MAP.items()) if args.builtin else []
+    if args.path:
+        rows += read_domain_list(args.path)
+
+    db = SessionLocal()
+    try:
+        inserted = import_universities(db, rows)
+    finally:
+        db.close()
+    print(f"universities: {len(rows)}개 중 {inserted}개 추가")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 # backend/core/utils.py
-from user_agents import parse
 
 def get_device_name(user_agent_str: str | None) -> str:
+    # user_agents(ua_parser 정규식 로딩)는 무거워서 패스키 등록 시에만 import
+    from user_agents import parse
 
     if not user_agent_str:
         return "Unknown Device"
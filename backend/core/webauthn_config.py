@@ -8,4 +8,4 @@ from webauthn.helpers.structs import AuthenticatorSelectionCriteria, UserVerific
 RP_ID = os.getenv("WEBAUTHN_RP_ID", "localhost")
 RP_NAME = os.getenv("WEBAUTHN_RP_NAME", "Mate Community")
 ORIGIN = os.getenv("WEBAUTHN_ORIGIN", "http://localhost:3000")
-challenge_store = {}
\ No newline at end of file
+# 챌린지 저장소는 core.challenge_store
\ No newline at end of file
@@ -1,38 +1,291 @@
-from sqlalchemy.orm import Session, joinedload, subqueryload
-from sqlalchemy import func, desc, or_
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import func, union, select, delete, update, exists, literal, event, inspect
+from sqlalchemy.dialects.postgresql import insert, array
+import threading
+import time
 from datetime import timedelta
-from models.community import Post, Comment, PostLike, PostScrap
-from models.user import User
+from models.community import Post, Comment, PostLike, PostScrap, PostScore, PostViewEvent
+from models.user import User, University
 from schemas.community import PostCreate, PostUpdate, CommentCreate
+from core.pagination import Cursor, apply_keyset
+from core import search as post_search
+from core.config import settings
+from core.feed_cache import invalidate_feed
 
 # ---------------------------------------------------------
 # 공통 옵션
 # ---------------------------------------------------------
-def get_post_options():
-    return [
-        joinedload(Post.author).joinedload(User.university_rel),
-    ]
+# 목록 조회는 ORM 객체 대신 응답 스키마 필드와 같은 컬럼의 Row를 돌려준다.
+# (identity map/속성 추적 비용 없이 엔드포인트가 그대로 직렬화, core.serialization)
 
-def map_post_info(post):
-    if post.author:
-        post.author_university = post.author.university_rel.name if post.author.university_rel else None
-        post.author_nickname = post.author.nickname or post.author.email.split("@")[0]
-    else:
-        post.author_university = None
-        post.author_nickname = "알수없음"
-    return post
+# PostListResponse 필드 (content, media_urls 제외)
+LIST_COLUMNS = (
+    Post.id, Post.category, Post.title,
+    Post.author_id, Post.author_nickname, Post.author_university,
+    Post.view_count, Post.like_count, Post.comment_count, Post.scrap_count,
+    Post.created_at, Post.updated_at,
+)
 
-def map_comment_info(comment):
-    if comment.author:
-        comment.author_university = comment.author.university_rel.name if comment.author.university_rel else None
-        comment.author_nickname = comment.author.nickname or comment.author.email.split("@")[0]
-    else:
-        comment.author_university = None
-        comment.author_nickname = "알수없음"
+# CommentResponse 필드 (reply_count, depth, post_title은 쿼리마다 라벨로 추가)
+COMMENT_COLUMNS = (
+    Comment.content, Comment.post_id, Comment.parent_id,
+    Comment.id, Comment.author_id, Comment.created_at,
+    Comment.author_nickname, Comment.author_university, Comment.is_deleted,
+)
+
+DELETED_POST_TITLE = "삭제된 게시글입니다."
+
+def post_list_select(full: bool = False):
+    """목록은 LIST_COLUMNS Row, full=True면 상세 응답(PostResponse)용 Post 객체"""
+    return select(Post) if full else select(*LIST_COLUMNS)
+
+# ---------------------------------------------------------
+# 작성자 스냅샷 (posts/comments.author_nickname, author_university)
+# ---------------------------------------------------------
+# 목록 조회가 users/universities를 조인하지 않도록 작성 시점의 작성자 표시 정보를 복사해 두고,
+# 닉네임/이메일/학교가 바뀌면 같은 트랜잭션(flush) 안에서 해당 유저의 글/댓글을 갱신한다.
+UNKNOWN_AUTHOR = "알수없음"
 
-    comment.reply_count = len(comment.replies)
+def author_nickname_expr(user_id):
+    """닉네임, 없으면 이메일 앞부분"""
+    return select(
+        func.coalesce(func.nullif(User.nickname, ""), func.split_part(User.email, "@", 1), UNKNOWN_AUTHOR)
+    ).where(User.id == user_id).scalar_subquery()
+
+def author_university_expr(user_id):
+    return select(University.name)\
+        .join(User, User.university_id == University.id)\
+        .where(User.id == user_id).scalar_subquery()
+
+def sync_author_snapshots(connection, author_ids):
+    """author_ids가 쓴 글/댓글의 스냅샷을 현재 users 값으로 갱신"""
+    for model in (Post, Comment):
+        table = model.__table__
+        values = dict(
+            author_nickname=author_nickname_expr(table.c.author_id),
+            author_university=author_university_expr(table.c.author_id),
+            updated_at=table.c.updated_at,  # 작성자 정보 변경은 글 수정이 아니므로 유지
+        )
+        if model is Comment:
+            values["author_updated_at"] = func.now()  # 댓글 목록 버전(comments_version_stmt)용
+        connection.execute(
+            update(table)
+            .where(table.c.author_id.in_(author_ids))
+            .values(**values)
+        )
+
+@event.listens_for(User, "after_update")
+def _sync_user_snapshot(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[key].history.has_changes() for key in ("nickname", "email", "university_id", "university_rel")):
+        sync_author_snapshots(connection, [target.id])
+
+@event.listens_for(University, "after_update")
+def _sync_university_snapshot(mapper, connection, target):
+    if inspect(target).attrs.name.history.has_changes():
+        sync_author_snapshots(connection, select(User.id).where(User.university_id == target.id))
+
+# ---------------------------------------------------------
+# 조회 쿼리 (sync/async crud 공용)
+# ---------------------------------------------------------
+# async 세션은 lazy load가 불가하므로 응답에 쓰는 관계는 모두 eager load 한다.
+# 작성자 표시 정보는 스냅샷 컬럼을 쓰므로 users/universities는 조인하지 않는다.
+def best_posts_stmt(skip: int = 0, limit: int = 5):
+    # post_scores의 (score, post_id) 인덱스를 역순으로 읽으므로 기간 내 글 수와 무관
+    return post_list_select()\
+        .join(PostScore, PostScore.post_id == Post.id)\
+        .where(PostScore.created_at >= func.now() - BEST_WINDOW)\
+        .order_by(PostScore.score.desc(), PostScore.post_id.desc())\
+        .offset(skip).limit(limit)
+
+def posts_stmt(
+    skip: int = 0,
+    limit: int = 10,
+    category: str = None,
+    search: str = None,
+    after: Cursor | None = None,
+):
+    """게시글 목록 쿼리 (검색어에 검색할 단어가 없으면 None)"""
+    stmt = post_list_select()
     
-    return comment
+    if category and category != "ALL":
+        stmt = stmt.where(Post.category == category)
+    
+    if search:
+        # 제목+내용 벡터 또는 댓글 벡터가 일치하는 글 (GIN 인덱스 사용)
+        ts_query = post_search.query_expr(search)
+        if ts_query is None:
+            return None
+        # OR로 묶으면 posts를 순차 스캔하므로, 각 GIN 인덱스 결과를 UNION 해서 id로 찾는다
+        post_hits = select(Post.id).where(post_search.matches(Post.search_vector, ts_query))
+        comment_hits = select(Comment.post_id).where(post_search.matches(Comment.search_vector, ts_query))
+        # 위치가 잘린 긴 문서는 위치 없는 bigram으로 찾고 원문 ILIKE로 재확인 (core.search 참고)
+        loose_query = post_search.loose_query_expr(search)
+        long_post_hits = select(Post.id).where(
+            post_search.matches(Post.search_vector, loose_query),
+            post_search.contains_words(search, Post.title, Post.content),
+        )
+        long_comment_hits = select(Comment.post_id).where(
+            post_search.matches(Comment.search_vector, loose_query),
+            post_search.contains_words(search, Comment.content),
+        )
+        stmt = stmt.where(Post.id.in_(union(post_hits, comment_hits, long_post_hits, long_comment_hits)))
+        if after is None:
+            # 페이지 모드는 관련도순, 커서 모드는 최신순(keyset) 유지
+            stmt = stmt.order_by(post_search.rank(Post.search_vector, ts_query).desc().nulls_last())
+    return apply_keyset(stmt, Post.created_at, Post.id, after, limit, skip)
+
+def post_stmt(post_id: int):
+    return select(Post).where(Post.id == post_id)
+
+def viewer_flag_exprs(post_id: int, user_id: int | None):
+    if user_id is None:
+        return literal(False), literal(False)
+    return (
+        exists().where(PostLike.post_id == post_id, PostLike.user_id == user_id),
+        exists().where(PostScrap.post_id == post_id, PostScrap.user_id == user_id),
+    )
+
+def viewer_flags_stmt(post_id: int, user_id: int):
+    """(좋아요 여부, 스크랩 여부)를 한 번에 조회"""
+    return select(*viewer_flag_exprs(post_id, user_id))
+
+# 여러 글의 조회자 상태: 연관 테이블마다 IN 쿼리 1번 (PK(user_id, post_id)로 조회, 글 수와 무관)
+POST_BATCH_LIMIT = 100
+
+def posts_by_ids_stmt(post_ids: list[int]):
+    return post_list_select().where(Post.id.in_(post_ids))
+
+def viewer_post_ids_stmt(model, post_ids: list[int], user_id: int):
+    """post_ids 중 user_id가 좋아요(PostLike)/스크랩(PostScrap)한 글 id"""
+    return select(model.post_id).where(model.user_id == user_id, model.post_id.in_(post_ids))
+
+def order_by_ids(rows, post_ids: list[int]):
+    """요청한 id 순서대로 (중복 제거, 없는 글은 빠짐)"""
+    by_id = {row.id: row for row in rows}
+    return [by_id[post_id] for post_id in dict.fromkeys(post_ids) if post_id in by_id]
+
+def apply_viewer_flags(items: list[dict], liked: set, scrapped: set):
+    """직렬화 전 목록 항목(dict)에 is_liked/is_scrapped 채우기"""
+    for item in items:
+        item["is_liked"] = item["id"] in liked
+        item["is_scrapped"] = item["id"] in scrapped
+    return items
+
+# 조건부 요청(ETag)용 버전: 응답 본문을 바꾸는 값만 가볍게 조회한다.
+# 제목/본문/미디어 수정은 updated_at으로, 카운터/작성자 스냅샷은 각 컬럼으로 반영된다.
+def post_version_stmt(post_id: int, user_id: int | None = None):
+    return select(
+        Post.updated_at, Post.view_count, Post.like_count, Post.comment_count, Post.scrap_count,
+        Post.author_nickname, Post.author_university,
+        *viewer_flag_exprs(post_id, user_id),
+    ).where(Post.id == post_id)
+
+def post_version(post):
+    """불러온 상세 응답의 버전 (post_version_stmt 결과와 같은 순서)"""
+    return (
+        post.updated_at, post.view_count, post.like_count, post.comment_count, post.scrap_count,
+        post.author_nickname, post.author_university,
+        post.is_liked, post.is_scrapped,
+    )
+
+# 댓글 목록 버전 컬럼 (작성/삭제는 개수·최대 id, 소프트 삭제는 updated_at, 작성자 스냅샷 변경은 author_updated_at)
+COMMENTS_VERSION_COLUMNS = ("version_count", "version_max_id", "version_updated_at", "version_author_updated_at")
+
+def comments_version_exprs():
+    return (
+        func.count(), func.max(Comment.id), func.max(Comment.updated_at), func.max(Comment.author_updated_at),
+    )
+
+def comments_version_stmt(post_id: int):
+    """게시글 댓글 목록의 버전 (조건부 요청에서 목록보다 먼저 조회)"""
+    return select(*comments_version_exprs()).where(Comment.post_id == post_id)
+
+def with_comments_version(stmt, post_id: int):
+    """
+    댓글 목록 쿼리의 각 행에 버전 컬럼(COMMENTS_VERSION_COLUMNS)을 붙임
+    - 비상관 서브쿼리라 한 번만 계산되고, 버전을 따로 조회하는 왕복이 없음
+    - 응답으로 직렬화할 때는 row_dicts(exclude=COMMENTS_VERSION_COLUMNS)로 뺀다
+    """
+    return stmt.add_columns(*(
+        select(expr).where(Comment.post_id == post_id).scalar_subquery().label(name)
+        for expr, name in zip(comments_version_exprs(), COMMENTS_VERSION_COLUMNS)
+    ))
+
+def comments_version(rows):
+    """with_comments_version 행에서 버전 (comments_version_stmt 결과와 같은 순서, 행이 없으면 None)"""
+    if not rows:
+        return None
+    return tuple(getattr(rows[0], name) for name in COMMENTS_VERSION_COLUMNS)
+
+def reply_count_expr():
+    """
+    댓글별 대댓글 수 (같은 쿼리 안에서 ix_comments_parent_id로 COUNT)
+    - replies 컬렉션을 불러와 len() 하지 않으므로 대댓글이 많아도 쿼리 수가 늘지 않음
+    """
+    replies = aliased(Comment)
+    return select(func.count())\
+        .where(replies.parent_id == Comment.id)\
+        .correlate(Comment)\
+        .scalar_subquery().label("reply_count")
+
+def comments_by_post_stmt(post_id: int, skip: int = 0, limit: int = 50):
+    """COMMENT_COLUMNS + reply_count 행을 반환"""
+    return select(*COMMENT_COLUMNS, reply_count_expr())\
+        .where(Comment.post_id == post_id)\
+        .order_by(Comment.created_at.asc())\
+        .offset(skip).limit(limit)
+
+def comments_by_author_stmt(user_id: int, skip: int = 0, limit: int = 50, after: Cursor | None = None):
+    """COMMENT_COLUMNS + reply_count, post_title 행을 반환 (글이 지워졌으면 DELETED_POST_TITLE)"""
+    stmt = select(*COMMENT_COLUMNS, reply_count_expr(),
+                  func.coalesce(Post.title, DELETED_POST_TITLE).label("post_title"))\
+        .outerjoin(Post, Post.id == Comment.post_id)\
+        .where(Comment.author_id == user_id)
+    return apply_keyset(stmt, Comment.created_at, Comment.id, after, limit, skip)
+
+THREAD_MAX_DEPTH = 10
+THREAD_LIMIT = 500
+
+def comment_thread_stmt(
+    post_id: int,
+    root_id: int | None = None,
+    max_depth: int = THREAD_MAX_DEPTH,
+    limit: int = THREAD_LIMIT,
+):
+    """
+    댓글 트리를 재귀 CTE 한 번으로 조회 (COMMENT_COLUMNS + depth, reply_count 행, 트리 순서)
+    - root_id가 없으면 게시글의 최상위 댓글부터, 있으면 해당 댓글부터 시작
+    - depth는 시작 댓글이 0, max_depth보다 깊은 대댓글은 따라가지 않음
+    - id 경로(path)로 정렬하므로 부모 바로 뒤에 자식이 작성 순으로 이어짐
+    """
+    anchor = select(Comment.id, literal(0).label("depth"), array([Comment.id]).label("path"))\
+        .where(Comment.post_id == post_id)
+    if root_id is None:
+        anchor = anchor.where(Comment.parent_id.is_(None))
+    else:
+        anchor = anchor.where(Comment.id == root_id)
+    thread = anchor.cte("thread", recursive=True)
+
+    child = aliased(Comment)
+    thread = thread.union_all(
+        select(child.id, thread.c.depth + 1, func.array_append(thread.c.path, child.id))
+        .where(child.parent_id == thread.c.id, thread.c.depth < max_depth)
+    )
+
+    return select(*COMMENT_COLUMNS, thread.c.depth, reply_count_expr())\
+        .join(thread, thread.c.id == Comment.id)\
+        .order_by(thread.c.path)\
+        .limit(limit)
+
+def my_posts_stmt(user_id: int, skip: int = 0, limit: int = 10, after: Cursor | None = None, full: bool = False):
+    stmt = post_list_select(full).where(Post.author_id == user_id)
+    return apply_keyset(stmt, Post.created_at, Post.id, after, limit, skip)
+
+def my_scraps_stmt(user_id: int, skip: int = 0, limit: int = 10, after: Cursor | None = None, full: bool = False):
+    stmt = post_list_select(full).join(PostScrap, Post.id == PostScrap.post_id)\
+        .where(PostScrap.user_id == user_id)
+    return apply_keyset(stmt, Post.created_at, Post.id, after, limit, skip)
 
 # ---------------------------------------------------------
 # 게시글 작성
@@ -43,18 +296,24 @@ def create_post(db: Session, post: PostCreate, user_id: int):
         content=post.content,
         category=post.category,
         media_urls=post.media_urls or [],
-        author_id=user_id
+        author_id=user_id,
+        author_nickname=author_nickname_expr(user_id),
+        author_university=author_university_expr(user_id),
+        search_vector=post_search.post_vector(post.title, post.content)
     )
     db.add(db_post)
+    db.flush()
+    refresh_post_score(db, db_post.id)
     db.commit()
+    invalidate_feed()
     db.refresh(db_post)
-    return map_post_info(db_post) # 매핑 후 반환
+    return db_post
 
 # ---------------------------------------------------------
 # 게시글 수정
 # ---------------------------------------------------------
 def update_post(db: Session, post_id: int, post_data: PostUpdate, user_id: int):
-    post = db.query(Post).options(*get_post_options()).filter(Post.id == post_id).first()
+    post = db.query(Post).filter(Post.id == post_id).first()
     if not post: return "not_found"
     if post.author_id != user_id: return "not_authorized"
     
@@ -65,10 +324,15 @@ def update_post(db: Session, post_id: int, post_data: PostUpdate, user_id: int):
     # media_urls가 설정되면 레거시 image 필드 비우기
     if 'media_urls' in update_data:
         post.image = None
+
+    # 제목/내용이 바뀌면 검색 벡터 갱신
+    if 'title' in update_data or 'content' in update_data:
+        post.search_vector = post_search.post_vector(post.title, post.content)
     
     db.commit()
+    invalidate_feed()
     db.refresh(post)
-    return map_post_info(post)
+    return post
 
 # ---------------------------------------------------------
 # 게시글 삭제 (기존 동일)
@@ -79,25 +343,52 @@ def delete_post(db: Session, post_id: int, user_id: int):
     if post.author_id != user_id: return "not_authorized"
     db.delete(post)
     db.commit()
+    invalidate_feed()
     return "success"
 
 # ---------------------------------------------------------
-# 인기글 조회
+# 인기글 점수 (post_scores)
 # ---------------------------------------------------------
-def get_best_posts(db: Session, skip: int = 0, limit: int = 5):
-    score_expr = Post.view_count + (Post.like_count * 3) + (Post.comment_count * 5)
-    posts = db.query(Post)\
-        .options(*get_post_options())\
-        .filter(Post.created_at >= func.now() - timedelta(days=7))\
-        .order_by(score_expr.desc())\
-        .offset(skip).limit(limit).all()
+BEST_WINDOW = timedelta(days=7)
 
-    for post in posts:
-        post.is_liked = False
-        post.is_scrapped = False
-        map_post_info(post)
+def best_score_expr():
+    return Post.view_count + (Post.like_count * 3) + (Post.comment_count * 5)
 
-    return posts
+def refresh_post_score(db: Session, post_id: int):
+    refresh_post_scores(db, [post_id])
+
+def refresh_post_scores(db: Session, post_ids: list[int]):
+    """
+    게시글들의 점수를 다시 계산해 post_scores에 반영 (커밋은 호출한 쪽에서)
+    - 카운터 변경 직후 호출, 7일이 지난 글은 무시
+    """
+    if not post_ids:
+        return
+    db.flush()
+    db.execute(post_scores_upsert_stmt(post_ids))
+
+def post_scores_upsert_stmt(post_ids: list[int]):
+    rows = select(Post.id, func.coalesce(best_score_expr(), 0), Post.created_at)\
+        .where(Post.id.in_(post_ids), Post.created_at >= func.now() - BEST_WINDOW)
+    stmt = insert(PostScore).from_select(["post_id", "score", "created_at"], rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[PostScore.post_id],
+        set_={"score": stmt.excluded.score}
+    )
+
+def purge_expired_scores(db: Session):
+    """기간(7일)이 지난 글을 랭킹에서 제거 (스케줄러에서 호출)"""
+    deleted = db.query(PostScore)\
+        .filter(PostScore.created_at < func.now() - BEST_WINDOW)\
+        .delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+# ---------------------------------------------------------
+# 인기글 조회
+# ---------------------------------------------------------
+def get_best_posts(db: Session, skip: int = 0, limit: int = 5):
+    return db.execute(best_posts_stmt(skip, limit)).all()
 
 # ---------------------------------------------------------
 # 게시글 목록 조회
@@ -108,85 +399,157 @@ def get_posts(
     limit: int = 10, 
     category: str = None, 
     search: str = None,
+    after: Cursor | None = None,
 ):
-    query = db.query(Post).options(*get_post_options())
-    
-    if category and category != "ALL":
-        query = query.filter(Post.category == category)
-    
-    if search:
-        search_pattern = f"%{search}%"
-        query = query.outerjoin(Comment, Post.id == Comment.post_id)
-        query = query.filter(
-            or_(
-                Post.title.ilike(search_pattern),
-                Post.content.ilike(search_pattern),
-                Comment.content.ilike(search_pattern)
-            )
-        )
-        query = query.distinct()
-    posts = query.order_by(Post.created_at.desc()).offset(skip).limit(limit).all()
-    
-    for post in posts:
-        post.is_liked = False
-        post.is_scrapped = False
-        map_post_info(post) # 🔥 매핑 적용
-            
-    return posts
+    stmt = posts_stmt(skip, limit, category, search, after)
+    if stmt is None:
+        return []
+    return db.execute(stmt).all()
 
 # ---------------------------------------------------------
-# 조회수 증가 (기존 동일)
+# 여러 게시글 / 조회자 좋아요·스크랩 여부
 # ---------------------------------------------------------
-def increase_view_count(db: Session, post_id: int):
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if post:
-        post.view_count += 1
-        db.commit()
+def get_posts_by_ids(db: Session, post_ids: list[int]):
+    return order_by_ids(db.execute(posts_by_ids_stmt(post_ids)).all(), post_ids)
+
+def get_viewer_flags(db: Session, post_ids: list[int], user_id: int):
+    """(좋아요한 글 id 집합, 스크랩한 글 id 집합)"""
+    if not post_ids:
+        return set(), set()
+    liked = set(db.scalars(viewer_post_ids_stmt(PostLike, post_ids, user_id)))
+    scrapped = set(db.scalars(viewer_post_ids_stmt(PostScrap, post_ids, user_id)))
+    return liked, scrapped
+
+# ---------------------------------------------------------
+# 조회수 (버퍼 후 일괄 반영)
+# ---------------------------------------------------------
+class ViewFlushTrigger:
+    """
+    인스턴스에서 기록한 조회 수/마지막 반영 후 경과 시간으로 즉시 반영할 차례인지 판단
+    (스케줄러 5분 주기만으로는 조회수가 늦게 오르고 이벤트가 많이 쌓이므로)
+    """
+
+    def __init__(self, threshold: int, interval: float):
+        self.threshold = threshold
+        self.interval = interval
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self) -> bool:
+        """조회 1건을 세고, 반영할 차례면 True (카운터를 다시 0부터)"""
+        with self._lock:
+            self._pending += 1
+            now = time.monotonic()
+            due = (self.threshold > 0 and self._pending >= self.threshold) or \
+                  (self.interval > 0 and now - self._last_flush >= self.interval)
+            if due:
+                self._pending = 0
+                self._last_flush = now
+            return due
+
+view_flush_trigger = ViewFlushTrigger(settings.VIEW_FLUSH_THRESHOLD, settings.VIEW_FLUSH_INTERVAL_SECONDS)
+
+def record_view(db: Session, post_id: int):
+    """조회 1건 기록: posts 행을 잠그지 않도록 이벤트 테이블에 INSERT만 함 (반영할 차례면 바로 반영)"""
+    db.add(PostViewEvent(post_id=post_id))
+    db.commit()
+    if view_flush_trigger.record():
+        flush_view_events(db)
+
+# 조회수 반영은 한 번에 하나만 (트랜잭션 단위 advisory lock, 커밋/롤백 시 자동 해제)
+VIEW_FLUSH_LOCK_KEY = 7_140_001
+
+def view_flush_lock_stmt():
+    """잠금을 얻으면 true, 다른 세션이 반영 중이면 기다리지 않고 false"""
+    return select(func.pg_try_advisory_xact_lock(VIEW_FLUSH_LOCK_KEY))
+
+def flush_view_events_stmt():
+    """이벤트를 지우면서(DELETE ... RETURNING) 게시글별로 합산해 view_count에 더하고 게시글 id를 반환"""
+    drained = delete(PostViewEvent).returning(PostViewEvent.post_id).cte("drained")
+    counts = select(drained.c.post_id, func.count().label("views"))\
+        .group_by(drained.c.post_id).cte("counts")
+    posts = Post.__table__
+    return update(posts)\
+        .where(posts.c.id == counts.c.post_id)\
+        .values(view_count=func.coalesce(posts.c.view_count, 0) + counts.c.views)\
+        .returning(posts.c.id)
+
+def flush_view_events(db: Session):
+    """
+    쌓인 조회 이벤트를 게시글별로 합산해 한 번의 UPDATE로 반영 (스케줄러, ViewFlushTrigger에서 호출)
+    - DELETE ... RETURNING 으로 가져간 이벤트만 반영하므로 같은 이벤트를 두 번 세지 않음
+    - 여러 인스턴스가 동시에 반영하면 서로 다른 순서로 posts 행을 잠가 교착될 수 있으므로
+      advisory lock을 얻은 한 곳만 반영하고 나머지는 건너뜀 (남은 이벤트는 다음 반영 때)
+    반환: 반영한 게시글 수
+    """
+    if not db.scalar(view_flush_lock_stmt()):
+        db.rollback()
+        return 0
+    post_ids = db.execute(flush_view_events_stmt()).scalars().all()
+    refresh_post_scores(db, post_ids)
+    db.commit()
+    if post_ids:
+        invalidate_feed()
+    return len(post_ids)
 
 # ---------------------------------------------------------
 # 게시글 상세 조회
 # ---------------------------------------------------------
 def get_post(db: Session, post_id: int, user_id: int | None = None):
-    post = db.query(Post).options(*get_post_options()).filter(Post.id == post_id).first()
+    post = db.scalars(post_stmt(post_id)).first()
     
     if not post:
         return None
 
-    map_post_info(post) # 🔥 매핑 적용
+    flags = db.execute(viewer_flags_stmt(post_id, user_id)).first() if user_id else None
+    return map_post_detail(post, flags)
 
-    if user_id:
-        like_record = db.query(PostLike).filter(PostLike.post_id == post_id, PostLike.user_id == user_id).first()
-        scrap_record = db.query(PostScrap).filter(PostScrap.post_id == post_id, PostScrap.user_id == user_id).first()
-        post.is_liked = True if like_record else False
-        post.is_scrapped = True if scrap_record else False
-    else:
-        post.is_liked = False
-        post.is_scrapped = False
-    
+def map_post_detail(post, flags):
+    post.is_liked, post.is_scrapped = flags if flags else (False, False)
     return post
 
+def get_post_version(db: Session, post_id: int, user_id: int | None = None):
+    """게시글이 없으면 None"""
+    row = db.execute(post_version_stmt(post_id, user_id)).first()
+    return tuple(row) if row else None
+
+def get_comments_version(db: Session, post_id: int):
+    return tuple(db.execute(comments_version_stmt(post_id)).one())
+
 # ---------------------------------------------------------
 # 댓글 작성
 # ---------------------------------------------------------
+def _add_comment_count(db: Session, post_id: int, delta: int):
+    """comment_count를 posts 행에서 원자적으로 증감 (_toggle과 같이 파이썬에서 읽고 쓰지 않음, 0 미만 방지)"""
+    posts = Post.__table__
+    db.execute(
+        update(posts)
+        .where(posts.c.id == post_id)
+        .values(comment_count=func.greatest(func.coalesce(posts.c.comment_count, 0) + delta, 0))
+    )
+
 def create_comment(db: Session, comment: CommentCreate, user_id: int):
     db_comment = Comment(
         content=comment.content,
         post_id=comment.post_id,
         parent_id=comment.parent_id, 
-        author_id=user_id
+        author_id=user_id,
+        author_nickname=author_nickname_expr(user_id),
+        author_university=author_university_expr(user_id),
+        search_vector=post_search.comment_vector(comment.content)
     )
     db.add(db_comment)
+    db.flush()
+
+    _add_comment_count(db, comment.post_id, 1)
+    refresh_post_score(db, comment.post_id)
 
-    post = db.query(Post).filter(Post.id == comment.post_id).first()
-    if post:
-        post.comment_count += 1
-        
     db.commit()
+    invalidate_feed()  # 목록의 comment_count
     db.refresh(db_comment)
     
-    # 🔥 작성 직후 응답을 위해 매핑
-    # (refresh를 했지만 author 관계가 즉시 로딩되지 않을 수 있으므로 조회 후 매핑이 안전)
-    map_comment_info(db_comment)
+    db_comment.reply_count = 0  # 방금 작성한 댓글이라 대댓글 없음
         
     return db_comment
 
@@ -198,104 +561,119 @@ def delete_comment(db: Session, comment_id: int, user_id: int):
     if not comment: return "not_found"
     if comment.author_id != user_id: return "not_authorized"
     
-    if comment.replies:
+    # 대댓글 컬렉션을 불러오지 않고 존재 여부만 확인
+    has_replies = db.scalar(select(exists().where(Comment.parent_id == comment.id)))
+    if has_replies:
         comment.is_deleted = True
         comment.content = "삭제된 댓글입니다." 
+        comment.search_vector = None
         db.commit()
     else:
-        if comment.post: comment.post.comment_count = max(0, comment.post.comment_count - 1)
+        _add_comment_count(db, comment.post_id, -1)
+        refresh_post_score(db, comment.post_id)
         db.delete(comment)
         db.commit()
+        invalidate_feed()
     return "success"
 
 # ---------------------------------------------------------
 # 댓글 목록 조회 
 # ---------------------------------------------------------
-def get_comments_by_post(db: Session, post_id: int, skip: int = 0, limit: int = 50):
-    comments = db.query(Comment)\
-        .options(
-            joinedload(Comment.author).joinedload(User.university_rel),
-            subqueryload(Comment.parent).subqueryload(Comment.replies) 
-        )\
-        .filter(Comment.post_id == post_id)\
-        .order_by(Comment.created_at.asc())\
-        .offset(skip).limit(limit).all()
-        
-    for comment in comments:
-        map_comment_info(comment)
-            
-    return comments
+def get_comments_by_post(db: Session, post_id: int, skip: int = 0, limit: int = 50, with_version: bool = False):
+    stmt = comments_by_post_stmt(post_id, skip, limit)
+    if with_version:
+        stmt = with_comments_version(stmt, post_id)
+    return db.execute(stmt).all()
+
+# ---------------------------------------------------------
+# 댓글 트리 조회 (재귀 CTE)
+# ---------------------------------------------------------
+def get_comment_thread(
+    db: Session,
+    post_id: int,
+    root_id: int | None = None,
+    max_depth: int = THREAD_MAX_DEPTH,
+    limit: int = THREAD_LIMIT,
+    with_version: bool = False,
+):
+    stmt = comment_thread_stmt(post_id, root_id, max_depth, limit)
+    if with_version:
+        stmt = with_comments_version(stmt, post_id)
+    return db.execute(stmt).all()
 
 # ---------------------------------------------------------
 # 내가 쓴 댓글 조회
 # ---------------------------------------------------------
-def get_comments_by_author(db: Session, user_id: int, skip: int = 0, limit: int = 50):
-    comments = db.query(Comment)\
-        .options(
-            joinedload(Comment.post),
-            subqueryload(Comment.replies) 
-        ) \
-        .filter(Comment.author_id == user_id)\
-        .order_by(Comment.created_at.desc())\
-        .offset(skip).limit(limit).all()
-        
-    for comment in comments:
-        if comment.post:
-            comment.post_title = comment.post.title
-        else:
-            comment.post_title = "삭제된 게시글입니다."
-        
-        map_comment_info(comment)
-            
-    return comments
+def get_comments_by_author(db: Session, user_id: int, skip: int = 0, limit: int = 50, after: Cursor | None = None):
+    return db.execute(comments_by_author_stmt(user_id, skip, limit, after)).all()
 
 # ---------------------------------------------------------
-# 좋아요/스크랩 토글 (기존 동일)
+# 좋아요/스크랩 토글
 # ---------------------------------------------------------
+def _toggle(db: Session, model, counter: str, post_id: int, user_id: int):
+    """
+    연관 테이블 토글 + 카운터 증감을 한 문장(CTE)으로 처리
+    - 이미 있으면 DELETE, 없으면 INSERT ... ON CONFLICT DO NOTHING
+    - 카운터는 posts 행에서 원자적으로 증감 (파이썬에서 읽고 쓰지 않음)
+    반환: (삭제 여부, 변경 후 카운트) / 게시글이 없으면 None
+    """
+    table = model.__table__
+    posts = Post.__table__
+
+    removed = delete(table)\
+        .where(table.c.post_id == post_id, table.c.user_id == user_id)\
+        .returning(table.c.post_id).cte("removed")
+    added = insert(table)\
+        .from_select(
+            ["user_id", "post_id"],
+            select(literal(user_id), literal(post_id)).where(
+                ~exists(select(removed.c.post_id)),
+                exists(select(posts.c.id).where(posts.c.id == post_id))
+            )
+        )\
+        .on_conflict_do_nothing()\
+        .returning(table.c.post_id).cte("added")
+
+    removed_count = select(func.count()).select_from(removed).scalar_subquery()
+    added_count = select(func.count()).select_from(added).scalar_subquery()
+    stmt = update(posts)\
+        .where(posts.c.id == post_id)\
+        .values({counter: func.coalesce(posts.c[counter], 0) + added_count - removed_count})\
+        .returning(removed_count > 0, posts.c[counter])
+
+    return db.execute(stmt).first()
+
 def toggle_like(db: Session, post_id: int, user_id: int):
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if not post: return None
-    existing_like = db.query(PostLike).filter(PostLike.post_id == post_id, PostLike.user_id == user_id).first()
-    if existing_like:
-        db.delete(existing_like)
-        post.like_count -= 1
-        action = "unliked"
-    else:
-        new_like = PostLike(post_id=post_id, user_id=user_id)
-        db.add(new_like)
-        post.like_count += 1
-        action = "liked"
+    row = _toggle(db, PostLike, "like_count", post_id, user_id)
+    if row is None:
+        db.rollback()
+        return None
+    was_removed, count = row
+    refresh_post_score(db, post_id)
     db.commit()
-    return {"action": action, "count": post.like_count}
+    invalidate_feed()
+    return {"action": "unliked" if was_removed else "liked", "count": count}
 
 def toggle_scrap(db: Session, post_id: int, user_id: int):
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if not post: return None
-    existing_scrap = db.query(PostScrap).filter(PostScrap.post_id == post_id, PostScrap.user_id == user_id).first()
-    if existing_scrap:
-        db.delete(existing_scrap)
-        post.scrap_count -= 1
-        action = "unscrapped"
-    else:
-        new_scrap = PostScrap(post_id=post_id, user_id=user_id)
-        db.add(new_scrap)
-        post.scrap_count += 1
-        action = "scrapped"
+    row = _toggle(db, PostScrap, "scrap_count", post_id, user_id)
+    if row is None:
+        db.rollback()
+        return None
+    was_removed, count = row
     db.commit()
-    return {"action": action, "count": post.scrap_count}
+    invalidate_feed()
+    return {"action": "unscrapped" if was_removed else "scrapped", "count": count}
 
 # ---------------------------------------------------------
 # 내가 쓴 글 조회
 # ---------------------------------------------------------
-def get_my_posts(db: Session, user_id: int, skip: int = 0, limit: int = 10):
-    posts = db.query(Post).options(*get_post_options()).filter(Post.author_id == user_id).order_by(Post.created_at.desc()).offset(skip).limit(limit).all()
-    for post in posts: map_post_info(post)
-    return posts
+def get_my_posts(db: Session, user_id: int, skip: int = 0, limit: int = 10, after: Cursor | None = None, full: bool = False):
+    result = db.execute(my_posts_stmt(user_id, skip, limit, after, full))
+    return result.scalars().all() if full else result.all()
 
 # ---------------------------------------------------------
 # 내가 스크랩한 글 조회
 # ---------------------------------------------------------
-def get_my_scraps(db: Session, user_id: int, skip: int = 0, limit: int = 10):
-    posts = db.query(Post).join(PostScrap, Post.id == PostScrap.post_id).options(*get_post_options()).filter(PostScrap.user_id == user_id).order_by(Post.created_at.desc()).offset(skip).limit(limit).all()
-    for post in posts: map_post_info(post)
-    return posts
\ No newline at end of file
+def get_my_scraps(db: Session, user_id: int, skip: int = 0, limit: int = 10, after: Cursor | None = None, full: bool = False):
+    result = db.execute(my_scraps_stmt(user_id, skip, limit, after, full))
+    return result.scalars().all() if full else result.all()
\ No newline at end of file
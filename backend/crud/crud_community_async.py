@@ -0,0 +1,138 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.community import PostLike, PostScrap, PostViewEvent
+from core.pagination import Cursor
+from core.feed_cache import invalidate_feed
+from crud.crud_community import (
+    best_posts_stmt, posts_stmt, post_stmt, viewer_flags_stmt, post_version_stmt, comments_version_stmt,
+    with_comments_version, comments_version, COMMENTS_VERSION_COLUMNS,
+    comments_by_post_stmt, comments_by_author_stmt, comment_thread_stmt, my_posts_stmt, my_scraps_stmt,
+    posts_by_ids_stmt, viewer_post_ids_stmt, order_by_ids, apply_viewer_flags,
+    map_post_detail, post_version,
+    view_flush_trigger, view_flush_lock_stmt, flush_view_events_stmt, post_scores_upsert_stmt,
+    THREAD_MAX_DEPTH, THREAD_LIMIT,
+)
+
+# ---------------------------------------------------------
+# crud_community의 조회 함수 async 버전 (AsyncSession + asyncpg)
+# ---------------------------------------------------------
+# 쿼리는 crud_community의 *_stmt를 그대로 쓰고, 실행만 await 한다.
+# 쓰기(작성/수정/토글)는 아직 sync 경로만 있다.
+
+# ---------------------------------------------------------
+# 인기글 조회
+# ---------------------------------------------------------
+async def get_best_posts(db: AsyncSession, skip: int = 0, limit: int = 5):
+    return (await db.execute(best_posts_stmt(skip, limit))).all()
+
+# ---------------------------------------------------------
+# 게시글 목록 조회
+# ---------------------------------------------------------
+async def get_posts(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    category: str = None,
+    search: str = None,
+    after: Cursor | None = None,
+):
+    stmt = posts_stmt(skip, limit, category, search, after)
+    if stmt is None:
+        return []
+    return (await db.execute(stmt)).all()
+
+# ---------------------------------------------------------
+# 여러 게시글 / 조회자 좋아요·스크랩 여부
+# ---------------------------------------------------------
+async def get_posts_by_ids(db: AsyncSession, post_ids: list[int]):
+    return order_by_ids((await db.execute(posts_by_ids_stmt(post_ids))).all(), post_ids)
+
+async def get_viewer_flags(db: AsyncSession, post_ids: list[int], user_id: int):
+    if not post_ids:
+        return set(), set()
+    liked = set(await db.scalars(viewer_post_ids_stmt(PostLike, post_ids, user_id)))
+    scrapped = set(await db.scalars(viewer_post_ids_stmt(PostScrap, post_ids, user_id)))
+    return liked, scrapped
+
+# ---------------------------------------------------------
+# 조회수 기록
+# ---------------------------------------------------------
+async def record_view(db: AsyncSession, post_id: int):
+    db.add(PostViewEvent(post_id=post_id))
+    await db.commit()
+    if view_flush_trigger.record():
+        await flush_view_events(db)
+
+async def flush_view_events(db: AsyncSession):
+    """crud_community.flush_view_events의 async 버전 (같은 advisory lock)"""
+    if not await db.scalar(view_flush_lock_stmt()):
+        await db.rollback()
+        return 0
+    post_ids = (await db.execute(flush_view_events_stmt())).scalars().all()
+    if post_ids:
+        await db.execute(post_scores_upsert_stmt(post_ids))
+    await db.commit()
+    if post_ids:
+        # redis 피드 캐시는 sync 클라이언트라 이벤트 루프 밖에서
+        await asyncio.to_thread(invalidate_feed)
+    return len(post_ids)
+
+# ---------------------------------------------------------
+# 게시글 상세 조회
+# ---------------------------------------------------------
+async def get_post(db: AsyncSession, post_id: int, user_id: int | None = None):
+    post = (await db.scalars(post_stmt(post_id))).first()
+
+    if not post:
+        return None
+
+    flags = (await db.execute(viewer_flags_stmt(post_id, user_id))).first() if user_id else None
+    return map_post_detail(post, flags)
+
+async def get_post_version(db: AsyncSession, post_id: int, user_id: int | None = None):
+    row = (await db.execute(post_version_stmt(post_id, user_id))).first()
+    return tuple(row) if row else None
+
+async def get_comments_version(db: AsyncSession, post_id: int):
+    return tuple((await db.execute(comments_version_stmt(post_id))).one())
+
+# ---------------------------------------------------------
+# 댓글 목록 조회
+# ---------------------------------------------------------
+async def get_comments_by_post(db: AsyncSession, post_id: int, skip: int = 0, limit: int = 50, with_version: bool = False):
+    stmt = comments_by_post_stmt(post_id, skip, limit)
+    if with_version:
+        stmt = with_comments_version(stmt, post_id)
+    return (await db.execute(stmt)).all()
+
+# ---------------------------------------------------------
+# 댓글 트리 조회 (재귀 CTE)
+# ---------------------------------------------------------
+async def get_comment_thread(
+    db: AsyncSession,
+    post_id: int,
+    root_id: int | None = None,
+    max_depth: int = THREAD_MAX_DEPTH,
+    limit: int = THREAD_LIMIT,
+    with_version: bool = False,
+):
+    stmt = comment_thread_stmt(post_id, root_id, max_depth, limit)
+    if with_version:
+        stmt = with_comments_version(stmt, post_id)
+    return (await db.execute(stmt)).all()
+
+# ---------------------------------------------------------
+# 내가 쓴 댓글 조회
+# ---------------------------------------------------------
+async def get_comments_by_author(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 50, after: Cursor | None = None):
+    return (await db.execute(comments_by_author_stmt(user_id, skip, limit, after))).all()
+
+# ---------------------------------------------------------
+# 내가 쓴 글 / 스크랩한 글 조회
+# ---------------------------------------------------------
+async def get_my_posts(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 10, after: Cursor | None = None):
+    return (await db.execute(my_posts_stmt(user_id, skip, limit, after))).all()
+
+async def get_my_scraps(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 10, after: Cursor | None = None):
+    return (await db.execute(my_scraps_stmt(user_id, skip, limit, after))).all()
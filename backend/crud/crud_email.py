@@ -0,0 +1,123 @@
+from datetime import timedelta
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+from models.email import OutboundEmail
+
+# ---------------------------------------------------------
+# 메일 큐 적재
+# ---------------------------------------------------------
+def enqueue_email(db: Session, to_email: str, subject: str, html_body: str):
+    """
+    발송 대기열에 추가 (커밋은 호출한 쪽에서)
+    - 인증 기록 저장과 같은 트랜잭션으로 커밋되므로 코드만 저장되고 메일이 유실되는 일이 없음
+    """
+    email = OutboundEmail(to_email=to_email, subject=subject, html_body=html_body)
+    db.add(email)
+    return email
+
+# ---------------------------------------------------------
+# 발송할 메일 가져오기
+# ---------------------------------------------------------
+def claim_emails(db: Session, limit: int, lease: timedelta):
+    """
+    발송 시각이 된 메일을 최대 limit개 점유하고 (id, to_email, subject, html_body, attempts) 행으로 반환
+    - FOR UPDATE SKIP LOCKED: 여러 발송기가 동시에 돌아도 같은 메일을 가져가지 않음
+    - 점유한 메일은 lease 동안 다시 가져가지 않고, 발송기가 죽으면 lease 후 재시도됨
+    """
+    due = select(OutboundEmail.id)\
+        .where(
+            OutboundEmail.status.in_(("pending", "sending")),
+            OutboundEmail.next_attempt_at <= func.now()
+        )\
+        .order_by(OutboundEmail.id)\
+        .limit(limit)\
+        .with_for_update(skip_locked=True)
+    stmt = update(OutboundEmail)\
+        .where(OutboundEmail.id.in_(due.scalar_subquery()))\
+        .values(
+            status="sending",
+            attempts=OutboundEmail.attempts + 1,
+            next_attempt_at=func.now() + lease
+        )\
+        .returning(
+            OutboundEmail.id, OutboundEmail.to_email, OutboundEmail.subject,
+            OutboundEmail.html_body, OutboundEmail.attempts
+        )\
+        .execution_options(synchronize_session=False)
+    # 커밋 후에도 쓸 수 있도록 ORM 객체가 아닌 행으로 받음
+    emails = db.execute(stmt).all()
+    db.commit()
+    return sorted(emails, key=lambda email: email.id)
+
+# ---------------------------------------------------------
+# 발송 결과 기록
+# ---------------------------------------------------------
+def mark_sent(db: Session, email_ids: list[int]):
+    if not email_ids:
+        return
+    db.execute(
+        update(OutboundEmail)
+        .where(OutboundEmail.id.in_(email_ids))
+        .values(status="sent", sent_at=func.now(), last_error=None)
+        .execution_options(synchronize_session=False)
+    )
+
+def release_emails(db: Session, email_ids: list[int], error: str, retry_after: timedelta):
+    """
+    점유했지만 보내보지 못한 메일(앞 메일에서 서버 연결 실패)을 retry_after 뒤로 되돌림
+    - claim_emails가 올린 attempts를 되돌려 시도 횟수/재시도 간격/failed 판정에 넣지 않음
+    """
+    if not email_ids:
+        return
+    db.execute(
+        update(OutboundEmail)
+        .where(OutboundEmail.id.in_(email_ids))
+        .values(
+            status="pending",
+            attempts=OutboundEmail.attempts - 1,
+            last_error=error[:1000],
+            next_attempt_at=func.now() + retry_after
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+def mark_failed(db: Session, email_id: int, error: str, retry_after: timedelta | None):
+    """retry_after가 None이면 더 이상 재시도하지 않음(failed)"""
+    values = {"last_error": error[:1000]}
+    if retry_after is None:
+        values["status"] = "failed"
+    else:
+        values["status"] = "pending"
+        values["next_attempt_at"] = func.now() + retry_after
+    db.execute(
+        update(OutboundEmail)
+        .where(OutboundEmail.id == email_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+# ---------------------------------------------------------
+# 보낸 메일 정리
+# ---------------------------------------------------------
+PURGE_BATCH_SIZE = 1000
+
+def purge_sent_emails(db: Session, retention: timedelta, batch_size: int = PURGE_BATCH_SIZE):
+    """
+    보낸 지 retention이 지난 메일을 batch_size개씩 삭제 (스케줄러에서 호출)
+    - 본문(인증코드)이 큐에 계속 쌓이지 않도록 한다. failed는 원인 확인용으로 남김
+    """
+    total = 0
+    while True:
+        expired = select(OutboundEmail.id)\
+            .where(OutboundEmail.status == "sent", OutboundEmail.sent_at < func.now() - retention)\
+            .limit(batch_size)\
+            .with_for_update(skip_locked=True)
+        deleted = db.execute(
+            delete(OutboundEmail)
+            .where(OutboundEmail.id.in_(expired.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        total += deleted
+        if deleted < batch_size:
+            return total
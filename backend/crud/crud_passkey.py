@@ -0,0 +1,44 @@
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.orm import Session
+from models.passkey import Passkey
+from models.user import User
+
+# ---------------------------------------------------------
+# 패스키 로그인
+# ---------------------------------------------------------
+def passkey_login_stmt(username: str, credential_id: str):
+    """
+    유저와 (그 유저의) 해당 credential을 한 번에 조회
+    - credential_id 유니크 인덱스로 찾고, 다른 유저의 credential이면 passkey_id가 NULL
+    - 토큰 발급에 필요한 유저 컬럼만 (core.security.token_claims)
+    """
+    return select(
+        User.id,
+        User.is_active,
+        User.is_student_verified,
+        User.university_id,
+        Passkey.id.label("passkey_id"),
+        Passkey.public_key,
+        Passkey.sign_count,
+    ).outerjoin(
+        Passkey, and_(Passkey.user_id == User.id, Passkey.credential_id == credential_id)
+    ).where(User.username == username)
+
+
+def get_passkey_login(db: Session, username: str, credential_id: str):
+    """유저가 없으면 None, credential이 그 유저 것이 아니면 passkey_id가 None인 행"""
+    return db.execute(passkey_login_stmt(username, credential_id)).first()
+
+
+def advance_sign_count(db: Session, passkey_id: int, new_sign_count: int) -> bool:
+    """
+    저장된 값보다 클 때만 갱신 (커밋은 호출한 쪽에서)
+    - 같은 카운터로 동시에 들어온 로그인 중 하나만 성공 (복제된 인증기/재전송 방지)
+    """
+    result = db.execute(
+        update(Passkey)
+        .where(Passkey.id == passkey_id, func.coalesce(Passkey.sign_count, 0) < new_sign_count)
+        .values(sign_count=new_sign_count)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
@@ -0,0 +1,77 @@
+from typing import Iterable, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from models.user import University
+
+# ---------------------------------------------------------
+# 학교 (core.university_directory의 DB 쪽)
+# ---------------------------------------------------------
+# universities.name, domain이 각각 유니크라 학교당 도메인은 하나만 저장된다.
+# 같은 학교의 다른 도메인(예: skku.ac.kr / skku.edu)은 UNIVERSITY_MAP이 이름으로 이어 준다.
+IMPORT_BATCH_SIZE = 500
+
+def directory_rows_stmt():
+    return select(University.id, University.name, University.domain)
+
+
+def upsert_university_stmt(name: str, domain: str):
+    """
+    없으면 추가하고 id 반환
+    - 이름 또는 도메인이 이미 있으면 아무것도 하지 않고 행도 반환하지 않는다 (get_university_id로 조회)
+    """
+    return insert(University)\
+        .values(name=name, domain=domain)\
+        .on_conflict_do_nothing()\
+        .returning(University.id)
+
+
+def get_university_id(db: Session, name: str, domain: str) -> Optional[int]:
+    return db.scalar(
+        select(University.id)
+        .where((University.name == name) | (University.domain == domain))
+        .order_by((University.name == name).desc())
+        .limit(1)
+    )
+
+
+def ensure_university(db: Session, name: str, domain: str) -> int:
+    """학교 id (없으면 추가, 커밋은 호출한 쪽에서)"""
+    university_id = db.scalar(upsert_university_stmt(name, domain))
+    if university_id is None:
+        university_id = get_university_id(db, name, domain)
+    return university_id
+
+
+def import_universities(db: Session, rows: Iterable[tuple[str, str]]) -> int:
+    """
+    (domain, name) 목록을 IMPORT_BATCH_SIZE개씩 추가하고 새로 추가된 수 반환
+    - 이미 있는 이름/도메인은 건너뛴다 (기존 id와 유저 연결 유지)
+    """
+    inserted = 0
+    batch = []
+    for domain, name in rows:
+        batch.append({"name": name, "domain": domain})
+        if len(batch) == IMPORT_BATCH_SIZE:
+            inserted += _insert_batch(db, batch)
+            batch = []
+    if batch:
+        inserted += _insert_batch(db, batch)
+    return inserted
+
+
+def _insert_batch(db: Session, batch: list[dict]) -> int:
+    ids = db.scalars(insert(University).values(batch).on_conflict_do_nothing().returning(University.id)).all()
+    db.commit()
+    return len(ids)
+
+
+# 이름/도메인이 바뀌거나 삭제되면 이 프로세스의 학교 인덱스를 다시 읽는다
+# (다른 인스턴스는 UNIVERSITY_DIRECTORY_TTL_SECONDS가 지나야 반영)
+@event.listens_for(University, "after_update")
+@event.listens_for(University, "after_delete")
+def _invalidate_directory(mapper, connection, target):
+    from core.university_directory import invalidate_directory
+
+    invalidate_directory()
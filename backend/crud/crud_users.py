@@ -1,7 +1,10 @@
-from sqlalchemy.orm import Session
-from models.user import User
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session, joinedload, make_transient_to_detached
+from models.user import User, University
 from schemas.user import UserCreate
 from core.security import get_password_hash
+from core.cache import TTLCache
+from core.config import settings
 
 # 유저 조회 (username으로) - 중복 가입 방지용
 def get_user_by_username(db: Session, username: str):
@@ -15,10 +18,67 @@ def get_user_by_email(db: Session, email: str):
 def get_user(db: Session, user_id: int):
     return db.query(User).filter(User.id == user_id).first()
 
+# ---------------------------------------------------------
+# 로그인 유저 캐시 (get_current_user 용)
+# ---------------------------------------------------------
+# ORM 객체는 세션에 묶여 있으므로 컬럼 값만 저장하고,
+# 꺼낼 때 detached 객체로 복원해 요청 세션에 붙인다 (SELECT 없이 수정/커밋 가능).
+_user_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+def _columns(obj) -> dict:
+    return {c.key: getattr(obj, c.key) for c in obj.__table__.columns}
+
+def _restore(db: Session, snapshot: dict) -> User:
+    user = User(**snapshot["user"])
+    if snapshot["university"]:
+        university = University(**snapshot["university"])
+        make_transient_to_detached(university)
+        user.university_rel = university
+    make_transient_to_detached(user)
+    db.add(user)
+    return user
+
+def cached_user(db: Session, user_id: int):
+    """캐시에 있으면 요청 세션에 붙인 User, 없으면 None (sync/async 공용)"""
+    if settings.USER_CACHE_TTL_SECONDS <= 0:
+        return None
+    snapshot = _user_cache.get(user_id)
+    return _restore(db, snapshot) if snapshot is not None else None
+
+def remember_user(user):
+    if user and settings.USER_CACHE_TTL_SECONDS > 0:
+        _user_cache.set(user.id, {
+            "user": _columns(user),
+            "university": _columns(user.university_rel) if user.university_rel else None,
+        })
+
+def user_with_university_stmt(user_id: int):
+    return select(User).options(joinedload(User.university_rel)).where(User.id == user_id)
+
+def get_user_cached(db: Session, user_id: int):
+    user = cached_user(db, user_id)
+    if user is not None:
+        return user
+
+    user = db.scalars(user_with_university_stmt(user_id)).first()
+    remember_user(user)
+    return user
+
+def invalidate_user(user_id: int):
+    _user_cache.delete(user_id)
+
+# 프로필/학교 인증 등 유저 정보가 바뀌면 캐시 제거
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper, connection, target):
+    invalidate_user(target.id)
+
 # 유저 생성 (회원가입)
-def create_user(db: Session, user: UserCreate):
+def create_user(db: Session, user: UserCreate, hashed_password: str | None = None):
     # 비밀번호 암호화 (passkey 전용 유저는 password가 None)
-    hashed_password = get_password_hash(user.password) if user.password else None
+    # - API는 core.passwords 풀에서 미리 해시해서 넘긴다
+    if hashed_password is None and user.password:
+        hashed_password = get_password_hash(user.password)
     
     db_user = User(
         username=user.username,
@@ -31,4 +91,18 @@ def create_user(db: Session, user: UserCreate):
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
-    return db_user
\ No newline at end of file
+    return db_user
+
+# 로그인용 유저 조회
+# - 비밀번호 검증(수백 ms) 동안 커넥션을 잡고 있지 않도록 세션을 닫아 풀에 돌려준다.
+#   (반환된 user는 로드된 값을 그대로 가진 detached 객체)
+def get_login_user(db: Session, username: str):
+    user = get_user_by_username(db, username)
+    db.close()
+    return user
+
+# 로그인 시 재해시된 비밀번호 저장 (비용/알고리즘 변경 반영)
+def update_password_hash(db: Session, user_id: int, hashed_password: str):
+    db.execute(update(User).where(User.id == user_id).values(password=hashed_password))
+    db.commit()
+    invalidate_user(user_id)
@@ -0,0 +1,32 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.user import User
+from crud.crud_users import cached_user, remember_user, user_with_university_stmt
+
+# ---------------------------------------------------------
+# crud_users의 조회 함수 async 버전
+# ---------------------------------------------------------
+# 로그인 유저 캐시는 sync 경로와 같은 캐시를 공유한다.
+
+# 유저 조회 (username으로)
+async def get_user_by_username(db: AsyncSession, username: str):
+    return (await db.scalars(select(User).where(User.username == username))).first()
+
+# 유저 조회 (email로)
+async def get_user_by_email(db: AsyncSession, email: str):
+    return (await db.scalars(select(User).where(User.email == email))).first()
+
+# 유저 조회 (ID로)
+async def get_user(db: AsyncSession, user_id: int):
+    return await db.get(User, user_id)
+
+# 로그인 유저 조회 (캐시 → 없으면 SELECT)
+async def get_user_cached(db: AsyncSession, user_id: int):
+    # AsyncSession.add는 내부 sync 세션에 그대로 위임되므로 캐시 복원 로직을 공유할 수 있다
+    user = cached_user(db, user_id)
+    if user is not None:
+        return user
+
+    user = (await db.scalars(user_with_university_stmt(user_id))).first()
+    remember_user(user)
+    return user
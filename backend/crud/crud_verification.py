@@ -0,0 +1,157 @@
+import secrets
+from datetime import timedelta
+from sqlalchemy import case, delete, func, select, true, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from models.user import EmailVerification
+from core.config import settings
+
+# ---------------------------------------------------------
+# 이메일 인증 코드 저장소
+# ---------------------------------------------------------
+# - (email, purpose)당 한 행. 발송/검증은 각각 SQL 한 번으로 처리한다.
+# - 만료는 조회 시점에 확인하고, 지난 행은 스케줄러(purge_expired_verifications)가 나눠서 지운다.
+# - 발송 제한: 재발송 간격(EMAIL_CODE_RESEND_SECONDS), 1시간당 발송 횟수(EMAIL_CODE_MAX_SENDS_PER_HOUR)
+# - 입력 제한: 코드당 틀린 입력 EMAIL_CODE_MAX_ATTEMPTS회 (새 코드를 받으면 초기화)
+
+SEND_WINDOW = timedelta(hours=1)
+PURGE_BATCH_SIZE = 1000
+
+
+def new_code() -> str:
+    """6자리 숫자 코드"""
+    return f"{secrets.randbelow(900000) + 100000}"
+
+
+def issue_code_stmt(email: str, purpose: str, code: str):
+    """
+    코드 발송 기록 upsert
+    - 발송 제한에 걸리면 갱신하지 않으므로 RETURNING 행이 없다.
+    """
+    ttl = timedelta(seconds=settings.EMAIL_CODE_TTL_SECONDS)
+    resend = timedelta(seconds=settings.EMAIL_CODE_RESEND_SECONDS)
+    stmt = insert(EmailVerification).values(
+        email=email,
+        purpose=purpose,
+        code=code,
+        is_verified=False,
+        sent_at=func.now(),
+        expires_at=func.now() + ttl,
+        attempts=0,
+        send_count=1,
+        window_started_at=func.now(),
+    )
+    window_over = EmailVerification.window_started_at <= func.now() - SEND_WINDOW
+    return stmt.on_conflict_do_update(
+        index_elements=[EmailVerification.email, EmailVerification.purpose],
+        set_={
+            "code": stmt.excluded.code,
+            "is_verified": False,
+            "sent_at": stmt.excluded.sent_at,
+            "expires_at": stmt.excluded.expires_at,
+            "attempts": 0,
+            "send_count": case((window_over, 1), else_=EmailVerification.send_count + 1),
+            "window_started_at": case((window_over, func.now()), else_=EmailVerification.window_started_at),
+        },
+        where=(EmailVerification.sent_at <= func.now() - resend)
+        & (window_over | (EmailVerification.send_count < settings.EMAIL_CODE_MAX_SENDS_PER_HOUR)),
+    ).returning(EmailVerification.id)
+
+
+def issue_code(db: Session, email: str, purpose: str) -> str | None:
+    """
+    새 코드를 저장하고 반환 (커밋은 호출한 쪽에서 - 메일 큐 적재와 같은 트랜잭션)
+    발송 제한에 걸리면 None
+    """
+    code = new_code()
+    if db.execute(issue_code_stmt(email, purpose, code)).first() is None:
+        return None
+    return code
+
+
+def verify_code_stmt(email: str, purpose: str, code: str):
+    """
+    (live, attempts, matched) 한 행
+    - 만료 전이고 시도 횟수가 남아 있을 때만 시도 횟수/인증 여부를 갱신한다.
+    - attempts는 갱신 전 값, matched는 갱신하지 않았으면 NULL
+    """
+    target = select(
+        EmailVerification.id,
+        (EmailVerification.expires_at > func.now()).label("live"),
+        EmailVerification.attempts,
+    ).where(
+        EmailVerification.email == email,
+        EmailVerification.purpose == purpose,
+    ).with_for_update().cte("target")
+
+    matched = EmailVerification.code == code
+    attempt = update(EmailVerification)\
+        .where(
+            EmailVerification.id == target.c.id,
+            target.c.live,
+            target.c.attempts < settings.EMAIL_CODE_MAX_ATTEMPTS,
+        )\
+        .values(
+            attempts=EmailVerification.attempts + case((matched, 0), else_=1),
+            is_verified=EmailVerification.is_verified | matched,
+        )\
+        .returning(matched.label("matched"))\
+        .cte("attempt")
+
+    return select(target.c.live, target.c.attempts, attempt.c.matched)\
+        .select_from(target.outerjoin(attempt, true()))
+
+
+def verify_code(db: Session, email: str, purpose: str, code: str) -> str:
+    """
+    "verified" | "mismatch" | "not_found" | "expired" | "too_many_attempts"
+    틀린 입력도 횟수에 남아야 하므로 여기서 커밋한다.
+    """
+    row = db.execute(verify_code_stmt(email, purpose, code)).first()
+    db.commit()
+    if row is None:
+        return "not_found"
+    if not row.live:
+        return "expired"
+    if row.matched is None:
+        return "too_many_attempts"
+    return "verified" if row.matched else "mismatch"
+
+
+def delete_code(db: Session, email: str, purpose: str):
+    """사용한 코드 삭제 (커밋은 호출한 쪽에서)"""
+    db.execute(
+        delete(EmailVerification)
+        .where(EmailVerification.email == email, EmailVerification.purpose == purpose)
+    )
+
+
+# ---------------------------------------------------------
+# 만료된 코드 정리 (스케줄러에서 호출)
+# ---------------------------------------------------------
+def purge_expired_stmt(batch_size: int = PURGE_BATCH_SIZE):
+    """
+    만료됐고 발송 제한 구간도 끝난 행을 최대 batch_size개 삭제
+    (발송 횟수 기록이 지워져 제한이 풀리지 않도록 구간이 끝날 때까지 남겨둔다)
+    """
+    expired = select(EmailVerification.id)\
+        .where(
+            EmailVerification.expires_at < func.now(),
+            EmailVerification.window_started_at < func.now() - SEND_WINDOW,
+        )\
+        .limit(batch_size)\
+        .with_for_update(skip_locked=True)
+    return delete(EmailVerification)\
+        .where(EmailVerification.id.in_(expired.scalar_subquery()))\
+        .execution_options(synchronize_session=False)
+
+
+def purge_expired_verifications(db: Session, batch_size: int = PURGE_BATCH_SIZE):
+    """batch_size개씩 나눠 지워 한 트랜잭션이 오래 잠그지 않도록 한다"""
+    total = 0
+    while True:
+        deleted = db.execute(purge_expired_stmt(batch_size)).rowcount
+        db.commit()
+        total += deleted
+        if deleted < batch_size:
+            return total
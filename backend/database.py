@@ -1,19 +1,82 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, exc
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
+import time
+import uuid
 from dotenv import load_dotenv
-from sqlalchemy.pool import NullPool
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool, QueuePool
 
 load_dotenv()
 
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    pool_pre_ping=True,  
-    poolclass=NullPool 
-)
+# ---------------------------------------------------------
+# 커넥션 전략 (DB_POOL_MODE)
+# ---------------------------------------------------------
+# - persistent : 웜 인스턴스에서 커넥션을 재사용 (기본값, Lambda 인스턴스당 1개)
+# - pgbouncer  : 외부 풀러(transaction 모드, Supabase 6543 포트 등) 앞에서 재사용.
+#                세션 상태에 의존하지 않고, prepared statement를 쓰지 않는다.
+# - null       : 요청마다 새로 연결 (이전 동작)
+DB_POOL_MODE = os.getenv("DB_POOL_MODE", "persistent")
+# uvicorn에서 sync 라우터를 쓸 때는 DB_POOL_SIZE + DB_MAX_OVERFLOW >= 동시 요청 수로 잡는다.
+# (응답 직렬화도 스레드풀에서 돌기 때문에, 커넥션을 쥔 요청이 스레드를 기다리고
+#  스레드는 커넥션을 기다리며 pool timeout까지 멈출 수 있음. async 라우터는 해당 없음)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 1))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 2))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))      # 초, 서버/풀러 idle timeout보다 짧게
+DB_PING_AFTER_IDLE = float(os.getenv("DB_PING_AFTER_IDLE", 30))  # 초, 이보다 오래 쉰 커넥션만 ping
+
+
+def engine_options(mode: str = DB_POOL_MODE) -> dict:
+    if mode == "null":
+        return {"poolclass": NullPool, "pool_pre_ping": True}
+    if mode not in ("persistent", "pgbouncer"):
+        raise ValueError(f"Unknown DB_POOL_MODE: {mode}")
+    return {
+        "poolclass": QueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+
+
+def install_idle_ping(engine, ping_after: float = DB_PING_AFTER_IDLE):
+    """
+    재사용 커넥션 헬스체크
+    - 매 요청 pre_ping(SELECT 1) 대신, 일정 시간 쉰 커넥션(Lambda freeze 후 등)만 확인
+    - 끊어졌으면 DisconnectionError → 풀이 새 커넥션으로 다시 시도
+    """
+    @event.listens_for(engine, "checkin")
+    def _mark_idle(dbapi_connection, connection_record):
+        connection_record.info["idle_since"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        idle_since = connection_record.info.get("idle_since")
+        if idle_since is None or time.monotonic() - idle_since < ping_after:
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        except Exception:
+            raise exc.DisconnectionError()
+        finally:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+
+
+def build_engine(url: str = SQLALCHEMY_DATABASE_URL, mode: str = DB_POOL_MODE):
+    engine = create_engine(url, **engine_options(mode))
+    if mode != "null":
+        install_idle_ping(engine)
+    return engine
+
+
+engine = build_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -25,5 +88,81 @@ def get_db():
     finally:
         db.close()
 
+# ---------------------------------------------------------
+# 비동기 엔진 (asyncpg) - async 라우터 전용
+# ---------------------------------------------------------
+# - 첫 사용 시 생성하므로 sync 라우터만 쓰는 배포(Lambda)는 asyncpg를 import하지 않는다.
+# - Mangum은 호출마다 새 이벤트 루프를 만들고, asyncpg 커넥션은 루프에 묶이므로
+#   Lambda에서는 풀을 쓰지 않는다(null). uvicorn 등 루프가 유지되는 환경은 DB_POOL_MODE를 따른다.
+DB_ASYNC_POOL_MODE = os.getenv(
+    "DB_ASYNC_POOL_MODE",
+    "null" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else DB_POOL_MODE
+)
+
+_async_engine = None
+_async_sessionmaker = None
+
+
+def async_engine_args(url: str, mode: str = DB_ASYNC_POOL_MODE):
+    """postgresql:// URL을 asyncpg용으로 바꾸고 (url, create_async_engine 옵션)을 반환"""
+    url = make_url(url)
+    if url.drivername in ("postgres", "postgresql", "postgresql+psycopg2"):
+        url = url.set(drivername="postgresql+asyncpg")
 
+    connect_args = {}
+    # libpq의 sslmode는 asyncpg에서 ssl 인자로 전달
+    sslmode = url.query.get("sslmode")
+    if sslmode:
+        url = url.difference_update_query(["sslmode"])
+        connect_args["ssl"] = sslmode
+    if mode == "pgbouncer":
+        # transaction 모드 풀러 뒤에서는 prepared statement 캐시를 끄고 이름 충돌을 피한다
+        connect_args.update({
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        })
 
+    options = engine_options(mode)
+    if mode == "null":
+        options = {"poolclass": NullPool}  # 매번 새 커넥션이라 pre_ping 불필요
+    else:
+        options.pop("poolclass")  # 기본값(AsyncAdaptedQueuePool) 사용
+    return url, {**options, "connect_args": connect_args}
+
+
+def build_async_engine(url: str = SQLALCHEMY_DATABASE_URL, mode: str = DB_ASYNC_POOL_MODE):
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url, options = async_engine_args(url, mode)
+    engine = create_async_engine(url, **options)
+    if mode != "null":
+        install_idle_ping(engine.sync_engine)
+    return engine
+
+
+def get_async_engine():
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = build_async_engine()
+    return _async_engine
+
+
+def AsyncSessionLocal():
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        # 커밋 후 속성 재조회(lazy load)가 async에서는 불가하므로 expire_on_commit=False
+        _async_sessionmaker = async_sessionmaker(
+            bind=get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _async_sessionmaker()
+
+
+async def get_async_db():
+    db = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
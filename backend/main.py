@@ -1,5 +1,11 @@
 import sys
 import os
+import time
+
+# STARTUP_PROFILE=1 이면 콜드 스타트 시간(모듈 로딩, 첫 요청)을 로그로 남긴다.
+# 모듈별 상세 내역은 benchmarks/bench_cold_start.py --profile (python -X importtime)
+STARTUP_PROFILE = bool(os.getenv("STARTUP_PROFILE"))
+_boot_started = time.perf_counter()
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "lib"))
 
@@ -7,6 +13,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from mangum import Mangum
 from api.v1.endpoints import community, users, login, passkey, auth
+from core.config import settings
+from core import instrumentation
+from core.scheduler import run_scheduled_jobs
+from core.email import OUTBOX_EVENT_SOURCE, send_outbound_emails
+from database import SessionLocal
 
 app = FastAPI(root_path="/default")
 
@@ -23,6 +34,12 @@ app.add_middleware(
     allow_headers=["*"],      
 )
 
+# async로 옮긴 라우터는 같은 경로의 sync 라우터보다 먼저 등록 (먼저 등록된 경로가 우선)
+# 요청/응답 형식이 같으므로 문서(OpenAPI)에는 sync 라우터만 노출
+if "community" in settings.ASYNC_ROUTERS:
+    from api.v1.endpoints import community_async
+    app.include_router(community_async.router, prefix="/api/v1/community", include_in_schema=False)
+
 app.include_router(community.router, prefix="/api/v1/community", tags=["Community"])
 app.include_router(users.router, prefix="/api/v1/users", tags=["Users"])
 app.include_router(login.router, prefix="/api/v1/auth", tags=["Authentication"])
@@ -33,13 +50,43 @@ app.include_router(auth.router, prefix="/api/v1/auth", tags=["Email Auth"])
 def health_check():
     return {"message": "FastAPI Server is Running"}
 
+# 요청별 지연 시간/쿼리 수/직렬화 시간 (Server-Timing 헤더, JSON 로그, PERF_METRICS_PATH)
+if settings.PERF_INSTRUMENTATION:
+    instrumentation.install(app)
+
 mangum_handler = Mangum(app)
 
+# 무거운 라이브러리(webauthn, user_agents, passlib, jose, smtplib)는 각 라우트에서
+# 처음 쓸 때 import 하므로 여기까지는 FastAPI/SQLAlchemy 로딩이 대부분이다.
+_first_invocation = True
+if STARTUP_PROFILE:
+    print(f"🚀 [startup] main import {(time.perf_counter() - _boot_started) * 1000:.1f}ms")
+
 def handler(event, context):
+    global _first_invocation
+    if STARTUP_PROFILE and _first_invocation:
+        _first_invocation = False
+        started = time.perf_counter()
+        try:
+            return _handle(event, context)
+        finally:
+            print(f"🚀 [startup] first invocation {(time.perf_counter() - started) * 1000:.1f}ms")
+    return _handle(event, context)
+
+def _handle(event, context):
     # AWS EventBridge(CloudWatch Events)가 보내는 신호인지 확인
     if event.get("source") == "aws.events" and event.get("detail-type") == "Scheduled Event":
-        print("Warmer ping received. Skipping application logic.")
+        print("Warmer ping received. Running scheduled jobs.")
+        run_scheduled_jobs()
         return {"statusCode": 200, "body": "pong"}
 
+    # 메일 큐 발송 요청 (core.email.dispatch_outbound_emails가 비동기 호출)
+    if event.get("source") == OUTBOX_EVENT_SOURCE:
+        db = SessionLocal()
+        try:
+            return {"statusCode": 200, "body": f"sent {send_outbound_emails(db)}"}
+        finally:
+            db.close()
+
     # 그게 아니라면(진짜 유저의 HTTP 요청), FastAPI(Mangum)에게 넘긴다.
     return mangum_handler(event, context)
\ No newline at end of file
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, ForeignKey, Boolean, Index
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from database import Base
 
@@ -11,6 +11,11 @@ class PostLike(Base):
     post = relationship("Post", back_populates="likes")
     user = relationship("User", back_populates="liked_posts")
 
+    # PK(user_id, post_id)가 유저별 조회를 맡고, 게시글 쪽(삭제 CASCADE 등)은 별도 인덱스
+    __table_args__ = (
+        Index("ix_post_likes_post_id", "post_id"),
+    )
+
 class PostScrap(Base):
     __tablename__ = "post_scraps"
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
@@ -18,6 +23,34 @@ class PostScrap(Base):
     post = relationship("Post", back_populates="scraps")
     user = relationship("User", back_populates="scrapped_posts")
 
+    __table_args__ = (
+        Index("ix_post_scraps_post_id", "post_id"),
+    )
+
+class PostScore(Base):
+    """
+    인기글 점수 (최근 7일 게시글만 유지)
+    - 좋아요/댓글/조회수 변경 시 해당 글만 갱신, 기간이 지난 글은 스케줄러가 삭제
+    """
+    __tablename__ = "post_scores"
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    score = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), nullable=False)  # 게시글 작성 시각 (기간 판단용)
+
+    __table_args__ = (
+        Index("ix_post_scores_score", "score", "post_id"),
+    )
+
+class PostViewEvent(Base):
+    """
+    조회수 증가분 버퍼 (append-only)
+    - 상세 조회마다 한 줄 INSERT, 스케줄러가 모아서 posts.view_count에 반영 후 삭제
+    """
+    __tablename__ = "post_view_events"
+    id = Column(BigInteger, primary_key=True)
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
 class Post(Base):
     __tablename__ = "posts"
 
@@ -36,12 +69,27 @@ class Post(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # 검색용 bigram 벡터 (core.search 참고, 작성/수정 시 갱신)
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+
     author_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     author = relationship("User", back_populates="posts")
 
-    comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
-    likes = relationship("PostLike", back_populates="post", cascade="all, delete-orphan")
-    scraps = relationship("PostScrap", back_populates="post", cascade="all, delete-orphan")
+    # 작성자 표시 정보 스냅샷 (목록 조회 시 users 조인 없이 사용, crud_community에서 동기화)
+    author_nickname = Column(String, nullable=False, server_default="알수없음")
+    author_university = Column(String, nullable=True)
+
+    # 삭제는 DB의 ON DELETE CASCADE에 맡긴다 (passive_deletes: 지우기 전에 댓글/좋아요를 하나씩 읽지 않음)
+    comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan", passive_deletes=True)
+    likes = relationship("PostLike", back_populates="post", cascade="all, delete-orphan", passive_deletes=True)
+    scraps = relationship("PostScrap", back_populates="post", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        Index("ix_posts_category_created_at_id", "category", "created_at", "id"),
+        Index("ix_posts_author_id_created_at_id", "author_id", "created_at", "id"),
+        Index("ix_posts_search_vector", "search_vector", postgresql_using="gin"),
+    )
     
 
 class Comment(Base):
@@ -57,8 +105,22 @@ class Comment(Base):
     author_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     parent_id = Column(Integer, ForeignKey("comments.id", ondelete="CASCADE"), nullable=True)
     is_deleted = Column(Boolean, default=False)
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+
+    # 작성자 표시 정보 스냅샷 (Post와 동일)
+    author_nickname = Column(String, nullable=False, server_default="알수없음")
+    author_university = Column(String, nullable=True)
+    # 스냅샷을 마지막으로 갱신한 시각 (updated_at은 유지하므로 댓글 목록 ETag는 이 값으로 바뀜)
+    author_updated_at = Column(DateTime(timezone=True), nullable=True)
 
     post = relationship("Post", back_populates="comments")
     author = relationship("User", back_populates="comments")
     parent = relationship("Comment", remote_side=[id], back_populates="replies")
-    replies = relationship("Comment", back_populates="parent", cascade="all, delete-orphan")
\ No newline at end of file
+    replies = relationship("Comment", back_populates="parent", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        Index("ix_comments_author_id_created_at_id", "author_id", "created_at", "id"),
+        Index("ix_comments_post_id_created_at_id", "post_id", "created_at", "id"),
+        Index("ix_comments_parent_id", "parent_id"),
+        Index("ix_comments_search_vector", "search_vector", postgresql_using="gin"),
+    )
\ No newline at end of file
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Index
+from sqlalchemy.sql import func
+from database import Base
+
+class OutboundEmail(Base):
+    """
+    발송 대기 메일 (outbox)
+    - API는 INSERT만 하고 바로 응답, 발송기가 배치로 꺼내 한 SMTP 연결로 보냄
+    - status: pending(대기) → sending(발송 중, next_attempt_at까지 점유) → sent / failed
+    - 실패하면 attempts에 따라 next_attempt_at을 뒤로 미뤄 재시도
+    """
+    __tablename__ = "outbound_emails"
+
+    id = Column(BigInteger, primary_key=True)
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    html_body = Column(Text, nullable=False)
+
+    status = Column(String, nullable=False, default="pending", server_default="pending")
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(Text, nullable=True)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_outbound_emails_status_next_attempt_at", "status", "next_attempt_at"),
+    )
@@ -8,7 +8,7 @@ class Passkey(Base):
     __tablename__ = "passkeys"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True)
     credential_id = Column(String, unique=True, index=True, nullable=False)
     public_key = Column(String, nullable=False)
     sign_count = Column(BigInteger, default=0)
@@ -18,8 +18,9 @@ class Passkey(Base):
 
     
 class PasskeyChallenge(Base):
+    """PASSKEY_CHALLENGE_STORE=db 일 때 쓰는 챌린지 저장소 (core.challenge_store)"""
     __tablename__ = "passkey_challenges"
 
     username = Column(String, primary_key=True, index=True) 
     challenge = Column(String, nullable=False)
-    created_at = Column(BigInteger, nullable=False)
\ No newline at end of file
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
\ No newline at end of file
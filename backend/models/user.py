@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
@@ -57,11 +57,28 @@ class User(Base):
 
 
 class EmailVerification(Base):
+    """
+    이메일 인증 코드 - (email, purpose)당 한 행 (crud.crud_verification)
+    - 재발송은 같은 행을 갱신(upsert)하고, 만료된 행은 스케줄러가 정리한다.
+    """
     __tablename__ = "email_verifications"
 
     id = Column(Integer, primary_key=True, index=True)
-    email = Column(String, index=True, nullable=False)
+    email = Column(String, nullable=False)
     code = Column(String, nullable=False)
     is_verified = Column(Boolean, default=False)
     purpose = Column(String, default="register", nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # 마지막 발송 시각 / 코드 만료 시각
+    sent_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # 현재 코드의 틀린 입력 횟수
+    attempts = Column(Integer, default=0, server_default="0", nullable=False)
+    # 발송 횟수 제한 구간(window_started_at부터 1시간)의 발송 횟수
+    send_count = Column(Integer, default=1, server_default="1", nullable=False)
+    window_started_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_email_verifications_email_purpose", "email", "purpose", unique=True),
+        Index("ix_email_verifications_expires_at", "expires_at"),
+    )
\ No newline at end of file
@@ -63,6 +63,11 @@ class PostResponse(PostListResponse):
     is_liked: bool = False       # 좋아요 여부
     is_scrapped: bool = False    # 스크랩 여부
 
+# 목록 항목 + 조회자 좋아요/스크랩 여부 (피드 viewer=true, /posts/batch)
+class PostListViewerResponse(PostListResponse):
+    is_liked: bool = False
+    is_scrapped: bool = False
+
 
 # 댓글 기본 틀
 class CommentBase(BaseModel):
@@ -88,6 +93,21 @@ class CommentResponse(CommentBase):
     post_title: Optional[str] = None
     post_id: Optional[int] = None
     is_deleted: bool
+    depth: Optional[int] = None  # 트리 조회(/comments/thread)에서만 채움
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+# 커서 페이지네이션 응답 (cursor 파라미터를 보낸 경우)
+class PostCursorPage(BaseModel):
+    items: List[PostListResponse]
+    next_cursor: Optional[str] = None  # 마지막 페이지면 None
+
+class PostViewerCursorPage(BaseModel):
+    items: List[PostListViewerResponse]
+    next_cursor: Optional[str] = None
+
+class CommentCursorPage(BaseModel):
+    items: List[CommentResponse]
+    next_cursor: Optional[str] = None
@@ -7,4 +7,11 @@ class Token(BaseModel):
     refresh_token: str
 
 class TokenPayload(BaseModel):
-    sub: Optional[int] = None
\ No newline at end of file
+    sub: Optional[int] = None
+
+class TokenPrincipal(BaseModel):
+    """액세스 토큰 클레임에서 바로 만든 로그인 유저 정보 (DB 조회 없음)"""
+    id: int
+    is_active: Optional[bool] = None           # 예전 토큰에는 없음
+    is_student_verified: Optional[bool] = None
+    university_id: Optional[int] = None
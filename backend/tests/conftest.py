@@ -0,0 +1,40 @@
+"""
+테스트 공통 설정
+
+database 모듈은 import 시점에 엔진을 만든다 (접속은 첫 쿼리 때).
+DB 없이 도는 테스트도 crud/api 모듈을 import 할 수 있도록 DATABASE_URL을 채운다.
+TEST_DATABASE_URL이 있으면 그쪽을 쓰고 (.env의 운영 DB로 나가지 않도록), 없으면 접속하지 않는 더미 주소.
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+
+if os.getenv("TEST_DATABASE_URL"):
+    os.environ["DATABASE_URL"] = os.environ["TEST_DATABASE_URL"]
+else:
+    os.environ.setdefault("DATABASE_URL", "postgresql://localhost/mate_test")
+
+# 관계가 문자열로 서로를 가리키므로 모델을 모두 등록해 둔다 (alembic env.py와 같은 목록)
+import models.user  # noqa: E402,F401
+import models.community  # noqa: E402,F401
+import models.email  # noqa: E402,F401
+import models.passkey  # noqa: E402,F401
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="session")
+def migrated_engine():
+    """alembic upgrade head 로 스키마를 만든 TEST_DATABASE_URL 엔진 (없으면 skip)"""
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL이 없습니다")
+    # alembic env.py가 로깅 설정을 바꾸므로 별도 프로세스에서 실행
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], cwd=BACKEND_DIR, check=True,
+                   env={**os.environ, "DATABASE_URL": url}, capture_output=True)
+    engine = create_engine(url)
+    yield engine
+    engine.dispose()
@@ -0,0 +1,40 @@
+"""api.deps 토큰 검증 (액세스 토큰만 API 인증에 사용)"""
+import pytest
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from api import deps
+from core import security
+from main import app
+
+CLAIMS = {"sub": "1", "is_active": True, "is_student_verified": False, "university_id": None}
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def test_access_token_is_accepted():
+    principal = deps.decode_principal(security.create_access_token(CLAIMS))
+    assert principal is not None
+    assert principal.id == 1
+
+
+def test_refresh_token_is_rejected():
+    assert deps.decode_principal(security.create_refresh_token({"sub": "1"})) is None
+
+
+def test_token_without_type_is_rejected():
+    token = jwt.encode({"sub": "1"}, security.SECRET_KEY, algorithm=security.ALGORITHM)
+    assert deps.decode_principal(token) is None
+
+
+def test_refresh_token_gets_401(client):
+    # 인증 실패는 DB 조회 전에 끝난다
+    token = security.create_refresh_token({"sub": "1"})
+    response = client.get("/api/v1/auth/passkey/list", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
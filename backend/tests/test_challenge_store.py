@@ -0,0 +1,147 @@
+"""core.challenge_store 패스키 챌린지 저장소 (TTL, 1회용 consume)"""
+import time
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.orm import sessionmaker
+
+from core import cache, challenge_store
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+# ---------------------------------------------------------
+# memory
+# ---------------------------------------------------------
+def test_memory_consume_is_single_use(clock):
+    store = challenge_store.MemoryBackend(maxsize=10, ttl=60)
+    store.put(None, "alice", "c1")
+
+    assert store.consume(None, "alice") == "c1"
+    assert store.consume(None, "alice") is None
+    assert store.consume(None, "bob") is None
+
+
+def test_memory_challenge_expires(clock):
+    store = challenge_store.MemoryBackend(maxsize=10, ttl=60)
+    store.put(None, "alice", "c1")
+    store.put(None, "bob", "c2")
+
+    clock.now += 59
+    assert store.consume(None, "alice") == "c1"
+    clock.now += 2
+    assert store.consume(None, "bob") is None
+
+
+def test_memory_put_replaces_previous_challenge(clock):
+    store = challenge_store.MemoryBackend(maxsize=10, ttl=60)
+    store.put(None, "alice", "old")
+    store.put(None, "alice", "new")
+
+    assert store.consume(None, "alice") == "new"
+    assert store.consume(None, "alice") is None
+
+
+# ---------------------------------------------------------
+# redis (fakeredis)
+# ---------------------------------------------------------
+def test_redis_consume_is_single_use():
+    client = fakeredis.FakeRedis()
+    store = challenge_store.RedisBackend(client, ttl=60)
+    store.put(None, "alice", "c1")
+
+    assert 0 < client.ttl("passkey-challenge:alice") <= 60
+    assert store.consume(None, "alice") == "c1"
+    assert store.consume(None, "alice") is None
+    assert client.exists("passkey-challenge:alice") == 0
+
+
+def test_redis_challenge_expires():
+    client = fakeredis.FakeRedis()
+    store = challenge_store.RedisBackend(client, ttl=0.5)  # Redis TTL은 초 단위라 최소 1초
+    store.put(None, "alice", "c1")
+
+    assert client.ttl("passkey-challenge:alice") == 1
+    time.sleep(1.1)
+    assert store.consume(None, "alice") is None
+
+
+def test_redis_decoded_client():
+    store = challenge_store.RedisBackend(fakeredis.FakeRedis(decode_responses=True), ttl=60)
+    store.put(None, "alice", "c1")
+    assert store.consume(None, "alice") == "c1"
+
+
+# ---------------------------------------------------------
+# db (TEST_DATABASE_URL)
+# ---------------------------------------------------------
+@pytest.fixture
+def db(migrated_engine):
+    from models.passkey import PasskeyChallenge
+
+    session = sessionmaker(bind=migrated_engine)()
+    yield session
+    session.rollback()
+    session.execute(delete(PasskeyChallenge).where(PasskeyChallenge.username.like("test-challenge-%")))
+    session.commit()
+    session.close()
+
+
+def test_db_consume_is_single_use(db):
+    store = challenge_store.DatabaseBackend(ttl=60)
+    store.put(db, "test-challenge-alice", "old")
+    store.put(db, "test-challenge-alice", "c1")
+
+    assert store.consume(db, "test-challenge-alice") == "c1"
+    assert store.consume(db, "test-challenge-alice") is None
+
+
+def test_db_expired_challenge_is_not_returned(db):
+    from sqlalchemy import select
+    from models.passkey import PasskeyChallenge
+
+    store = challenge_store.DatabaseBackend(ttl=-1)
+    store.put(db, "test-challenge-alice", "c1")
+
+    assert store.consume(db, "test-challenge-alice") is None
+    # 만료된 행도 consume 시 지운다
+    assert db.execute(
+        select(PasskeyChallenge).where(PasskeyChallenge.username == "test-challenge-alice")
+    ).first() is None
+
+
+def test_db_purge_removes_only_expired(db):
+    challenge_store.DatabaseBackend(ttl=-1).put(db, "test-challenge-old1", "c1")
+    challenge_store.DatabaseBackend(ttl=-1).put(db, "test-challenge-old2", "c2")
+    live = challenge_store.DatabaseBackend(ttl=60)
+    live.put(db, "test-challenge-live", "c3")
+
+    assert live.purge(db, batch_size=1) == 2
+    assert live.consume(db, "test-challenge-live") == "c3"
+
+
+# ---------------------------------------------------------
+# 설정
+# ---------------------------------------------------------
+def test_build_challenge_store():
+    assert isinstance(challenge_store.build_challenge_store("memory"), challenge_store.MemoryBackend)
+    assert isinstance(challenge_store.build_challenge_store("db"), challenge_store.DatabaseBackend)
+    # 연결은 첫 명령 때 하므로 서버 없이 만들 수 있다
+    assert isinstance(challenge_store.build_challenge_store("redis://localhost:6399/0"), challenge_store.RedisBackend)
+    with pytest.raises(ValueError):
+        challenge_store.build_challenge_store("memcached://localhost")
@@ -0,0 +1,175 @@
+"""
+core.email SMTP 발송 (aiosmtpd 로컬 서버)
+
+outbound_emails 큐 발송 검사는 TEST_DATABASE_URL이 있을 때만 실행한다.
+"""
+import logging
+import socket
+import smtplib
+from email import message_from_bytes
+
+import pytest
+from aiosmtpd.controller import Controller
+from sqlalchemy import delete, select
+from sqlalchemy.orm import sessionmaker
+
+from core import email as mailer
+
+
+class RecordingHandler:
+    """받은 메일을 모으고, refused에 있는 수신자는 지정한 코드로 거부"""
+
+    def __init__(self):
+        self.messages = []
+        self.refused = {}
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address in self.refused:
+            return self.refused[address]
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append((envelope.rcpt_tos, message_from_bytes(envelope.content)))
+        return "250 Message accepted"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server(monkeypatch):
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    monkeypatch.setattr(mailer, "SMTP_SERVER", "127.0.0.1")
+    monkeypatch.setattr(mailer, "SMTP_PORT", controller.port)
+    monkeypatch.setattr(mailer, "SMTP_STARTTLS", False)
+    monkeypatch.setattr(mailer, "SMTP_USER", None)
+    monkeypatch.setattr(mailer, "SMTP_PASSWORD", None)
+    monkeypatch.setattr(mailer, "SMTP_FROM", "noreply@mate.test")
+    monkeypatch.setattr(mailer, "SMTP_TIMEOUT", 5)
+    yield handler
+    controller.stop()
+
+
+def test_connection_sends_multiple_messages(smtp_server):
+    with mailer.SMTPConnection() as smtp:
+        smtp.send("a@snu.ac.kr", "제목1", "<p>1</p>")
+        first_server = smtp.server
+        smtp.send("b@snu.ac.kr", "제목2", "<p>2</p>")
+        assert smtp.server is first_server  # 같은 연결 재사용
+    assert smtp.server is None
+
+    assert [rcpt for rcpt, _ in smtp_server.messages] == [["a@snu.ac.kr"], ["b@snu.ac.kr"]]
+    _, message = smtp_server.messages[1]
+    assert message["From"] == "noreply@mate.test"
+    assert str(message.get_payload()[0].get_payload(decode=True), "utf-8") == "<p>2</p>"
+
+
+def test_connection_reconnects_after_disconnect(smtp_server):
+    with mailer.SMTPConnection() as smtp:
+        smtp.send("a@snu.ac.kr", "제목1", "<p>1</p>")
+        smtp.server.close()  # 서버가 연결을 끊은 상태
+        smtp.send("b@snu.ac.kr", "제목2", "<p>2</p>")
+
+    assert len(smtp_server.messages) == 2
+
+
+@pytest.mark.parametrize("reply, permanent", [
+    ("550 No such user", True),
+    ("450 Mailbox busy", False),
+])
+def test_refused_recipient_is_classified(smtp_server, reply, permanent):
+    smtp_server.refused["x@snu.ac.kr"] = reply
+    with mailer.SMTPConnection() as smtp:
+        with pytest.raises(smtplib.SMTPRecipientsRefused) as exc_info:
+            smtp.send("x@snu.ac.kr", "제목", "<p>본문</p>")
+
+    assert mailer._is_permanent(exc_info.value) is permanent
+
+
+def test_retry_delay_backs_off_until_limit(monkeypatch):
+    monkeypatch.setattr(mailer, "EMAIL_RETRY_BASE_SECONDS", 30)
+    monkeypatch.setattr(mailer, "EMAIL_MAX_ATTEMPTS", 3)
+
+    assert [mailer.retry_delay(n) for n in (1, 2, 3)] == [
+        mailer.timedelta(seconds=30), mailer.timedelta(seconds=60), None,
+    ]
+
+
+# ---------------------------------------------------------
+# outbound_emails 큐 발송 (TEST_DATABASE_URL)
+# ---------------------------------------------------------
+@pytest.fixture
+def db(migrated_engine):
+    from models.email import OutboundEmail
+
+    session = sessionmaker(bind=migrated_engine)()
+    yield session
+    session.rollback()
+    session.execute(delete(OutboundEmail).where(OutboundEmail.to_email.like("%@outbox.test")))
+    session.commit()
+    session.close()
+
+
+def _enqueue(db, *recipients):
+    from crud import crud_email
+
+    for to_email in recipients:
+        crud_email.enqueue_email(db, to_email, "제목", "<p>본문</p>")
+    db.commit()
+
+
+def _statuses(db) -> dict:
+    from models.email import OutboundEmail
+
+    rows = db.execute(
+        select(OutboundEmail.to_email, OutboundEmail.status, OutboundEmail.attempts)
+        .where(OutboundEmail.to_email.like("%@outbox.test"))
+    ).all()
+    return {to_email: (status, attempts) for to_email, status, attempts in rows}
+
+
+def test_send_outbound_emails_records_each_result(smtp_server, db, caplog):
+    smtp_server.refused["bad@outbox.test"] = "550 No such user"
+    smtp_server.refused["busy@outbox.test"] = "450 Mailbox busy"
+    _enqueue(db, "ok1@outbox.test", "bad@outbox.test", "busy@outbox.test", "ok2@outbox.test")
+
+    with caplog.at_level(logging.WARNING, logger="core.email"):
+        assert mailer.send_outbound_emails(db, batch_size=2) == 2
+
+    assert _statuses(db) == {
+        "ok1@outbox.test": ("sent", 1),
+        "ok2@outbox.test": ("sent", 1),
+        "bad@outbox.test": ("failed", 1),     # 5xx는 재시도하지 않음
+        "busy@outbox.test": ("pending", 1),   # 4xx는 재시도 예약
+    }
+    assert sorted(rcpt[0] for rcpt, _ in smtp_server.messages) == ["ok1@outbox.test", "ok2@outbox.test"]
+    assert any("bad@outbox.test" in record.getMessage() for record in caplog.records)
+
+
+def test_unreachable_server_releases_remaining_emails(monkeypatch, db):
+    monkeypatch.setattr(mailer, "SMTP_SERVER", "127.0.0.1")
+    monkeypatch.setattr(mailer, "SMTP_PORT", _free_port())  # 아무도 듣지 않는 포트
+    monkeypatch.setattr(mailer, "SMTP_FROM", "noreply@mate.test")
+    monkeypatch.setattr(mailer, "SMTP_TIMEOUT", 1)
+    _enqueue(db, "a@outbox.test", "b@outbox.test", "c@outbox.test")
+
+    assert mailer.send_outbound_emails(db) == 0
+
+    statuses = _statuses(db)
+    assert {status for status, _ in statuses.values()} == {"pending"}
+    # 첫 메일만 시도 횟수에 들어가고, 나머지는 시도하지 않고 돌려놓는다
+    assert sorted(attempts for _, attempts in statuses.values()) == [0, 0, 1]
+
+
+def test_missing_sender_is_logged(monkeypatch, caplog):
+    monkeypatch.setattr(mailer, "SMTP_FROM", None)
+
+    with caplog.at_level(logging.ERROR, logger="core.email"):
+        assert mailer.send_outbound_emails(db=None) == 0
+    assert "SMTP_FROM" in caplog.text
@@ -0,0 +1,68 @@
+"""core.instrumentation 요청 로그 (JSON 한 줄, 모듈 로거)"""
+import json
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core import instrumentation
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def log_handler():
+    handler = ListHandler()
+    instrumentation.logger.addHandler(handler)
+    level = instrumentation.logger.level
+    instrumentation.logger.setLevel(logging.INFO)
+    yield handler
+    instrumentation.logger.removeHandler(handler)
+    instrumentation.logger.setLevel(level)
+
+
+def _client(log: str) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        return {"id": item_id}
+
+    app.add_middleware(instrumentation.InstrumentationMiddleware, log=log, slow_ms=10_000)
+    return TestClient(app)
+
+
+def test_request_log_is_one_json_line(log_handler):
+    response = _client("all").get("/items/3")
+
+    assert response.status_code == 200
+    assert len(log_handler.messages) == 1
+    record = json.loads(log_handler.messages[0])
+    assert record["event"] == "request"
+    assert record["method"] == "GET"
+    assert record["route"] == "/items/{item_id}"
+    assert record["path"] == "/items/3"
+    assert record["status"] == 200
+    assert record["db_queries"] == 0
+
+
+def test_slow_mode_skips_fast_requests(log_handler):
+    _client("slow").get("/items/3")
+    _client("off").get("/items/3")
+
+    assert log_handler.messages == []
+
+
+def test_install_log_handler_keeps_existing_handlers(log_handler):
+    handlers = list(instrumentation.logger.handlers)
+    instrumentation.install_log_handler()
+
+    assert instrumentation.logger.handlers == handlers
@@ -0,0 +1,64 @@
+"""core.pagination 커서 인코딩/디코딩"""
+import base64
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from core import pagination
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=timezone(timedelta(hours=9)))
+    cursor = pagination.encode_cursor(created_at, 42)
+
+    assert "=" not in cursor  # URL에 그대로 넣을 수 있도록 패딩 제거
+    assert pagination.decode_cursor(cursor) == (created_at, 42)
+
+
+def test_cursor_keeps_naive_datetime():
+    created_at = datetime(2026, 3, 1, 12, 30)
+    assert pagination.decode_cursor(pagination.encode_cursor(created_at, 1)) == (created_at, 1)
+
+
+def _b64(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("cursor", [
+    "!!!",                                      # base64 아님
+    _b64(b"not json"),
+    _b64(b'["2026-03-01T12:30:00"]'),           # 값 개수가 다름
+    _b64(b'["not a date", 1]'),
+    _b64(b'["2026-03-01T12:30:00", "abc"]'),    # id가 정수가 아님
+    _b64(b'{"created_at": 1}'),
+])
+def test_invalid_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError, match="invalid cursor"):
+        pagination.decode_cursor(cursor)
+
+
+def _items(count: int) -> list:
+    start = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    return [SimpleNamespace(created_at=start - timedelta(minutes=i), id=100 - i) for i in range(count)]
+
+
+def test_next_cursor_points_at_last_item():
+    items = _items(3)
+    assert pagination.decode_cursor(pagination.next_cursor(items, 3)) == (items[-1].created_at, items[-1].id)
+
+
+def test_next_cursor_is_none_on_last_page():
+    assert pagination.next_cursor(_items(2), 3) is None
+    assert pagination.next_cursor([], 3) is None
+
+
+def test_endpoint_rejects_invalid_cursor_with_400():
+    from fastapi import HTTPException
+    from api.v1.endpoints.community import parse_cursor
+
+    assert parse_cursor(None) is None
+    assert parse_cursor("") is None  # 커서 모드 첫 페이지
+    with pytest.raises(HTTPException) as exc_info:
+        parse_cursor("!!!")
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,32 @@
+"""
+엔드포인트별 쿼리 수 예산 (benchmarks/check_query_counts.py와 같은 검사)
+
+모든 테이블을 TRUNCATE 하므로 빈 검사용 DB를 TEST_DATABASE_URL로 지정해야 실행된다 (없으면 skip).
+스키마는 alembic upgrade head로 만든다 (게시글 삭제의 ON DELETE CASCADE 등 마이그레이션 결과를 검사).
+
+    cd backend
+    TEST_DATABASE_URL=postgresql://postgres@localhost/mate_queries python -m pytest
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL이 없습니다")
+
+
+def test_query_budgets():
+    # 검사는 import 전에 캐시/디스패치 설정(core.config)을 바꾸므로,
+    # 다른 테스트가 먼저 읽어 둔 설정과 섞이지 않게 별도 프로세스에서 실행한다
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.check_query_counts"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "BENCH_DATABASE_URL": TEST_DATABASE_URL},
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
@@ -0,0 +1,107 @@
+"""
+core.search (bigram tsvector) 문서/검색어 변환과 긴 문서 처리
+
+DB 검사는 TEST_DATABASE_URL이 있을 때만 실행한다 (테이블은 쓰지 않음).
+"""
+import os
+
+import pytest
+from sqlalchemy import create_engine, select
+
+from core import search
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+# 단어 하나가 bigram 2개 + 간격 1칸 = 위치 3칸 → 6000단어면 16383을 넘는다
+LONG_TEXT = " ".join(["가나다"] * 6000) + " 학식메뉴"
+
+
+def test_build_document_bigrams_with_positions():
+    # 단어 사이는 한 칸 띄워서 인접하지 않음, 마지막 글자는 마지막 bigram과 같은 위치
+    assert search.build_document(("안녕하세요", "A")) == (
+        "'안녕':1A '녕하':2A '하세':3A '세요':4A '요':4A"
+    )
+    assert search.build_document(("학식 메뉴", "A"), ("가", "B")) == (
+        "'학식':1A '식':1A '메뉴':3A '뉴':3A '가':5B"
+    )
+
+
+def test_build_document_lowercases_and_quotes():
+    assert search.build_document(("It's", "A")) == "'it':1A 't':1A 's':3A"
+    assert search.build_document((None, "A")) == ""
+
+
+def test_build_query_phrase_per_word():
+    assert search.build_query("학식메뉴") == "('학식' <-> '식메' <-> '메뉴')"
+    assert search.build_query("학식 A") == "('학식') & ('a':*)"
+    assert search.build_query("  ?! ") is None
+    assert search.build_query(None) is None
+
+
+def test_short_document_is_not_marked():
+    document = search.build_document(("학식 메뉴", "A"), ("오늘 학식메뉴 뭐임", "B"))
+    assert search.OVERFLOW_LEXEME not in document
+
+
+def test_position_overflow_is_marked():
+    document = search.build_document((LONG_TEXT, "A"))
+    assert search._quote(search.OVERFLOW_LEXEME) in document
+    # 최대 위치를 넘는 위치는 쓰지 않는다
+    assert f"{search.MAX_POSITION + 1}" not in document
+
+
+def test_frequent_bigram_is_marked():
+    document = search.build_document((" ".join(["ab"] * 300), "A"))
+    assert search._quote(search.OVERFLOW_LEXEME) in document
+    assert document.startswith("'ab':")
+    positions = document.split(" ")[0].split(":")[1].split(",")
+    assert len(positions) == search.MAX_POSITIONS_PER_LEXEME
+
+
+def test_loose_query_requires_marker():
+    assert search.build_loose_query("학식") == f"{search._quote(search.OVERFLOW_LEXEME)} & ('학식')"
+    assert search.build_loose_query("학식메뉴 a") == (
+        f"{search._quote(search.OVERFLOW_LEXEME)} & ('학식' & '식메' & '메뉴') & ('a':*)"
+    )
+    assert search.build_loose_query("!!") is None
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL이 없습니다")
+@pytest.mark.parametrize("term, found", [
+    ("학식", True),
+    ("식메", True),        # 단어 중간 부분일치
+    ("식", True),          # 한 글자는 접두 검색
+    ("뉴", True),          # 단어 마지막 글자
+    ("메뉴학식", False),   # 순서가 다름
+    ("학식 주차", False),  # 모든 단어가 있어야 함
+])
+def test_query_matches_document(term, found):
+    engine = create_engine(TEST_DATABASE_URL)
+    try:
+        with engine.connect() as conn:
+            matched = conn.execute(select(
+                search.matches(search.post_vector("오늘 학식메뉴", "맛있음"), search.query_expr(term))
+            )).scalar()
+    finally:
+        engine.dispose()
+    assert matched is found
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL이 없습니다")
+def test_long_document_found_by_loose_query():
+    engine = create_engine(TEST_DATABASE_URL)
+    vector = search.post_vector("긴 글", LONG_TEXT)
+    try:
+        with engine.connect() as conn:
+            phrase, loose, short = conn.execute(select(
+                search.matches(vector, search.query_expr("학식메뉴")),
+                search.matches(vector, search.loose_query_expr("학식메뉴")),
+                search.matches(search.post_vector("학식메뉴", "본문"), search.loose_query_expr("학식메뉴")),
+            )).one()
+    finally:
+        engine.dispose()
+    # 잘린 위치 때문에 인접 검색은 실패하지만, 표시된 문서라 위치 없는 검색으로 찾는다
+    assert phrase is False
+    assert loose is True
+    # 표시 없는 짧은 문서는 loose 쿼리 대상이 아님 (인접 검색으로만 찾음)
+    assert short is False
@@ -0,0 +1,65 @@
+"""core.university_directory 이메일 도메인 -> 학교"""
+import pytest
+
+from core.university_directory import UniversityDirectory, UniversityEntry
+
+
+@pytest.fixture
+def directory():
+    # (id, name, domain): 서울대는 DB에 있음, example.ac.kr은 import로만 들어온 학교
+    return UniversityDirectory.build([
+        (1, "서울대학교", "snu.ac.kr"),
+        (2, "예시대학교", "Example.AC.KR"),
+    ])
+
+
+def test_resolve_exact_domain(directory):
+    assert directory.resolve("student@snu.ac.kr") == UniversityEntry("서울대학교", "snu.ac.kr", 1)
+    # DB에 아직 없는 UNIVERSITY_MAP 학교는 id 없음
+    assert directory.resolve("student@yonsei.ac.kr") == UniversityEntry("연세대학교", "yonsei.ac.kr", None)
+
+
+@pytest.mark.parametrize("email", [
+    "student@mail.snu.ac.kr",
+    "student@a.b.snu.ac.kr",
+    "Student@SNU.AC.KR ",
+])
+def test_resolve_subdomain_and_case(directory, email):
+    assert directory.resolve(email) == UniversityEntry("서울대학교", "snu.ac.kr", 1)
+
+
+def test_resolve_imported_domain(directory):
+    assert directory.resolve("a@dept.example.ac.kr") == UniversityEntry("예시대학교", "example.ac.kr", 2)
+
+
+@pytest.mark.parametrize("email, name, domain", [
+    ("a@unknown.ac.kr", "UNKNOWN 대학교(미등록)", "unknown.ac.kr"),
+    ("a@cs.unknown.ac.kr", "UNKNOWN 대학교(미등록)", "unknown.ac.kr"),
+    ("a@mit.edu", "MIT 대학교(미등록)", "mit.edu"),
+    ("a@eecs.mit.edu", "MIT 대학교(미등록)", "mit.edu"),
+])
+def test_resolve_fallback_suffix(directory, email, name, domain):
+    assert directory.resolve(email) == UniversityEntry(name, domain, None)
+
+
+@pytest.mark.parametrize("email", [
+    "a@gmail.com",
+    "a@ac.kr",      # 학교 이름 라벨이 없음
+    "a@edu",
+    "a@kr",
+    "no-at-sign",
+    "a@snu.ac.kr.evil.com",
+])
+def test_resolve_unsupported(directory, email):
+    assert directory.resolve(email) is None
+
+
+def test_with_university_links_id(directory):
+    updated = directory.with_university("연세대학교", "yonsei.ac.kr", 7)
+
+    assert updated.resolve("a@yonsei.ac.kr").university_id == 7
+    assert directory.resolve("a@yonsei.ac.kr").university_id is None  # 기존 인덱스는 그대로
+
+    added = updated.with_university("새대학교", "new.ac.kr", 8)
+    assert added.resolve("a@mail.new.ac.kr") == UniversityEntry("새대학교", "new.ac.kr", 8)
+    assert len(added) == len(updated) + 1
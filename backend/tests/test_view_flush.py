@@ -0,0 +1,88 @@
+"""crud_community.ViewFlushTrigger 조회수 즉시 반영 조건 (개수/시간)"""
+from types import SimpleNamespace
+
+import pytest
+
+import models.passkey  # noqa: F401 (User.passkeys 관계 설정)
+from crud import crud_community as crud
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(crud, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def test_flush_after_threshold_views(clock):
+    trigger = crud.ViewFlushTrigger(threshold=3, interval=0)
+
+    assert [trigger.record() for _ in range(7)] == [False, False, True, False, False, True, False]
+
+
+def test_flush_after_interval(clock):
+    trigger = crud.ViewFlushTrigger(threshold=0, interval=60)
+
+    assert trigger.record() is False
+    clock.now += 59.9
+    assert trigger.record() is False
+    clock.now += 0.1
+    assert trigger.record() is True
+    # 반영 시각부터 다시 잰다
+    clock.now += 30
+    assert trigger.record() is False
+    clock.now += 30
+    assert trigger.record() is True
+
+
+def test_interval_flush_resets_count(clock):
+    trigger = crud.ViewFlushTrigger(threshold=3, interval=60)
+
+    assert trigger.record() is False
+    clock.now += 60
+    assert trigger.record() is True
+    assert trigger.record() is False
+    assert trigger.record() is False
+    assert trigger.record() is True
+
+
+def test_disabled_trigger_never_flushes(clock):
+    trigger = crud.ViewFlushTrigger(threshold=0, interval=0)
+
+    assert not any(trigger.record() for _ in range(1000))
+    clock.now += 3600
+    assert trigger.record() is False
+
+
+class RecordingSession:
+    def __init__(self):
+        self.added = []
+        self.commits = 0
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    def commit(self):
+        self.commits += 1
+
+
+def test_record_view_flushes_when_due(monkeypatch, clock):
+    flushed = []
+    monkeypatch.setattr(crud, "view_flush_trigger", crud.ViewFlushTrigger(threshold=2, interval=0))
+    monkeypatch.setattr(crud, "flush_view_events", flushed.append)
+    db = RecordingSession()
+
+    crud.record_view(db, 1)
+    assert flushed == []
+    crud.record_view(db, 1)
+    assert flushed == [db]
+    assert [event.post_id for event in db.added] == [1, 1]
+    assert db.commits == 2